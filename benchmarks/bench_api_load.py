@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+API load test: req/s and latency percentiles of the debug server vs `run.py api --prod`
+
+Usage: python benchmarks/bench_api_load.py [--rows N] [--clients N] [--duration S]
+                                           [--processes N] [--threads N] [--url URL]
+
+Seeds a temporary database with --rows tournaments, starts each server on
+it (TOURNAMENTS_DB) and hits it from --clients keep-alive connections for
+--duration seconds per request mix:
+
+  hot   20 distinct URLs, answered from the response cache
+  cold  random filters/date ranges/searches, nearly all cache misses (SQLite)
+
+With --url, an already running server is measured instead (its own data).
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.database.initDB import create_database, get_connection
+
+SPORTS = ['cricket', 'football', 'basketball', 'badminton', 'chess']
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club']
+WORDS = ['Trophy', 'Cup', 'Premier', 'Junior', 'Open', 'Invitational', 'Memorial', 'Masters']
+FIRST_DAY = date(2022, 1, 1)
+PER_DAY = 30
+
+
+def seed(db_path, rows):
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_database(db_path)
+    rng = random.Random(7)
+
+    def generate():
+        for i in range(rows):
+            start = FIRST_DAY + timedelta(days=i // PER_DAY)
+            end = start + timedelta(days=rng.choice([0, 1, 2, 3, 5, 7, 14, 90]))
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            yield (name, rng.choice(SPORTS), rng.choice(LEVELS), start.isoformat(), end.isoformat(),
+                   f"{name} at {rng.choice(['Mumbai', 'Delhi', 'Chennai', 'Pune'])}", name.lower())
+
+    conn = get_connection(db_path)
+    with conn:
+        conn.executemany('''
+            INSERT INTO tournaments (name, sport, level, start_date, end_date, summary, name_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', generate())
+    conn.close()
+    return rows // PER_DAY
+
+
+def hot_paths():
+    rng = random.Random(1)
+    paths = ['/sports', '/levels', '/tournaments']
+    while len(paths) < 20:
+        paths.append('/tournaments?' + urlencode({'sport': rng.choice(SPORTS), 'level': rng.choice(LEVELS)}))
+    return lambda rng: rng.choice(paths)
+
+
+def cold_paths(days):
+    def make(rng):
+        params = {'sport': rng.choice(SPORTS), 'limit': rng.randint(10, 60)}
+        choice = rng.random()
+        if choice < 0.4:
+            start = FIRST_DAY + timedelta(days=rng.randrange(days))
+            params['running_from'] = start.isoformat()
+            params['running_to'] = (start + timedelta(days=rng.randint(0, 30))).isoformat()
+        elif choice < 0.7:
+            params['level'] = rng.choice(LEVELS)
+            params['start_date'] = (FIRST_DAY + timedelta(days=rng.randrange(days))).isoformat()
+        else:
+            params['q'] = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+        return '/tournaments?' + urlencode(params)
+    return make
+
+
+def run_load(base_url, make_path, clients, duration):
+    """Keep-alive clients in threads; returns (latencies, errors, elapsed)"""
+    target = urlsplit(base_url)
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        own = []
+        while time.perf_counter() < deadline:
+            path = make_path(rng)
+            started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(response.status)
+                own.append(time.perf_counter() - started)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                conn.close()
+        conn.close()
+        with lock:
+            latencies.extend(own)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000 if samples else float('nan')
+
+
+@contextlib.contextmanager
+def server(db_path, port, prod, processes, threads):
+    command = [sys.executable, os.path.join(ROOT, 'run.py'), 'api', '--host', '127.0.0.1', '--port', str(port)]
+    if prod:
+        command += ['--prod', '--threads', str(threads)]
+        if processes:
+            command += ['--processes', str(processes)]
+    env = dict(os.environ, TOURNAMENTS_DB=db_path, METRICS_ENABLED='1')
+    # Own process group: the debug server's reloader and gunicorn's workers go down with it
+    process = subprocess.Popen(command, cwd=ROOT, env=env, start_new_session=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+                conn.request('GET', '/health')
+                if conn.getresponse().status == 200:
+                    break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError(f"server did not start: {' '.join(command)}")
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+
+def report(label, base_url, mixes, clients, duration):
+    for mix, make_path in mixes:
+        run_load(base_url, make_path, clients, 1.0)  # warm-up
+        latencies, errors, elapsed = run_load(base_url, make_path, clients, duration)
+        latencies.sort()
+        print(f"{label:<26} {mix:<5} {len(latencies):>8} {errors:>6} {len(latencies) / elapsed:>9.0f} "
+              f"{percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--processes', type=int, help='--prod workers (default: one per CPU)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--url', help='Measure this running server instead')
+    args = parser.parse_args()
+
+    header = f"{'server':<26} {'mix':<5} {'requests':>8} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    if args.url:
+        print(header)
+        report(args.url, args.url, [('hot', hot_paths()), ('cold', cold_paths(365))],
+               args.clients, args.duration)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'load.db')
+        days = seed(db_path, args.rows)
+        mixes = [('hot', hot_paths()), ('cold', cold_paths(days))]
+        print(f"{args.rows} tournaments, {args.clients} clients, {args.duration:g} s per mix, "
+              f"{os.cpu_count()} CPUs\n")
+        print(header)
+        with server(db_path, 5051, False, None, None) as url:
+            report('debug server', url, mixes, args.clients, args.duration)
+        with server(db_path, 5052, True, args.processes, args.threads) as url:
+            workers = args.processes or os.cpu_count()
+            report(f"--prod ({workers}x{args.threads} threads)", url, mixes, args.clients, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+HTML cleaning: legacy BeautifulSoup + str() + regex path vs single-pass lxml cleaner
+
+Usage: python benchmarks/bench_cleaning.py [page.html ...]
+
+Without arguments, synthetic fixture-style pages (heavy scripts, navigation
+and large fixture tables) are generated.
+
+The legacy path needs beautifulsoup4, which the scraper itself no longer
+uses: pip install beautifulsoup4
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from src.utils.html_cleaner import parse_html, clean_document
+
+
+def legacy_clean(content):
+    """The original path: html.parser soup, str(soup), four regex passes"""
+    html_content = str(BeautifulSoup(content, 'html.parser'))
+    html_content = re.sub(r'<script.*?</script>', '', html_content, flags=re.DOTALL)
+    html_content = re.sub(r'<style.*?</style>', '', html_content, flags=re.DOTALL)
+    html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
+    html_content = re.sub(r'\s+', ' ', html_content)
+    return html_content.strip()
+
+
+def lxml_clean(content):
+    return clean_document(parse_html(content))
+
+
+def synthetic_page(rows):
+    script = '<script>' + 'var tracking = {"id": 1, "events": []};' * 200 + '</script>'
+    nav = '<nav><ul>' + ''.join(f'<li><a href="/s/{i}">Series {i}</a></li>' for i in range(300)) + '</ul></nav>'
+    table_rows = ''.join(
+        f'<tr class="fixture"><td><a href="/m/{i}">Domestic Trophy Match {i}</a></td>'
+        f'<td>{i % 28 + 1} Jan 2027</td><td>Stadium {i % 40}, City {i % 17}</td>'
+        f'<td><span class="badge">T20</span></td></tr>'
+        for i in range(rows)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>Fixtures</title><style>{"td{padding:2px}" * 500}</style>{script}</head>'
+        f'<body>{nav}<!-- ad slot -->{script}<main><h1>Fixtures & Results</h1>'
+        f'<table><tr><th>Series</th><th>Date</th><th>Venue</th><th>Format</th></tr>{table_rows}</table>'
+        f'</main><footer>{"<p>Footer links</p>" * 100}</footer>{script}</body></html>'
+    ).encode('utf-8')
+
+
+def timed(fn, content, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn(content)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = [(os.path.basename(path), open(path, 'rb').read()) for path in sys.argv[1:]]
+    else:
+        pages = [(f"synthetic-{rows}-rows", synthetic_page(rows)) for rows in (200, 2000, 10000)]
+
+    print(f"{'page':24} {'KB':>7} {'legacy ms':>10} {'lxml ms':>9} {'speedup':>8} {'legacy chars':>13} {'lxml chars':>11}")
+    for name, content in pages:
+        repeat = 3 if len(content) > 1_000_000 else 5
+        legacy_time, legacy_out = timed(legacy_clean, content, repeat)
+        lxml_time, lxml_out = timed(lxml_clean, content, repeat)
+        print(f"{name:24} {len(content) / 1024:>7.0f} {legacy_time * 1000:>10.1f} {lxml_time * 1000:>9.1f} "
+              f"{legacy_time / lxml_time:>7.1f}x {len(legacy_out):>13,} {len(lxml_out):>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Insert throughput: legacy per-row save_tournament vs batched TournamentWriter
+
+Usage: python benchmarks/bench_db_insert.py [rows]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.initDB import create_database
+from src.database.writer import TournamentWriter, UPSERT_SQL
+
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club', 'Corporate', 'District']
+
+
+def synthetic_tournaments(count):
+    return [{
+        'name': f"Synthetic Cup {i}",
+        'level': LEVELS[i % len(LEVELS)],
+        'start_date': f"2027-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        'end_date': f"2027-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        'official_url': f"https://example.com/t/{i}",
+        'streaming_links': 'Platform1, Platform2',
+        'image_url': '',
+        'summary': 'Synthetic benchmark tournament',
+        'location': 'Mumbai, India',
+    } for i in range(count)]
+
+
+def legacy_insert(db_path, tournaments):
+    """The original save_tournament: connect, insert one row, commit, close"""
+    for tournament in tournaments:
+        conn = sqlite3.connect(db_path)
+        conn.execute(UPSERT_SQL, TournamentWriter.to_row('cricket', tournament))
+        conn.commit()
+        conn.close()
+
+
+def batched_insert(db_path, tournaments, batch_size=50):
+    """One connection, one transaction per batch (≈ per source)"""
+    with TournamentWriter(db_path) as writer:
+        for i in range(0, len(tournaments), batch_size):
+            writer.write('cricket', tournaments[i:i + batch_size])
+
+
+def timed(fn, db_path, tournaments):
+    start = time.perf_counter()
+    fn(db_path, tournaments)
+    return time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    tournaments = synthetic_tournaments(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, 'legacy.db')
+        batched_db = os.path.join(tmp, 'batched.db')
+        create_database(legacy_db)
+        create_database(batched_db)
+
+        legacy = timed(legacy_insert, legacy_db, tournaments)
+        batched = timed(batched_insert, batched_db, tournaments)
+
+    print(f"rows:     {rows}")
+    print(f"legacy:   {legacy:.2f}s ({rows / legacy:,.0f} rows/s)")
+    print(f"batched:  {batched:.2f}s ({rows / batched:,.0f} rows/s)")
+    print(f"speedup:  {legacy / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
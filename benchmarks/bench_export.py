@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Streaming export throughput and peak memory on a synthetic tournaments table
+
+Each format runs in its own process so peak RSS is measured per exporter.
+
+Usage: python benchmarks/bench_export.py [rows]    (default: 1,000,000)
+"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.initDB import create_database, get_connection
+from src.database.writer import UPSERT_SQL, TournamentWriter
+from src.database.exporter import export_tournaments
+
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club', 'Corporate', 'District']
+SPORTS = ['cricket', 'football', 'basketball', 'badminton', 'chess']
+
+
+def seed(db_path, rows, batch=50000):
+    conn = get_connection(db_path)
+    for offset in range(0, rows, batch):
+        conn.executemany(UPSERT_SQL, (
+            TournamentWriter.to_row(SPORTS[i % len(SPORTS)], {
+                'name': f"Synthetic Tournament {i}",
+                'level': LEVELS[i % len(LEVELS)],
+                'start_date': f"{2025 + i % 3}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                'end_date': f"{2025 + i % 3}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                'official_url': f"https://example.com/t/{i}",
+                'streaming_links': 'Platform1, Platform2',
+                'summary': 'A synthetic tournament used to benchmark streaming exports.',
+                'location': 'Mumbai, India',
+                'sources': [f"https://example.com/source/{i % 100}"],
+            }) for i in range(offset, min(offset + batch, rows))
+        ))
+        conn.commit()
+    conn.close()
+
+
+def run_export(fmt, db_path, out_dir, results):
+    start = time.perf_counter()
+    path, count = export_tournaments(fmt, os.path.join(out_dir, f"export.{fmt}"), db_path=db_path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((fmt, count, elapsed, peak_mb, os.path.getsize(path) / 1e6))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        create_database(db_path)
+        start = time.perf_counter()
+        seed(db_path, rows)
+        print(f"seeded {rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+        results = multiprocessing.Queue()
+        print(f"{'format':8} {'rows':>10} {'seconds':>8} {'rows/s':>10} {'peak RSS MB':>12} {'file MB':>8}")
+        for fmt in ('csv', 'ndjson', 'parquet', 'arrow'):
+            process = multiprocessing.Process(target=run_export, args=(fmt, db_path, tmp, results))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                print(f"{fmt:8} failed (exit code {process.exitcode})")
+                continue
+            fmt, count, elapsed, peak_mb, size_mb = results.get()
+            print(f"{fmt:8} {count:>10,} {elapsed:>8.2f} {count / elapsed:>10,.0f} {peak_mb:>12.1f} {size_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+"What's on between X and Y": overlap predicate on idx_start_date vs the tournaments_days R*Tree
+
+Usage: python benchmarks/bench_intervals.py [rows ...]
+
+Every table has the same calendar density (PER_DAY tournaments starting
+per day, mostly short events plus some multi-month leagues), so a larger
+table means a longer history - as it grows when the scraper runs for
+years. The queried week/month is at the end of the history ("this week").
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.initDB import create_database, get_connection
+from src.api.queries import fetch_tournament_page, TOURNAMENT_COLUMNS
+
+PER_DAY = 30
+SPORTS = ['cricket', 'football', 'basketball', 'badminton', 'chess']
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club']
+
+# The old way: start_date <= Y AND end_date >= X, served by idx_start_date
+RANGE_SCAN_SQL = f'''
+    SELECT {', '.join(TOURNAMENT_COLUMNS)} FROM tournaments
+    WHERE start_date IS NOT NULL {{filters}} AND start_date <= ? AND end_date >= ?
+    ORDER BY start_date, id LIMIT 101
+'''
+
+
+def populate(conn, rows):
+    """rows tournaments ending today-ish, PER_DAY starting every day; returns the last day"""
+    rng = random.Random(7)
+    days = rows // PER_DAY
+    first = date(2030, 1, 1) - timedelta(days=days)
+
+    def generate():
+        for i in range(rows):
+            start = first + timedelta(days=i // PER_DAY)
+            length = rng.choice([0, 1, 2, 3, 5, 7, 10, 14])
+            if rng.random() < 0.05:
+                length = rng.randint(60, 240)  # leagues running for months
+            yield (f"Benchmark Cup {i}", rng.choice(SPORTS), rng.choice(LEVELS),
+                   start.isoformat(), (start + timedelta(days=length)).isoformat(), f"bench {i}")
+
+    with conn:
+        conn.executemany('''
+            INSERT INTO tournaments (name, sport, level, start_date, end_date, name_key)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', generate())
+    return first + timedelta(days=days - 1)
+
+
+def timed(fn, repeat=15):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [25000, 100000, 400000]
+
+    print(f"{'rows':>8} {'years':>6} {'window':<22} {'range scan ms':>14} {'R*Tree ms':>10} {'rows/page':>10}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'intervals.db')
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_database(db_path)
+            conn = get_connection(db_path)
+            last_day = populate(conn, rows)
+
+            windows = [
+                ('this week', last_day - timedelta(days=6), last_day, {}),
+                ('this month', last_day - timedelta(days=29), last_day, {}),
+                ('this month, cricket', last_day - timedelta(days=29), last_day,
+                 {'sport': 'cricket', 'level': 'National'}),
+            ]
+            for label, start, end, filters in windows:
+                clauses = ''.join(f' AND {column} = ?' for column in filters)
+                sql = RANGE_SCAN_SQL.format(filters=clauses)
+                params = list(filters.values()) + [end.isoformat(), start.isoformat()]
+                scan_ms, _ = timed(lambda: conn.execute(sql, params).fetchall())
+                rtree_ms, (page, _) = timed(lambda: fetch_tournament_page(
+                    conn, running_from=start.isoformat(), running_to=end.isoformat(), **filters))
+                print(f"{rows:>8} {rows / PER_DAY / 365:>6.1f} {label:<22} {scan_ms:>14.2f} "
+                      f"{rtree_ms:>10.2f} {len(page):>10}")
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Relevance pruning: LLM prompt tokens per page and tournament recall, before vs after
+
+Usage: python benchmarks/bench_pruning.py [page.html ...]
+
+Without arguments, every page in benchmarks/fixtures is used. Recall is
+measured on what the LLM would actually see: the tournament names and
+dates found in the cleaned page, versus those left in the chunks sent
+(at most max_chunks chunks, with and without pruning).
+"""
+
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.html_cleaner import clean_html_content
+from src.utils.html_chunker import chunk_text, estimate_tokens
+from src.utils.content_pruner import prune_content
+from src.utils.llm_extractor import GroqExtractor
+
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+
+# Same patterns the benchmark suite's fake Groq uses to "extract" tournaments
+TOURNAMENT_NAME = re.compile(
+    r"[A-Z][\w'.\-]*(?: [\w'.\-]+)*? (?:Trophy|Cup|Championship|Series|League|Tournament) \d{4}(?: Group [A-Z])?"
+)
+DATE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{1,2} [A-Z][a-z]+ \d{4}|[A-Z][a-z]+ \d{1,2}, \d{4}|\d{1,2}/\d{1,2}/\d{4}')
+
+
+def sent_to_llm(text):
+    """The text of the chunks extract_tournaments_from_text would send"""
+    chunks = chunk_text(text, GroqExtractor.chunk_tokens)[:GroqExtractor.max_chunks]
+    return '\n'.join(chunks), len(chunks)
+
+
+def recall(expected, text):
+    if not expected:
+        return 1.0
+    return sum(1 for item in expected if item in text) / len(expected)
+
+
+def main():
+    paths = sys.argv[1:] or [os.path.join(FIXTURE_DIR, name) for name in sorted(os.listdir(FIXTURE_DIR))
+                             if name.endswith(('.html', '.htm'))]
+
+    print(f"{'page':22} {'tokens':>7} {'pruned':>7} {'saved':>6} {'chunks':>7} "
+          f"{'names':>6} {'recall':>13} {'dates recall':>13} {'prune ms':>9}")
+    totals = {'before': 0, 'after': 0, 'names': 0, 'names_before': 0, 'names_after': 0}
+    for path in paths:
+        with open(path, 'rb') as f:
+            cleaned = clean_html_content(f.read())
+
+        started = time.perf_counter()
+        pruned = prune_content(cleaned, 'cricket', GroqExtractor.prune_tokens)
+        elapsed = time.perf_counter() - started
+
+        before_text, before_chunks = sent_to_llm(cleaned)
+        after_text, after_chunks = sent_to_llm(pruned)
+        names = set(TOURNAMENT_NAME.findall(cleaned))
+        dates = set(DATE.findall(cleaned))
+        before, after = estimate_tokens(before_text), estimate_tokens(after_text)
+
+        totals['before'] += before
+        totals['after'] += after
+        totals['names'] += len(names)
+        totals['names_before'] += sum(1 for name in names if name in before_text)
+        totals['names_after'] += sum(1 for name in names if name in after_text)
+        print(f"{os.path.basename(path)[:22]:22} {before:>7} {after:>7} {1 - after / before:>6.0%} "
+              f"{before_chunks:>3}->{after_chunks:<3} {len(names):>6} "
+              f"{recall(names, before_text):>5.0%}->{recall(names, after_text):<6.0%} "
+              f"{recall(dates, before_text):>5.0%}->{recall(dates, after_text):<6.0%} {elapsed * 1000:>9.1f}")
+
+    names = totals['names'] or 1
+    print(f"\ntotal: {totals['before']} -> {totals['after']} prompt tokens "
+          f"({1 - totals['after'] / totals['before']:.0%} saved), tournament recall "
+          f"{totals['names_before'] / names:.1%} -> {totals['names_after'] / names:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tournament search: LIKE '%...%' table scan vs FTS5 + bm25 (GET /tournaments?q=)
+
+Usage: python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.initDB import create_database, get_connection
+from src.database.writer import TournamentWriter
+from src.api.queries import fetch_tournament_page, TOURNAMENT_COLUMNS
+
+SERIES = ['Ranji Trophy', 'T20 Blast', 'Vijay Hazare Trophy', 'Premier League', 'Champions Cup',
+          'Open Championship', 'Youth Games', 'Inter-University Cup', 'Masters Series', 'Grand Prix']
+SPORTS = ['cricket', 'football', 'basketball', 'badminton', 'chess']
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club']
+CITIES = ['Mumbai', 'Delhi', 'Chennai', 'Kolkata', 'Bengaluru', 'Pune', 'Hyderabad', 'Jaipur',
+          'London', 'Melbourne', 'Dubai', 'Colombo', 'Lahore', 'Dhaka', 'Auckland', 'Cape Town']
+SEARCHES = ['Ranji', 'T20', 'Mumbai', 'ranji mumbai', 'Champ', 'Colombo T20', 'Hazare Pune']
+
+
+def synthetic_rows(count):
+    rng = random.Random(42)
+    for i in range(count):
+        city = rng.choice(CITIES)
+        yield rng.choice(SPORTS), {
+            'name': f"{rng.choice(SERIES)} {city} {i}",
+            'level': rng.choice(LEVELS),
+            'start_date': f"2027-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'summary': f"Season {i % 50} of the {rng.choice(SERIES).lower()} format held in {city}",
+            'location': f"{city}, {rng.choice(['India', 'England', 'Australia', 'UAE'])}",
+        }
+
+
+def like_search(conn, text, sport=None, limit=100):
+    """What the API would have to do without an index"""
+    clauses, params = ['start_date IS NOT NULL'], []
+    for word in text.split():
+        clauses.append('(name LIKE ? OR summary LIKE ? OR location LIKE ?)')
+        params += [f'%{word}%'] * 3
+    if sport:
+        clauses.append('sport = ?')
+        params.append(sport)
+    return conn.execute(f'''
+        SELECT {', '.join(TOURNAMENT_COLUMNS)} FROM tournaments
+        WHERE {' AND '.join(clauses)} ORDER BY start_date, id LIMIT ?
+    ''', params + [limit]).fetchall()
+
+
+def timed(fn, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'search.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_database(db_path)
+
+        start = time.perf_counter()
+        with TournamentWriter(db_path) as writer:
+            batch = {}
+            for sport, tournament in synthetic_rows(rows):
+                batch.setdefault(sport, []).append(tournament)
+                if len(batch[sport]) == 5000:
+                    writer.write(sport, batch.pop(sport))
+            for sport, tournaments in batch.items():
+                writer.write(sport, tournaments)
+        print(f"rows:     {rows} (loaded with FTS triggers in {time.perf_counter() - start:.1f}s)")
+
+        conn = get_connection(db_path)
+        print(f"{'search':<22} {'matches':>8} {'LIKE ms':>9} {'FTS5 ms':>9} {'FTS5+sport ms':>14}")
+        for text in SEARCHES:
+            matches = conn.execute(
+                "SELECT COUNT(*) FROM tournaments_fts WHERE tournaments_fts MATCH ?",
+                (' '.join(f'"{w}"*' for w in text.split()),)
+            ).fetchone()[0]
+            like = timed(lambda: like_search(conn, text))
+            fts = timed(lambda: fetch_tournament_page(conn, q=text))
+            fts_sport = timed(lambda: fetch_tournament_page(conn, q=text, sport='cricket'))
+            print(f"{text:<22} {matches:>8} {like:>9.2f} {fts:>9.2f} {fts_sport:>14.2f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
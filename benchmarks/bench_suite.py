@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark: scrape pipeline, DB inserts and API latency
+
+Usage: python benchmarks/bench_suite.py [--sources 40] [--llm-latency 0.2]
+                                        [--rpm 300] [--tpm 1000000] [--fail-every 0]
+                                        [--rows 20000] [--api-requests 200]
+                                        [--output results.json] [--compare old.json]
+
+Everything runs against a local HTTP server. It serves the HTML in
+benchmarks/fixtures (or --fixtures DIR) and stands in for the Groq chat
+completions endpoint. The fake Groq answers after --llm-latency seconds
+with tournaments found in the prompt. It enforces --rpm/--tpm per minute
+and sends the same x-ratelimit-* headers as Groq, with 429 + retry-after
+when a limit is exceeded. --fail-every N forces a 429 on every Nth request.
+The real query_groq, rate limiter and pipeline are exercised end to end;
+no network access or API key is needed.
+
+Results are written as JSON (default: benchmarks/results/<time>_<commit>.json);
+--compare prints the change of every metric against an earlier result file.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_db_insert import synthetic_tournaments
+from src.database.initDB import create_database
+from src.database.writer import TournamentWriter
+from src.scrapers.cricket_scraper import CricketScraper
+from src.scrapers.pipeline import percentile
+from src.utils.llm_extractor import GroqExtractor
+from src.utils.rate_limiter import RateLimiter
+
+FIXTURE_DIR = os.path.join(ROOT, 'benchmarks', 'fixtures')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+COMPLETIONS_PATH = '/openai/v1/chat/completions'
+
+TOURNAMENT_NAME = re.compile(
+    r"[A-Z][\w'.\-]*(?: [\w'.\-]+)*? (?:Trophy|Cup|Championship|Series|League|Tournament) \d{4}(?: Group [A-Z])?"
+)
+DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+PAGE_MARKER = re.compile(r'=== PAGE (\d+): ')
+
+
+class FakeGroq:
+    """Chat completions stand-in with latency, per-minute limits and forced 429s"""
+
+    def __init__(self, latency=0.2, rpm=300, tpm=1000000, fail_every=0, retry_after=1.0):
+        self.latency = latency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rate_limited = 0
+        self._window_start = time.time()
+        self._window_requests = 0
+        self._window_tokens = 0
+        self._lock = threading.Lock()
+
+    def _headers(self, now):
+        reset = max(0.0, 60 - (now - self._window_start))
+        return {
+            'x-ratelimit-limit-requests': str(self.rpm),
+            'x-ratelimit-remaining-requests': str(max(0, self.rpm - self._window_requests)),
+            'x-ratelimit-reset-requests': f"{reset:.2f}s",
+            'x-ratelimit-limit-tokens': str(self.tpm),
+            'x-ratelimit-remaining-tokens': str(max(0, self.tpm - self._window_tokens)),
+            'x-ratelimit-reset-tokens': f"{reset:.2f}s",
+        }
+
+    def admit(self, tokens):
+        """(status, headers) for a request of `tokens`, counted against the window"""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= 60:
+                self._window_start, self._window_requests, self._window_tokens = now, 0, 0
+            self.requests += 1
+
+            forced = self.fail_every and self.requests % self.fail_every == 0
+            over = self._window_requests + 1 > self.rpm or self._window_tokens + tokens > self.tpm
+            if forced or over:
+                self.rate_limited += 1
+                headers = self._headers(now)
+                retry_after = self.retry_after if forced else 60 - (now - self._window_start)
+                headers['retry-after'] = f"{retry_after:.2f}"
+                return 429, headers
+
+            self._window_requests += 1
+            self._window_tokens += tokens
+            return 200, self._headers(now)
+
+    @staticmethod
+    def complete(prompt):
+        """Tournaments named in the prompt's page content, as the LLM would return them
+
+        Batched prompts (=== PAGE n: url ===) get a "page" number per tournament.
+        """
+        if 'PAGE CONTENT' not in prompt and '=== PAGE ' not in prompt:
+            return 'Yes'
+        content = prompt.split('REQUIRED JSON FORMAT', 1)[0]
+        tournaments, page = {}, None
+        for line in content.split('\n'):
+            marker = PAGE_MARKER.match(line)
+            if marker:
+                page = int(marker.group(1))
+                continue
+            dates = DATE.findall(line)
+            for name in TOURNAMENT_NAME.findall(line):
+                tournament = tournaments.setdefault((page, name), {
+                    'name': name,
+                    'level': 'National',
+                    'start_date': dates[0] if dates else '2099-06-01',
+                    'end_date': dates[1] if len(dates) > 1 else (dates[0] if dates else '2099-06-01'),
+                    'official_url': '',
+                    'streaming_links': '',
+                    'image_url': '',
+                    'summary': 'Benchmark tournament',
+                    'location': '',
+                })
+                if page is not None:
+                    tournament['page'] = page
+        return json.dumps(list(tournaments.values()))
+
+
+class BenchHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; avoid Nagle + delayed ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # /<copy>/<fixture>.html - every copy is a distinct source URL
+        name = os.path.basename(self.path)
+        body = self.server.fixtures.get(name)
+        if body is None:
+            self._send(404, b'not found', 'text/plain')
+            return
+        if self.server.fetch_latency:
+            time.sleep(self.server.fetch_latency)
+        self._send(200, body, 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        if self.path != COMPLETIONS_PATH:
+            self._send(404, b'{}', 'application/json')
+            return
+        llm = self.server.llm
+        prompt = ''.join(message['content'] for message in payload['messages'])
+        prompt_tokens = len(prompt) // 4
+
+        status, headers = llm.admit(prompt_tokens)
+        if status == 429:
+            body = json.dumps({'error': {'message': 'Rate limit reached', 'type': 'tokens'}})
+            self._send(429, body.encode('utf-8'), 'application/json', headers)
+            return
+
+        time.sleep(llm.latency)
+        content = llm.complete(payload['messages'][-1]['content'])
+        body = json.dumps({
+            'choices': [{'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(content) // 4,
+                      'total_tokens': prompt_tokens + len(content) // 4},
+        })
+        self._send(200, body.encode('utf-8'), 'application/json', headers)
+
+
+def start_server(fixture_dir, llm, fetch_latency=0.0):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BenchHandler)
+    server.daemon_threads = True
+    server.fixtures = {}
+    for name in sorted(os.listdir(fixture_dir)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(fixture_dir, name), 'rb') as f:
+                server.fixtures[name] = f.read()
+    server.llm = llm
+    server.fetch_latency = fetch_latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def latency_summary(samples):
+    return {
+        'count': len(samples),
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'max_ms': max(samples) * 1000 if samples else 0.0,
+    }
+
+
+def bench_scrape(server, args):
+    """End-to-end CricketScraper.scrape_all_tournaments against the local server"""
+    base = f"http://127.0.0.1:{server.server_port}"
+    names = sorted(server.fixtures)
+    sources = [f"{base}/copy{i // len(names)}/{names[i % len(names)]}" for i in range(args.sources)]
+
+    llm = GroqExtractor('bench-key', cache=False, limiter=RateLimiter('groq:bench', requests_per_minute=args.rpm))
+    llm.base_url = base + COMPLETIONS_PATH
+    scraper = CricketScraper(llm=llm)
+    scraper.all_sources = sources
+    scraper.report_interval = 0
+
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output if not args.verbose else sys.stdout):
+        summary = scraper.scrape_all_tournaments()
+    wall = time.perf_counter() - started
+    llm.limiter.close()
+
+    return {
+        'sources': len(sources),
+        'wall_seconds': wall,
+        'sources_per_s': len(sources) / wall,
+        'tournaments_saved': summary['tournaments'],
+        'tournaments_per_s': summary['tournaments'] / wall,
+        'llm_requests': server.llm.requests,
+        'llm_rate_limited': server.llm.rate_limited,
+        'llm_errors': llm.errors,
+        'rate_limiter_wait_seconds': llm.limiter.waited,
+        'llm_batches': sum(stage.get('batches', 0) for stage in summary['stages']),
+        'extraction_paths': dict(scraper.extraction_paths),
+        'stages': {stage['stage']: stage for stage in summary['stages']},
+    }
+
+
+def bench_db_insert(args):
+    """Batched TournamentWriter upserts (one transaction per 50 rows, like one source)"""
+    tournaments = synthetic_tournaments(args.rows)
+    started = time.perf_counter()
+    with TournamentWriter() as writer:
+        for i in range(0, len(tournaments), 50):
+            writer.write('cricket', tournaments[i:i + 50])
+    elapsed = time.perf_counter() - started
+    return {'rows': args.rows, 'seconds': elapsed, 'rows_per_s': args.rows / elapsed}
+
+
+def bench_api(args):
+    """Latency of the API handlers, uncached (cache cleared per request) and cached"""
+    from src.api.app import app, response_cache
+
+    client = app.test_client()
+    endpoints = [
+        '/tournaments',
+        '/tournaments?sport=cricket',
+        '/tournaments?sport=cricket&level=National',
+        '/tournaments?sport=cricket&start_date=2027-06-01&end_date=2027-12-31',
+        '/sports',
+        '/levels?sport=cricket',
+    ]
+    results = {}
+    for endpoint in endpoints:
+        for mode in ('uncached', 'cached'):
+            samples = []
+            for _ in range(args.api_requests):
+                if mode == 'uncached':
+                    response_cache.clear()
+                started = time.perf_counter()
+                response = client.get(endpoint)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200, (endpoint, response.status_code)
+            results.setdefault(endpoint, {})[mode] = latency_summary(samples)
+
+    # Paging deep through the listing with the keyset cursor
+    samples, url = [], '/tournaments?sport=cricket&limit=100'
+    while url and len(samples) < args.api_requests:
+        response_cache.clear()
+        started = time.perf_counter()
+        body = client.get(url).get_json()
+        samples.append(time.perf_counter() - started)
+        cursor = body['next_cursor']
+        url = f"/tournaments?sport=cricket&limit=100&cursor={cursor}" if cursor else None
+    results['/tournaments?cursor (deep paging)'] = {'uncached': latency_summary(samples)}
+    return results
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def flatten(data, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1} for numeric leaves"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old_path, result):
+    with open(old_path) as f:
+        old = json.load(f)
+    before, after = flatten(old['results']), flatten(result['results'])
+    print(f"\nChange vs {old_path} ({old['meta'].get('commit')}):")
+    for name in sorted(set(before) & set(after)):
+        if before[name]:
+            change = (after[name] - before[name]) / before[name] * 100
+            print(f"  {name:<75} {before[name]:>12.3f} -> {after[name]:>12.3f} ({change:+.1f}%)")
+
+
+def print_summary(result):
+    scrape, db = result['results']['scrape'], result['results']['db_insert']
+    print(f"scrape:  {scrape['sources']} sources in {scrape['wall_seconds']:.2f}s "
+          f"({scrape['sources_per_s']:.1f} sources/s, {scrape['tournaments_saved']} tournaments, "
+          f"{scrape['llm_requests']} LLM requests, {scrape['llm_rate_limited']} rate limited)")
+    for name, stage in scrape['stages'].items():
+        print(f"  {name:<9} p50 {stage['p50_seconds'] * 1000:8.1f}ms  p95 {stage['p95_seconds'] * 1000:8.1f}ms  "
+              f"p99 {stage['p99_seconds'] * 1000:8.1f}ms  {stage['utilization']:.0%} busy")
+    print(f"db:      {db['rows']} rows in {db['seconds']:.2f}s ({db['rows_per_s']:,.0f} rows/s)")
+    print("api:")
+    for endpoint, modes in result['results']['api'].items():
+        line = '  '.join(f"{mode} p50 {stats['p50_ms']:.2f}ms p95 {stats['p95_ms']:.2f}ms"
+                         for mode, stats in modes.items())
+        print(f"  {endpoint:<70} {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help='Directory of recorded HTML pages')
+    parser.add_argument('--sources', type=int, default=40, help='Source URLs to scrape (fixtures are repeated)')
+    parser.add_argument('--fetch-latency', type=float, default=0.05, help='Seconds per page fetch')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='Seconds per LLM completion')
+    parser.add_argument('--rpm', type=int, default=300, help='Fake Groq requests per minute')
+    parser.add_argument('--tpm', type=int, default=1000000, help='Fake Groq tokens per minute')
+    parser.add_argument('--fail-every', type=int, default=0, help='Force a 429 on every Nth LLM request')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='retry-after of forced 429s')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows for the DB insert benchmark')
+    parser.add_argument('--api-requests', type=int, default=200, help='Requests per API endpoint')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<time>_<commit>.json)')
+    parser.add_argument('--compare', help='Earlier result file to compare against')
+    parser.add_argument('--verbose', action='store_true', help='Show scraper output')
+    args = parser.parse_args()
+
+    commit, dirty = git_revision()
+    llm = FakeGroq(args.llm_latency, args.rpm, args.tpm, args.fail_every, args.retry_after)
+    server = start_server(args.fixtures, llm, args.fetch_latency)
+
+    # Fresh database, caches, rate limiter state and feeds for every run
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                create_database()
+            results = {
+                'scrape': bench_scrape(server, args),
+                'db_insert': bench_db_insert(args),
+                'api': bench_api(args),
+            }
+        finally:
+            os.chdir(cwd)
+            server.shutdown()
+
+    config = {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'verbose')}
+    config['fixtures'] = sorted(server.fixtures)
+    result = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': config,
+        },
+        'results': results,
+    }
+
+    print_summary(result)
+    path = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(args.compare, result)
+
+
+if __name__ == "__main__":
+    main()
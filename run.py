@@ -6,6 +6,7 @@ Main runner for Sports Tournament Calendar System
 import os
 import sys
 import argparse
+from datetime import date
 from src.database.initDB import create_database
 from src.api.app import app
 
@@ -15,42 +16,214 @@ def setup_project():
     create_database()
     print("Project setup complete!")
 
-def run_scrapers():
-    """Run all tournament scrapers"""
+def connect_llm():
+    """Groq extractor shared by every scraper, or None if it can't be used"""
+    from src.utils.llm_extractor import GroqExtractor
+    
+    api_key = os.getenv('GROQ_API_KEY')
+    if not api_key:
+        print("GROQ_API_KEY not found! Get one from: https://console.groq.com/")
+        return None
+    
+    llm = GroqExtractor(api_key, model="llama3-70b-8192")
+    if not llm.health.is_available():
+        print("Could not connect to Groq API")
+        return None
+    return llm
+
+def run_scrapers(sports=None, workers=None):
+    """Run the registered sport scrapers concurrently"""
     print("Starting tournament data collection...")
-    # Import and run scrapers
-    from src.scrapers.cricket_scraper import CricketScraper
-    # from src.scrapers.football_scraper import FootballScraper
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from src.scrapers.registry import available_sports, get_scraper_class
+    from src.database.writer import TournamentWriter
+    from src.database.ics_feeds import refresh_feeds
+    from src.utils.metrics import metrics
+    from src.api.app import SCRAPE_METRICS_FILE
+    
+    sports = sports or available_sports()
+    scraper_classes = [get_scraper_class(sport) for sport in sports]
+    
+    # One LLM client (rate budget, cache, health) and one DB writer for every sport;
+    # scraping is I/O-bound, so threads overlap the waits without extra processes
+    llm = connect_llm()
+    if llm is None:
+        return
+    writer = TournamentWriter()
     
-    # Add scraper execution logic here
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers or len(scraper_classes)) as pool:
+            futures = {
+                pool.submit(scraper_class(llm=llm, writer=writer).scrape_all): scraper_class.sport
+                for scraper_class in scraper_classes
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Scraper for {futures[future]} failed: {e}")
+    finally:
+        changed = writer.rows_changed
+        writer.close()
+    
+    if changed:
+        regenerated = refresh_feeds()
+        print(f"Regenerated {len(regenerated)} calendar feeds")
+    
+    for result in sorted(results, key=lambda r: r['sport']):
+        print(f"  {result['sport']}: {result['tournaments']} tournaments from {result['sources']} sources")
+    
+    # Timings/counters of this run, also served by the API's /metrics
+    if metrics.enabled:
+        metrics.show_summary()
+        metrics.write_textfile(SCRAPE_METRICS_FILE)
     print("Data collection complete!")
 
-def start_api():
-    """Start the Flask API server"""
+def run_scheduler(args):
+    """Re-scrape each source when it is due, adapting its interval to how often it changes"""
+    print("Starting re-scrape scheduler...")
+    from src.scrapers.registry import available_sports, get_scraper_class
+    from src.scrapers.scheduler import SourceScheduler
+    from src.database.writer import TournamentWriter
+    from src.api.app import SCRAPE_METRICS_FILE
+    
+    llm = connect_llm()
+    if llm is None:
+        return
+    writer = TournamentWriter()
+    scrapers = [get_scraper_class(sport)(llm=llm, writer=writer)
+                for sport in args.sports or available_sports()]
+    
+    scheduler = SourceScheduler(
+        scrapers,
+        writer=writer,
+        max_requests=args.max_requests,
+        max_llm_tokens=args.max_llm_tokens,
+        cycle_seconds=args.cycle,
+        metrics_file=SCRAPE_METRICS_FILE,
+    )
+    try:
+        scheduler.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Scheduler stopped")
+    finally:
+        writer.close()
+
+def start_api(args):
+    """Start the Flask API server (development server, or gunicorn/waitress with --prod)"""
     print("Starting API server...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if not args.prod:
+        app.run(debug=True, host=args.host, port=args.port)
+        return
+    
+    from src.api.server import serve_production
+    try:
+        serve_production(app, args.host, args.port, args.processes, args.threads)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-def export_data():
-    """Export data to CSV/JSON"""
+def export_data(args):
+    """Export data to CSV/NDJSON/Parquet/Arrow"""
     print("Exporting tournament data...")
-    # Import and run export functions
+    from src.database.exporter import export_tournaments
+    
+    path, count = export_tournaments(
+        fmt=args.format,
+        path=args.output,
+        sport=args.sport,
+        level=args.level,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        incremental=args.incremental,
+        running_from=args.running_from,
+        running_to=args.running_to,
+    )
+    print(f"Exported {count} tournaments to {path}")
     print("Data export complete!")
 
+def build_feeds():
+    """Regenerate the .ics calendar feeds"""
+    print("Building calendar feeds...")
+    from src.database.ics_feeds import refresh_feeds
+    regenerated = refresh_feeds()
+    print(f"Regenerated {len(regenerated)} feeds")
+
+def iso_date(value):
+    """argparse type for YYYY-MM-DD options, kept as the string the queries expect"""
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+    return value
+
 def main():
     parser = argparse.ArgumentParser(description='Sports Tournament Calendar System')
-    parser.add_argument('command', choices=['setup', 'scrape', 'api', 'export'], 
+    parser.add_argument('command', choices=['setup', 'scrape', 'schedule', 'api', 'export', 'feeds'], 
                         help='Command to run')
     
+    scrape_group = parser.add_argument_group('scrape options')
+    scrape_group.add_argument('--sports', nargs='+', metavar='SPORT',
+                              help='Sports to scrape (default: all registered)')
+    scrape_group.add_argument('--workers', type=int,
+                              help='Sports scraped at the same time (default: one per sport)')
+    
+    schedule_group = parser.add_argument_group('schedule options (also --sports)')
+    schedule_group.add_argument('--cycle', type=float, default=60,
+                                help='Minimum seconds between scheduler cycles (default: 60)')
+    schedule_group.add_argument('--max-requests', type=int, default=20,
+                                help='Sources fetched per cycle at most (default: 20)')
+    schedule_group.add_argument('--max-llm-tokens', type=int, default=12000,
+                                help='Expected LLM input tokens per cycle at most (default: 12000)')
+    schedule_group.add_argument('--once', action='store_true',
+                                help='Run a single cycle and exit')
+    
+    api_group = parser.add_argument_group('api options')
+    api_group.add_argument('--prod', action='store_true',
+                           help='Serve with gunicorn (or waitress) instead of the debug server')
+    api_group.add_argument('--host', default='0.0.0.0', help='Address to listen on (default: 0.0.0.0)')
+    api_group.add_argument('--port', type=int, default=5000, help='Port to listen on (default: 5000)')
+    api_group.add_argument('--processes', type=int,
+                           help='--prod worker processes (default: one per CPU)')
+    api_group.add_argument('--threads', type=int, default=8,
+                           help='--prod threads per worker process (default: 8)')
+    
+    export_group = parser.add_argument_group('export options')
+    export_group.add_argument('--format', choices=['csv', 'ndjson', 'parquet', 'arrow'], default='csv',
+                              help='Export format (default: csv)')
+    export_group.add_argument('--output', help='Output file (default: output/tournaments_<filters>.<format>)')
+    export_group.add_argument('--sport', help='Only export this sport')
+    export_group.add_argument('--level', help='Only export this competition level')
+    export_group.add_argument('--from', dest='date_from', help='Only tournaments starting on/after YYYY-MM-DD')
+    export_group.add_argument('--to', dest='date_to', help='Only tournaments starting on/before YYYY-MM-DD')
+    export_group.add_argument('--running-from', metavar='DATE', type=iso_date,
+                              help='Only tournaments still running on/after YYYY-MM-DD')
+    export_group.add_argument('--running-to', metavar='DATE', type=iso_date,
+                              help='Only tournaments already running on/before YYYY-MM-DD')
+    export_group.add_argument('--incremental', action='store_true',
+                              help='Only rows changed since the last incremental export')
+    
     args = parser.parse_args()
     
+    if args.sports:
+        from src.scrapers.registry import available_sports
+        unknown = [sport for sport in args.sports if sport not in available_sports()]
+        if unknown:
+            parser.error(f"unknown sport(s) {', '.join(unknown)} (choose from {', '.join(available_sports())})")
+    
     if args.command == 'setup':
         setup_project()
     elif args.command == 'scrape':
-        run_scrapers()
+        run_scrapers(args.sports, args.workers)
+    elif args.command == 'schedule':
+        run_scheduler(args)
     elif args.command == 'api':
-        start_api()
+        start_api(args)
     elif args.command == 'export':
-        export_data()
+        export_data(args)
+    elif args.command == 'feeds':
+        build_feeds()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
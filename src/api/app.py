@@ -1,56 +1,219 @@
-#!/usr/bin/env python3
 """
-Main runner for Sports Tournament Calendar System
+Flask API for the Sports Tournament Calendar
 """
 
-import os
-import sys
-import argparse
-from src.database.initDB import create_database
-from src.api.app import app
-
-def setup_project():
-    """Initial project setup"""
-    print("Setting up Sports Tournament Calendar...")
-    create_database()
-    print("Project setup complete!")
-
-def run_scrapers():
-    """Run all tournament scrapers"""
-    print("Starting tournament data collection...")
-    # Import and run scrapers
-    from src.scrapers.cricket_scraper import CricketScraper
-    # from src.scrapers.football_scraper import FootballScraper
+import time
+import threading
+from functools import wraps
+from flask import Flask, Response, jsonify, request, g
+from ..database.initDB import get_data_version
+from ..database.ics_feeds import FeedCache
+from ..utils.metrics import metrics, merged_registry
+from . import queries
+from .cache import ResponseCache
+from .pool import ConnectionPool
+
+app = Flask(__name__)
+
+# Rendered responses, reused until the scraper bumps data_version
+response_cache = ResponseCache()
+VERSION_CHECK_INTERVAL = 1.0  # seconds between data_version lookups
+_version_state = {'version': None, 'checked_at': 0.0}
+_version_lock = threading.Lock()
+
+# Precomputed .ics feeds (written by refresh_feeds after each scrape)
+feed_cache = FeedCache()
+
+# Read-only connections reused across requests (one pool per worker process)
+db_pool = ConnectionPool()
+
+# Metrics of the last scrape run, written by run.py and appended to /metrics
+SCRAPE_METRICS_FILE = 'output/metrics/scrape.prom'
+
+
+def get_db():
+    """Database connection for this request, borrowed from db_pool"""
+    if 'db' not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+
+@app.before_request
+def start_timer():
+    if metrics.enabled:
+        g.started = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    if metrics.enabled and 'started' in g:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('api_request_seconds', time.perf_counter() - g.started,
+                        endpoint=endpoint, status=response.status_code)
+    return response
+
+
+@app.teardown_appcontext
+def close_db(exception=None):
+    db = g.pop('db', None)
+    if db is not None:
+        db_pool.release(db)
+
+
+def current_data_version():
+    """data_version from the database, looked up at most once per interval"""
+    with _version_lock:
+        now = time.monotonic()
+        if _version_state['version'] is None or now - _version_state['checked_at'] >= VERSION_CHECK_INTERVAL:
+            _version_state['version'] = get_data_version(get_db())
+            _version_state['checked_at'] = now
+        return _version_state['version']
+
+
+def cached(view):
+    """Serve a JSON endpoint from response_cache with strong ETags
     
-    # Add scraper execution logic here
-    print("Data collection complete!")
-
-def start_api():
-    """Start the Flask API server"""
-    print("Starting API server...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
-
-def export_data():
-    """Export data to CSV/JSON"""
-    print("Exporting tournament data...")
-    # Import and run export functions
-    print("Data export complete!")
-
-def main():
-    parser = argparse.ArgumentParser(description='Sports Tournament Calendar System')
-    parser.add_argument('command', choices=['setup', 'scrape', 'api', 'export'], 
-                        help='Command to run')
+    A matching If-None-Match gets a bodyless 304; otherwise the cached body
+    is returned without querying or serializing again.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = ResponseCache.make_key(request.path, request.args)
+        version = current_data_version()
+        entry = response_cache.get(key, version)
+        metrics.inc('api_cache_total', result='miss' if entry is None else 'hit')
+        
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = response_cache.set(key, version, response.get_data())
+        
+        if request.if_none_match.contains(entry.etag):
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+
+@app.errorhandler(queries.InvalidCursor)
+@app.errorhandler(queries.InvalidSearch)
+@app.errorhandler(queries.InvalidRange)
+def invalid_request(error):
+    return jsonify({'error': str(error)}), 400
+
+
+def parse_limit():
+    try:
+        limit = int(request.args.get('limit', queries.DEFAULT_LIMIT))
+    except ValueError:
+        limit = queries.DEFAULT_LIMIT
+    return max(1, min(limit, queries.MAX_LIMIT))
+
+
+@app.route('/tournaments')
+@cached
+def get_tournaments():
+    """Tournaments filtered by sport/level/date, paginated with ?cursor=
     
-    args = parser.parse_args()
+    With ?q= the matches of a full-text search over name, summary and
+    location are returned instead, best match first. ?running_from= and
+    ?running_to= select what is on during that range: tournaments running
+    on at least one of its days.
+    """
+    tournaments, next_cursor = queries.fetch_tournament_page(
+        get_db(),
+        limit=parse_limit(),
+        sport=request.args.get('sport'),
+        level=request.args.get('level'),
+        start_date=request.args.get('start_date'),
+        end_date=request.args.get('end_date'),
+        cursor=request.args.get('cursor'),
+        q=request.args.get('q'),
+        running_from=request.args.get('running_from'),
+        running_to=request.args.get('running_to'),
+    )
+    return jsonify({
+        'tournaments': tournaments,
+        'count': len(tournaments),
+        'next_cursor': next_cursor,
+    })
+
+
+@app.route('/sports')
+@cached
+def get_sports():
+    """Sports that have at least one tournament"""
+    rows = get_db().execute(queries.SPORTS_SQL).fetchall()
+    return jsonify({'sports': [row[0] for row in rows]})
+
+
+@app.route('/levels')
+@cached
+def get_levels():
+    """Competition levels, optionally only those present for ?sport="""
+    sport = request.args.get('sport')
+    if sport:
+        rows = get_db().execute(queries.SPORT_LEVELS_SQL, (sport,)).fetchall()
+    else:
+        rows = get_db().execute(queries.LEVELS_SQL).fetchall()
+    return jsonify({'levels': [row[0] for row in rows]})
+
+
+@app.route('/feeds')
+def list_feeds():
+    """Available calendar feeds"""
+    names = feed_cache.names()
+    return jsonify({'feeds': [{'name': name, 'url': f"/feeds/{name}.ics"} for name in names]})
+
+
+@app.route('/feeds/<name>.ics')
+def get_feed(name):
+    """iCalendar feed per sport, level or sport+level, served from memory"""
+    feed = feed_cache.get(name)
+    if feed is None:
+        return jsonify({'error': f"Unknown feed: {name}"}), 404
+    body, etag = feed
     
-    if args.command == 'setup':
-        setup_project()
-    elif args.command == 'scrape':
-        run_scrapers()
-    elif args.command == 'api':
-        start_api()
-    elif args.command == 'export':
-        export_data()
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/calendar')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metrics of the API (all worker processes) plus the last scrape run
+
+    Under gunicorn (METRICS_DIR set by serve_production) the workers'
+    metrics files are summed; the other workers' are up to a second old.
+    """
+    directory = app.config.get('METRICS_DIR')
+    if directory:
+        if metrics.enabled:
+            metrics.write_state(directory)
+        body = merged_registry(directory).render()
+    else:
+        body = metrics.render()
+    try:
+        with open(SCRAPE_METRICS_FILE) as f:
+            body += f.read()
+    except OSError:
+        pass
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/health')
+def health():
+    """Health check: API is up and the database answers"""
+    try:
+        get_db().execute('SELECT 1 FROM tournaments LIMIT 1').fetchall()
+        return jsonify({'status': 'ok'})
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503
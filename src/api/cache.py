@@ -0,0 +1,57 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class CachedResponse:
+    __slots__ = ('version', 'body', 'etag')
+
+    def __init__(self, version, body):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of serialized API responses, invalidated by data version
+
+    Entries are keyed on the request path plus normalized (sorted) query
+    parameters and remember the data_version they were rendered at; an
+    entry from an older version is treated as a miss.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(path, args):
+        """Normalize query params so ?a=1&b=2 and ?b=2&a=1 share an entry"""
+        items = sorted((k, v) for k, values in args.lists() for v in values if v != '')
+        return path, tuple(items)
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, version, body):
+        entry = CachedResponse(version, body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
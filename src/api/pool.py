@@ -0,0 +1,57 @@
+import os
+import queue
+import threading
+from ..database.initDB import DB_PATH, get_readonly_connection
+from ..utils.metrics import metrics
+
+
+class ConnectionPool:
+    """Read-only SQLite connections reused across API requests
+
+    A request takes an idle connection (or opens one) and gives it back
+    when it ends, so the page cache and prepared statements survive
+    between requests. At most max_idle connections are kept; the extra
+    ones opened under a burst are closed when released.
+
+    Connections are never shared across processes: a pool used after a
+    fork (server workers) drops the inherited ones and starts empty.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_idle=8):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_process(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle = queue.LifoQueue()
+                self._pid = os.getpid()
+
+    def acquire(self):
+        self._check_process()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            metrics.inc('api_db_connections_total')
+            return get_readonly_connection(self.db_path)
+
+    def release(self, conn):
+        if self._pid != os.getpid():
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        if self._idle.qsize() >= self.max_idle:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
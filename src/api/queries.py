@@ -0,0 +1,246 @@
+import base64
+import json
+import re
+from ..database.initDB import overlap_filter
+
+TOURNAMENT_COLUMNS = [
+    'id', 'name', 'sport', 'level', 'start_date', 'end_date', 'official_url',
+    'streaming_links', 'image_url', 'summary', 'location',
+]
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+SPORTS_SQL = 'SELECT DISTINCT sport FROM tournaments ORDER BY sport'
+LEVELS_SQL = 'SELECT DISTINCT level FROM tournaments ORDER BY level'
+SPORT_LEVELS_SQL = 'SELECT DISTINCT level FROM tournaments WHERE sport = ? ORDER BY level'
+
+# Matches ranked per search (the most recently added ones, after filters)
+SEARCH_CANDIDATES = 1000
+SEARCH_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class InvalidSearch(ValueError):
+    pass
+
+
+class InvalidRange(ValueError):
+    pass
+
+
+def encode_cursor(start_date, row_id):
+    """Opaque keyset cursor for the row after (start_date, id)"""
+    raw = json.dumps([start_date, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, key_type=str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return key_type(key), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+def build_filters(sport=None, level=None, start_date=None, end_date=None,
+                  running_from=None, running_to=None, first_date=None):
+    """WHERE clauses and params shared by every tournament listing
+    
+    running_from/running_to select tournaments running at any time in that
+    range (interval overlap, answered by the tournaments_days R*Tree).
+    """
+    clauses = ['start_date IS NOT NULL']
+    params = []
+    if sport:
+        clauses.append('sport = ?')
+        params.append(sport)
+    if level:
+        clauses.append('level = ?')
+        params.append(level)
+    if start_date:
+        clauses.append('start_date >= ?')
+        params.append(start_date)
+    if end_date:
+        clauses.append('end_date <= ?')
+        params.append(end_date)
+    if running_from or running_to:
+        try:
+            clause, overlap_params = overlap_filter(running_from, running_to, first_date)
+        except ValueError:
+            raise InvalidRange(f"Invalid date range: {running_from or ''}..{running_to or ''} (use YYYY-MM-DD)")
+        clauses.append(clause)
+        params += overlap_params
+    return clauses, params
+
+
+def fts_query(q):
+    """FTS5 MATCH expression for free text: every word, as a prefix (AND)
+
+    Words are quoted, so FTS5 operators and punctuation typed by users
+    can't produce syntax errors.
+    """
+    tokens = SEARCH_TOKEN.findall(q or '')
+    if not tokens:
+        raise InvalidSearch(f"Invalid search: {q}")
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def build_search_query(q, sport=None, level=None, start_date=None, end_date=None,
+                       cursor=None, limit=DEFAULT_LIMIT, running_from=None, running_to=None):
+    """Full-text search ranked by bm25, keyset-paginated on (rank, id)
+
+    The FTS5 index yields the matching rowids newest first, and the
+    sport/level/date filters are applied to the joined rows. Only the first
+    SEARCH_CANDIDATES of those are scored (the index's rank column, weighted
+    in create_search_index) and sorted, so a common word costs about the
+    same as a rare one; older matches are reached by refining the search.
+    Full rows are read for the returned page only.
+    """
+    clauses, params = build_filters(sport, level, start_date, end_date, running_from, running_to)
+    params = [fts_query(q)] + params + [max(SEARCH_CANDIDATES, limit + 1)]
+    page = ''
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor, float)
+        page = 'WHERE (rank, id) > (?, ?)'
+        params += [after_rank, after_id]
+    columns = ', '.join(f't.{column}' for column in TOURNAMENT_COLUMNS)
+    sql = f'''
+        SELECT {columns}, ranked.rank FROM (
+            SELECT id, rank FROM (
+                SELECT tournaments_fts.rowid AS id, tournaments_fts.rank AS rank
+                FROM tournaments_fts
+                JOIN tournaments t ON t.id = tournaments_fts.rowid
+                WHERE tournaments_fts MATCH ? AND {' AND '.join(clauses)}
+                ORDER BY tournaments_fts.rowid DESC
+                LIMIT ?
+            )
+            {page}
+            ORDER BY rank, id
+            LIMIT ?
+        ) ranked
+        JOIN tournaments t ON t.id = ranked.id
+        ORDER BY ranked.rank, ranked.id
+    '''
+    return sql, params + [limit + 1]
+
+
+def build_tournament_query(sport=None, level=None, start_date=None, end_date=None,
+                           cursor=None, limit=DEFAULT_LIMIT, q=None, running_from=None, running_to=None):
+    """Keyset-paginated tournament listing ordered by (start_date, id)
+
+    Instead of OFFSET, the next page starts strictly after the last
+    (start_date, id) returned, so every page is an index range seek no
+    matter how deep the client pages. The composite indexes created in
+    create_database keep the filter and the ORDER BY on one index.
+    Tournaments without a start date can't be placed on the calendar and
+    are not listed. A running_from/running_to range is served from the
+    R*Tree instead; the overlapping rows are then sorted, and a cursor
+    also narrows the R*Tree search to days from the cursor's date on.
+    """
+    if q:
+        return build_search_query(q, sport, level, start_date, end_date, cursor, limit,
+                                  running_from, running_to)
+
+    after_date, after_id = decode_cursor(cursor) if cursor else (None, None)
+    clauses, params = build_filters(sport, level, start_date, end_date,
+                                    running_from, running_to, after_date)
+    if cursor:
+        clauses.append('(start_date, id) > (?, ?)')
+        params += [after_date, after_id]
+
+    # With a date range the R*Tree must drive the query: left to itself the
+    # planner may walk the whole sport/level index probing the range's ids
+    table = 'tournaments NOT INDEXED' if running_from or running_to else 'tournaments'
+    sql = f'''
+        SELECT {', '.join(TOURNAMENT_COLUMNS)}
+        FROM {table}
+        WHERE {' AND '.join(clauses)}
+        ORDER BY start_date, id
+        LIMIT ?
+    '''
+    # Fetch one extra row to know whether there is a next page
+    return sql, params + [limit + 1]
+
+
+def fetch_tournament_page(conn, limit=DEFAULT_LIMIT, **filters):
+    """Return (tournaments, next_cursor) for one page"""
+    sql, params = build_tournament_query(limit=limit, **filters)
+    rows = conn.execute(sql, params).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if filters.get('q'):
+            next_cursor = encode_cursor(last[-1], last[0])  # (rank, id)
+        else:
+            next_cursor = encode_cursor(last[TOURNAMENT_COLUMNS.index('start_date')], last[0])
+
+    return [dict(zip(TOURNAMENT_COLUMNS, row)) for row in rows], next_cursor
+
+
+def explain(conn, sql, params):
+    """EXPLAIN QUERY PLAN detail lines"""
+    return [row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def endpoint_queries():
+    """Representative (name, sql, params) for every query the API runs"""
+    cursor = encode_cursor('2025-01-01', 1)
+    search_cursor = encode_cursor(-1.5, 1)
+    queries = [
+        ('/sports', SPORTS_SQL, []),
+        ('/levels', LEVELS_SQL, []),
+        ('/levels?sport', SPORT_LEVELS_SQL, ['cricket']),
+    ]
+    filter_combinations = [
+        {},
+        {'sport': 'cricket'},
+        {'level': 'National'},
+        {'sport': 'cricket', 'level': 'National'},
+        {'sport': 'cricket', 'start_date': '2025-01-01', 'end_date': '2025-12-31'},
+        {'sport': 'cricket', 'level': 'National', 'start_date': '2025-01-01'},
+        {'level': 'National', 'start_date': '2025-01-01'},
+        {'q': 'ranji'},
+        {'q': 'mumbai t20', 'sport': 'cricket'},
+        {'q': 'ranji', 'sport': 'cricket', 'level': 'National', 'start_date': '2025-01-01'},
+        {'running_from': '2025-03-01', 'running_to': '2025-03-07'},
+        {'running_from': '2025-03-01', 'running_to': '2025-03-31', 'sport': 'cricket', 'level': 'National'},
+        {'running_from': '2025-03-01'},
+        {'q': 'ranji', 'running_from': '2025-03-01', 'running_to': '2025-03-31'},
+    ]
+    for filters in filter_combinations:
+        for page_cursor in (None, search_cursor if 'q' in filters else cursor):
+            sql, params = build_tournament_query(cursor=page_cursor, **filters)
+            name = '/tournaments?' + '&'.join(sorted(filters) + (['cursor'] if page_cursor else []))
+            queries.append((name, sql, params))
+    return queries
+
+
+def check_query_plans(conn):
+    """Raise RuntimeError if any API query scans the table or sorts in a temp B-tree
+    
+    Search and date-range queries may sort (search candidates are ranked
+    after the FTS index yields them, overlapping intervals come out of the
+    R*Tree unordered) but must be driven by the FTS index or the R*Tree.
+    """
+    problems = []
+    for name, sql, params in endpoint_queries():
+        params_used = name.partition('?')[2].split('&')
+        sorted_matches = bool({'q', 'running_from', 'running_to'} & set(params_used))
+        subqueries = set()
+        for detail in explain(conn, sql, params):
+            # Scanning a subquery's rows (the bounded search candidates) is not a table scan
+            if detail.startswith(('MATERIALIZE ', 'CO-ROUTINE ')):
+                subqueries.add(detail.split(' ', 1)[1])
+            table_scan = detail.startswith('SCAN ') and 'INDEX' not in detail and detail[5:] not in subqueries
+            if table_scan or ('TEMP B-TREE' in detail and not sorted_matches):
+                problems.append(f"{name}: {detail}")
+    if problems:
+        raise RuntimeError("API queries without a usable index:\n  " + '\n  '.join(problems))
+    return True
@@ -0,0 +1,111 @@
+"""
+Production WSGI serving for the API: gunicorn, or waitress where gunicorn is unavailable
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+import threading
+import time
+from ..utils.metrics import metrics
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # not installed, or Windows
+    BaseApplication = None
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
+
+# Seconds between writes of a worker's metrics for the other workers' /metrics
+METRICS_WRITE_INTERVAL = 1.0
+
+
+def default_processes():
+    """One worker process per CPU: requests are CPU-bound SQLite reads and JSON rendering"""
+    return os.cpu_count() or 1
+
+
+def metrics_directory():
+    """Directory the workers share their metrics through (METRICS_DIR, or a new temp dir)
+
+    Files left by an earlier server are removed, so counters start at zero.
+    """
+    directory = os.getenv('METRICS_DIR')
+    if not directory:
+        return tempfile.mkdtemp(prefix='tournament-api-metrics-')
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+    return directory
+
+
+def share_metrics(directory, interval=METRICS_WRITE_INTERVAL):
+    """Write this process's metrics to directory every interval seconds, when they changed"""
+    def run():
+        written = None
+        while True:
+            time.sleep(interval)
+            state = metrics.state()
+            if state != written:
+                metrics.write_state(directory)
+                written = state
+
+    threading.Thread(target=run, name='metrics-writer', daemon=True).start()
+
+
+def _serve_gunicorn(app, bind, processes, threads):
+    directory = app.config['METRICS_DIR'] = metrics_directory()
+
+    def post_fork(server, worker):
+        metrics.reset()  # nothing the master counted before forking is this worker's
+        if metrics.enabled:
+            share_metrics(directory)
+
+    def worker_exit(server, worker):
+        if metrics.enabled:
+            metrics.write_state(directory)
+
+    def on_exit(server):
+        if not os.getenv('METRICS_DIR'):
+            shutil.rmtree(directory, ignore_errors=True)
+
+    class APIServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', processes)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('keepalive', 5)
+            self.cfg.set('post_fork', post_fork)
+            self.cfg.set('worker_exit', worker_exit)
+            self.cfg.set('on_exit', on_exit)
+
+        def load(self):
+            return app
+
+    APIServer().run()
+
+
+def serve_production(app, host='0.0.0.0', port=5000, processes=None, threads=8):
+    """Serve app with a multi-worker WSGI server until interrupted
+
+    gunicorn runs processes workers with threads threads each; waitress
+    (e.g. on Windows) runs a single process with processes * threads
+    threads. Every process keeps its own pool of read-only connections and
+    its own metrics; gunicorn workers share theirs through a directory
+    (METRICS_DIR) so /metrics covers the whole server.
+    """
+    processes = processes or default_processes()
+    if BaseApplication is not None:
+        print(f"🚀 gunicorn on {host}:{port}: {processes} workers x {threads} threads")
+        _serve_gunicorn(app, f"{host}:{port}", processes, threads)
+    elif waitress is not None:
+        print(f"🚀 waitress on {host}:{port}: {processes * threads} threads")
+        waitress.serve(app, host=host, port=port, threads=processes * threads)
+    else:
+        raise RuntimeError("Production mode needs gunicorn or waitress: pip install gunicorn")
@@ -0,0 +1,201 @@
+import csv
+import json
+import os
+from datetime import datetime
+from .initDB import DB_PATH, get_connection, overlap_filter
+
+EXPORT_COLUMNS = [
+    'id', 'name', 'sport', 'level', 'start_date', 'end_date', 'official_url',
+    'streaming_links', 'image_url', 'summary', 'location', 'sources',
+    'created_at', 'updated_at',
+]
+FORMATS = {'csv': 'csv', 'ndjson': 'ndjson', 'parquet': 'parquet', 'arrow': 'arrow'}
+STATE_FILE = 'output/.export_state.json'
+BATCH_SIZE = 5000
+
+
+def iter_batches(conn, sport=None, level=None, date_from=None, date_to=None,
+                 since=None, batch_size=BATCH_SIZE, running_from=None, running_to=None):
+    """Stream matching tournament rows from SQLite in fetchmany batches
+
+    date_from/date_to bound the start date; running_from/running_to select
+    tournaments running at any time in that range (via the R*Tree); since
+    selects rows changed at or after that updated_at timestamp. Only one
+    batch is held in memory.
+    """
+    clauses, params = [], []
+    if sport:
+        clauses.append('sport = ?')
+        params.append(sport)
+    if level:
+        clauses.append('level = ?')
+        params.append(level)
+    if date_from:
+        clauses.append('start_date >= ?')
+        params.append(date_from)
+    if date_to:
+        clauses.append('start_date <= ?')
+        params.append(date_to)
+    if running_from or running_to:
+        clause, overlap_params = overlap_filter(running_from, running_to)
+        clauses.append(clause)
+        params += overlap_params
+    if since:
+        clauses.append('updated_at >= ?')
+        params.append(since)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    order = 'updated_at, id' if since else 'id'
+    cursor = conn.execute(
+        f"SELECT {', '.join(EXPORT_COLUMNS)} FROM tournaments {where} ORDER BY {order}", params
+    )
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+
+
+def write_csv(path, batches):
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in batches:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def write_ndjson(path, batches):
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for rows in batches:
+            f.writelines(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n' for row in rows
+            )
+            count += len(rows)
+    return count
+
+
+def _arrow_schema(pa):
+    return pa.schema([('id', pa.int64())] + [(column, pa.string()) for column in EXPORT_COLUMNS[1:]])
+
+
+def _record_batch(pa, schema, rows):
+    columns = list(zip(*rows))
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+    )
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow export needs pyarrow: pip install pyarrow")
+
+
+def write_parquet(path, batches):
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    count = 0
+    # One row group per batch keeps memory bounded by BATCH_SIZE
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(pa, schema, rows))
+            count += len(rows)
+    return count
+
+
+def write_arrow(path, batches):
+    pa = _require_pyarrow()
+    import pyarrow.ipc as ipc
+
+    schema = _arrow_schema(pa)
+    count = 0
+    with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, schema) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(pa, schema, rows))
+            count += len(rows)
+    return count
+
+
+WRITERS = {'csv': write_csv, 'ndjson': write_ndjson, 'parquet': write_parquet, 'arrow': write_arrow}
+
+
+def _state_key(fmt, sport, level, date_from, date_to, running_from=None, running_to=None):
+    parts = [fmt, sport, level, date_from, date_to]
+    if running_from or running_to:
+        # Keys of exports without a running range stay as they were
+        parts += [running_from, running_to]
+    return '|'.join(str(part or '') for part in parts)
+
+
+def _load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def default_path(fmt, sport=None, level=None, incremental=False):
+    parts = ['tournaments'] + [p.lower().replace(' ', '_') for p in (sport, level) if p]
+    if incremental:
+        parts.append(datetime.now().strftime('changes_%Y%m%d_%H%M%S'))
+    return os.path.join('output', '_'.join(parts) + '.' + FORMATS[fmt])
+
+
+def export_tournaments(fmt='csv', path=None, sport=None, level=None, date_from=None,
+                       date_to=None, incremental=False, db_path=DB_PATH, batch_size=BATCH_SIZE,
+                       running_from=None, running_to=None):
+    """Stream the tournaments table to CSV, NDJSON, Parquet or Arrow
+
+    With incremental=True only rows changed since the previous incremental
+    export with the same format and filters are written (rows on the
+    high-water-mark second may repeat; dedupe on id downstream).
+    Returns (path, row_count).
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}' (choose from {', '.join(WRITERS)})")
+
+    path = path or default_path(fmt, sport, level, incremental)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    state = _load_state() if incremental else {}
+    key = _state_key(fmt, sport, level, date_from, date_to, running_from, running_to)
+    since = state.get(key)
+    high_water = {'updated_at': since}
+
+    def tracked(batches):
+        # Remember the newest updated_at actually exported
+        updated_index = EXPORT_COLUMNS.index('updated_at')
+        for rows in batches:
+            newest = max((row[updated_index] or '') for row in rows)
+            if newest > (high_water['updated_at'] or ''):
+                high_water['updated_at'] = newest
+            yield rows
+
+    conn = get_connection(db_path)
+    try:
+        batches = iter_batches(conn, sport, level, date_from, date_to, since, batch_size,
+                               running_from, running_to)
+        count = WRITERS[fmt](path, tracked(batches))
+    finally:
+        conn.close()
+
+    if incremental and high_water['updated_at']:
+        state[key] = high_water['updated_at']
+        _save_state(state)
+
+    return path, count
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from .initDB import DB_PATH, get_connection
+
+FEED_DIR = 'output/ics'
+MANIFEST = 'manifest.json'
+
+FEED_COLUMNS = ['id', 'name', 'sport', 'level', 'start_date', 'end_date', 'official_url',
+                'streaming_links', 'summary', 'location', 'updated_at']
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', (text or '').lower()).strip('-')
+
+
+def feed_partitions(groups):
+    """Map feed name -> (title, filters, fingerprint) from (sport, level) group stats
+
+    Every sport, every level and every sport+level combination gets a feed.
+    A feed's fingerprint only changes when one of its groups changes, so
+    unchanged feeds are not re-rendered.
+    """
+    members = {}
+    for sport, level, *stats in groups:
+        for name, title, filters in (
+            (slugify(sport), f"{sport.title()} tournaments", {'sport': sport}),
+            (f"level-{slugify(level)}", f"{level} tournaments", {'level': level}),
+            (f"{slugify(sport)}-{slugify(level)}", f"{level} {sport} tournaments",
+             {'sport': sport, 'level': level}),
+        ):
+            members.setdefault(name, (title, filters, []))[2].append((sport, level, *stats))
+
+    partitions = {}
+    for name, (title, filters, group_stats) in members.items():
+        fingerprint = hashlib.sha1(json.dumps(sorted(group_stats)).encode('utf-8')).hexdigest()
+        partitions[name] = (title, filters, fingerprint)
+    return partitions
+
+
+def escape_text(value):
+    """Escape a TEXT value per RFC 5545"""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold(line):
+    """Fold content lines longer than 75 octets"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts, current = [], b''
+    for char in line:
+        char_bytes = char.encode('utf-8')
+        if len(current) + len(char_bytes) > (75 if not parts else 74):
+            parts.append(current.decode('utf-8'))
+            current = b''
+        current += char_bytes
+    parts.append(current.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _ics_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _ics_stamp(updated_at):
+    """DTSTAMP from the row's updated_at (SQLite CURRENT_TIMESTAMP is UTC)"""
+    try:
+        return datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S').strftime('%Y%m%dT%H%M%SZ')
+    except (TypeError, ValueError):
+        return datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_event(row):
+    t = dict(zip(FEED_COLUMNS, row))
+    start = _ics_date(t['start_date'])
+    try:
+        end = _ics_date(t['end_date']) if t['end_date'] else start
+    except ValueError:
+        end = start
+    # DTEND is exclusive for all-day events
+    end = max(end, start) + timedelta(days=1)
+
+    description = t['summary'] or ''
+    if t['streaming_links']:
+        description = f"{description}\nWatch: {t['streaming_links']}".strip()
+
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:tournament-{t['id']}@sports-calendar",
+        f"DTSTAMP:{_ics_stamp(t['updated_at'])}",
+        f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{end.strftime('%Y%m%d')}",
+        f"SUMMARY:{escape_text(t['name'])}",
+        f"CATEGORIES:{escape_text(t['sport'])},{escape_text(t['level'])}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if t['location']:
+        lines.append(f"LOCATION:{escape_text(t['location'])}")
+    if t['official_url']:
+        lines.append(f"URL:{t['official_url']}")
+    lines.append('END:VEVENT')
+    return lines
+
+
+def render_feed(conn, title, filters):
+    """Render one VCALENDAR for tournaments matching filters"""
+    clauses = ['start_date IS NOT NULL'] + [f"{column} = ?" for column in filters]
+    rows = conn.execute(f'''
+        SELECT {', '.join(FEED_COLUMNS)} FROM tournaments
+        WHERE {' AND '.join(clauses)}
+        ORDER BY start_date, id
+    ''', list(filters.values()))
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Sports Tournament Calendar//EN',
+        'CALSCALE:GREGORIAN',
+        f"X-WR-CALNAME:{escape_text(title)}",
+    ]
+    for row in rows:
+        try:
+            lines += render_event(row)
+        except ValueError:
+            continue  # unparseable start date
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+
+def load_manifest(feed_dir=FEED_DIR):
+    try:
+        with open(os.path.join(feed_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def refresh_feeds(db_path=DB_PATH, feed_dir=FEED_DIR, force=False):
+    """Re-render only the .ics feeds whose tournaments changed
+
+    Returns the names of the feeds that were (re)generated.
+    """
+    os.makedirs(feed_dir, exist_ok=True)
+    conn = get_connection(db_path)
+    try:
+        groups = conn.execute('''
+            SELECT sport, level, COUNT(*), MAX(updated_at), SUM(id)
+            FROM tournaments
+            WHERE start_date IS NOT NULL
+            GROUP BY sport, level
+        ''').fetchall()
+        partitions = feed_partitions(groups)
+        manifest = load_manifest(feed_dir)
+
+        regenerated = []
+        for name, (title, filters, fingerprint) in partitions.items():
+            path = os.path.join(feed_dir, f"{name}.ics")
+            if not force and manifest.get(name, {}).get('fingerprint') == fingerprint and os.path.exists(path):
+                continue
+            body = render_feed(conn, title, filters)
+            _write_atomic(path, body)
+            manifest[name] = {'fingerprint': fingerprint, 'etag': hashlib.sha1(body).hexdigest()}
+            regenerated.append(name)
+    finally:
+        conn.close()
+
+    # Drop feeds whose tournaments are gone
+    for name in set(manifest) - set(partitions):
+        try:
+            os.remove(os.path.join(feed_dir, f"{name}.ics"))
+        except OSError:
+            pass
+        del manifest[name]
+
+    _write_atomic(os.path.join(feed_dir, MANIFEST), json.dumps(manifest, indent=2).encode('utf-8'))
+    return regenerated
+
+
+class FeedCache:
+    """In-memory copy of the rendered feeds, reloaded when a file changes
+
+    Serving a feed costs one os.stat() plus a dict lookup; the body and its
+    ETag are only re-read after refresh_feeds() replaces the file.
+    """
+
+    def __init__(self, feed_dir=FEED_DIR):
+        self.feed_dir = feed_dir
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def names(self):
+        return sorted(load_manifest(self.feed_dir))
+
+    def get(self, name):
+        """Return (body, etag) for a feed, or None if it doesn't exist"""
+        if slugify(name) != name:
+            return None
+        path = os.path.join(self.feed_dir, f"{name}.ics")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._feeds.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        etag = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            self._feeds[name] = (mtime, body, etag)
+        return body, etag
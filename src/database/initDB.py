@@ -1,16 +1,61 @@
 import sqlite3
 import os
+from datetime import date
+from urllib.request import pathname2url
+from ..utils.tournament_utils import normalize_name, NAME_KEY_VERSION
 
-def create_database():
+DB_PATH = os.getenv('TOURNAMENTS_DB', 'data/tournaments.db')
+
+# Unique key of a tournament row; NULL start dates must collide too (NULLs
+# are distinct in a plain unique index), so the index is on an expression
+NATURAL_KEY = "sport, name_key, COALESCE(start_date, '')"
+
+# Columns that count towards how complete a tournament row is
+DATA_FIELDS = ['name', 'level', 'start_date', 'end_date', 'official_url',
+               'streaming_links', 'image_url', 'summary', 'location']
+
+def filled_fields_sql(table):
+    """SQL expression counting the non-empty DATA_FIELDS of a row"""
+    return ' + '.join(f"(COALESCE({table}.{field}, '') != '')" for field in DATA_FIELDS)
+
+def get_connection(db_path=DB_PATH, **kwargs):
+    """Open a connection with the pragmas every writer/reader should use"""
+    conn = sqlite3.connect(db_path, **kwargs)
+    # WAL is persistent (set in create_database); these are per-connection
+    conn.execute('PRAGMA synchronous = NORMAL')   # fsync on checkpoint, not every commit
+    conn.execute('PRAGMA cache_size = -20000')    # ~20 MB page cache
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA busy_timeout = 5000')
+    return conn
+
+def get_readonly_connection(db_path=DB_PATH):
+    """Open a read-only connection for the API (usable from any thread)
+    
+    mode=ro fails instead of creating a missing database; query_only also
+    rejects writes through ATTACH or pragmas. In WAL mode readers never
+    block the scraper writing to the same file.
+    """
+    uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute('PRAGMA query_only = ON')
+    conn.execute('PRAGMA cache_size = -20000')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA busy_timeout = 5000')
+    return conn
+
+def create_database(db_path=DB_PATH):
     """Create the tournaments database and table"""
     
     # Ensure data directory exists
-    os.makedirs('data', exist_ok=True)
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
     
     # Connect to database
-    conn = sqlite3.connect('data/tournaments.db')
+    conn = get_connection(db_path)
     cursor = conn.cursor()
     
+    # Write-ahead logging: readers don't block the writer, commits are cheap
+    cursor.execute('PRAGMA journal_mode = WAL')
+    
     # Create tournaments table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tournaments (
@@ -25,18 +70,257 @@ def create_database():
             image_url TEXT,
             summary TEXT,
             location TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            name_key TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sources TEXT
+        )
+    ''')
+    
+    # Key/value metadata; data_version is bumped by every write that changes rows
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
         )
     ''')
+    cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+    
+    # Conditional-fetch state per source URL
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS page_meta (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            last_checked REAL,
+            last_changed REAL
+        )
+    ''')
+    
+    # Adaptive re-scrape schedule per source URL (run.py schedule)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS source_state (
+            url TEXT PRIMARY KEY,
+            sport TEXT NOT NULL,
+            interval REAL NOT NULL,
+            next_due REAL NOT NULL,
+            last_checked REAL,
+            last_changed REAL,
+            change_rate REAL NOT NULL,
+            llm_tokens REAL NOT NULL,
+            error_streak INTEGER NOT NULL DEFAULT 0,
+            checks INTEGER NOT NULL DEFAULT 0,
+            changes INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    
+    migrate_database(conn)
+    create_search_index(conn)
+    create_interval_index(conn)
     
     # Create indexes for faster queries
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_sport ON tournaments(sport)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_level ON tournaments(level)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_start_date ON tournaments(start_date)')
+    # Candidate lookup for cross-source deduplication
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sport_start ON tournaments(sport, start_date)')
+    
+    # Composite indexes matching the API filter combinations; rowid is the
+    # implicit last column, so each one also serves ORDER BY start_date, id
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sport_level_start ON tournaments(sport, level, start_date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_level_start ON tournaments(level, start_date)')
+    # Incremental exports ("changed since")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_updated_at ON tournaments(updated_at)')
     
     conn.commit()
     conn.close()
     print("Database created successfully!")
 
+# Relevance of a search match: a name hit counts 10x, a location hit 5x a summary hit
+SEARCH_RANK = 'bm25(10.0, 1.0, 5.0)'
+# Prefix lengths indexed for "Ranji*" style queries (every search word is a prefix)
+SEARCH_PREFIXES = '2 3 4 5 6'
+
+def create_search_index(conn):
+    """FTS5 index over name, summary and location, kept in sync by triggers
+    
+    External-content table: the text lives only in tournaments, the index
+    stores the tokens. Prefix indexes (2-6 chars) make "Ranji*" style
+    queries index lookups instead of merging every matching term. Built
+    from the existing rows when first created, and rebuilt when an older
+    index has other prefix lengths.
+    """
+    existing = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tournaments_fts'"
+    ).fetchone()
+    if existing and f"prefix='{SEARCH_PREFIXES}'" not in existing[0]:
+        conn.execute('DROP TABLE tournaments_fts')
+        existing = None
+    conn.executescript(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tournaments_fts USING fts5(
+            name, summary, location,
+            content='tournaments', content_rowid='id',
+            prefix='{SEARCH_PREFIXES}', tokenize='unicode61 remove_diacritics 2'
+        );
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_fts_insert AFTER INSERT ON tournaments BEGIN
+            INSERT INTO tournaments_fts (rowid, name, summary, location)
+            VALUES (new.id, new.name, new.summary, new.location);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_fts_delete AFTER DELETE ON tournaments BEGIN
+            INSERT INTO tournaments_fts (tournaments_fts, rowid, name, summary, location)
+            VALUES ('delete', old.id, old.name, old.summary, old.location);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_fts_update AFTER UPDATE OF name, summary, location ON tournaments BEGIN
+            INSERT INTO tournaments_fts (tournaments_fts, rowid, name, summary, location)
+            VALUES ('delete', old.id, old.name, old.summary, old.location);
+            INSERT INTO tournaments_fts (rowid, name, summary, location)
+            VALUES (new.id, new.name, new.summary, new.location);
+        END;
+    ''')
+    # Stored in the index config: the rank column is bm25 with these weights
+    conn.execute("INSERT INTO tournaments_fts (tournaments_fts, rank) VALUES ('rank', ?)", (SEARCH_RANK,))
+    if not existing:
+        conn.execute("INSERT INTO tournaments_fts (tournaments_fts) VALUES ('rebuild')")
+    conn.commit()
+
+# Whole day number of an ISO date, as SQLite's CAST(julianday(d) AS INTEGER)
+DAY_SQL = 'CAST(julianday({}) AS INTEGER)'
+JULIAN_DAY_OFFSET = 1721424
+
+def day_number(value):
+    """Day number of a YYYY-MM-DD date, matching DAY_SQL (ValueError if invalid)"""
+    return date.fromisoformat(str(value)[:10]).toordinal() + JULIAN_DAY_OFFSET
+
+def create_interval_index(conn):
+    """R*Tree over each tournament's (first day, last day), kept in sync by triggers
+    
+    "What's on between X and Y" is an interval overlap (start <= Y and
+    end >= X), which no B-tree index answers without scanning every
+    tournament that started before Y. The R*Tree finds the overlapping
+    ones directly. Rows without a valid start date are left out; a
+    missing or invalid end date counts as a one-day event.
+    """
+    first_day = DAY_SQL.format('new.start_date')
+    last_day = f"MAX({first_day}, COALESCE({DAY_SQL.format('new.end_date')}, {first_day}))"
+    index_row = f'''
+            INSERT INTO tournaments_days (id, first_day, last_day)
+            SELECT new.id, {first_day}, {last_day} WHERE {first_day} IS NOT NULL;'''
+    
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tournaments_days'"
+    ).fetchone()
+    conn.executescript(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tournaments_days USING rtree_i32(id, first_day, last_day);
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_days_insert AFTER INSERT ON tournaments BEGIN{index_row}
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_days_delete AFTER DELETE ON tournaments BEGIN
+            DELETE FROM tournaments_days WHERE id = old.id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS tournaments_days_update AFTER UPDATE OF start_date, end_date ON tournaments BEGIN
+            DELETE FROM tournaments_days WHERE id = old.id;{index_row}
+        END;
+    ''')
+    if not exists:
+        conn.execute(f'''
+            INSERT INTO tournaments_days (id, first_day, last_day)
+            SELECT id, first_day, last_day FROM (
+                SELECT id, {DAY_SQL.format('start_date')} AS first_day,
+                       MAX({DAY_SQL.format('start_date')},
+                           COALESCE({DAY_SQL.format('end_date')}, {DAY_SQL.format('start_date')})) AS last_day
+                FROM tournaments
+            ) WHERE first_day IS NOT NULL
+        ''')
+    conn.commit()
+
+def overlap_filter(running_from=None, running_to=None, first_date=None):
+    """(clause, params) selecting tournaments running at any time in [running_from, running_to]
+    
+    Either bound may be omitted. first_date additionally skips tournaments
+    starting before it (keyset pages). Dates must be YYYY-MM-DD.
+    """
+    bounds, params = [], []
+    if running_from:
+        bounds.append('last_day >= ?')
+        params.append(day_number(running_from))
+    if running_to:
+        bounds.append('first_day <= ?')
+        params.append(day_number(running_to))
+    if first_date:
+        bounds.append('first_day >= ?')
+        params.append(day_number(first_date))
+    return f"id IN (SELECT id FROM tournaments_days WHERE {' AND '.join(bounds)})", params
+
+def get_data_version(conn):
+    """Counter that changes whenever tournament data changes"""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+    return row[0] if row else 0
+
+def bump_data_version(conn):
+    """Mark tournament data as changed (call inside the writing transaction)"""
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+def migrate_database(conn):
+    """Bring an existing tournaments table up to the natural-key schema
+    
+    Adds name_key/updated_at/sources if missing, backfills name_key (all of
+    them when NAME_KEY_VERSION changed), removes duplicate (sport, name_key,
+    start_date) rows keeping the one with the most fields filled in (newest
+    on ties) and creates the unique index on NATURAL_KEY. Safe to run
+    repeatedly.
+    """
+    cursor = conn.cursor()
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(tournaments)')}
+    
+    if 'name_key' not in columns:
+        cursor.execute('ALTER TABLE tournaments ADD COLUMN name_key TEXT')
+    if 'updated_at' not in columns:
+        # ALTER TABLE can't add a CURRENT_TIMESTAMP default; backfill instead
+        cursor.execute('ALTER TABLE tournaments ADD COLUMN updated_at TIMESTAMP')
+        cursor.execute('UPDATE tournaments SET updated_at = created_at WHERE updated_at IS NULL')
+    if 'sources' not in columns:
+        cursor.execute('ALTER TABLE tournaments ADD COLUMN sources TEXT')  # JSON list of source URLs
+    
+    conn.create_function('normalize_name', 1, normalize_name, deterministic=True)
+    row = cursor.execute("SELECT value FROM meta WHERE key = 'name_key_version'").fetchone()
+    if row is None or row[0] < NAME_KEY_VERSION:
+        # Keys made by an older normalize_name: recompute them all. Rows may
+        # now collide, so the unique index is rebuilt after the dedup below
+        cursor.execute('DROP INDEX IF EXISTS idx_natural_key')
+        cursor.execute('UPDATE tournaments SET name_key = normalize_name(name)')
+        cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('name_key_version', ?)",
+                       (NAME_KEY_VERSION,))
+    else:
+        cursor.execute('UPDATE tournaments SET name_key = normalize_name(name) WHERE name_key IS NULL')
+    
+    removed = cursor.execute(f'''
+        DELETE FROM tournaments WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY sport, name_key, start_date
+                    ORDER BY {filled_fields_sql('tournaments')} DESC, id DESC
+                ) AS rank
+                FROM tournaments
+            ) WHERE rank > 1
+        )
+    ''').rowcount
+    if removed:
+        print(f"Removed {removed} duplicate tournaments")
+    
+    # Older databases have the key on the bare (nullable) start_date
+    existing = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_natural_key'"
+    ).fetchone()
+    if existing and 'COALESCE' not in existing[0]:
+        cursor.execute('DROP INDEX idx_natural_key')
+    cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS idx_natural_key ON tournaments({NATURAL_KEY})')
+    conn.commit()
+
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    create_database()
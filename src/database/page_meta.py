@@ -0,0 +1,48 @@
+import threading
+import time
+from .initDB import DB_PATH, get_connection
+
+
+class PageMetaStore:
+    """Per-URL HTTP validators and content hash from the last processed fetch
+
+    Lets the scraper send If-None-Match / If-Modified-Since and skip pages
+    whose cleaned content hash hasn't changed. Only written once a page has
+    gone through the whole pipeline, so a failed run is retried next time.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.conn = get_connection(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT etag, last_modified, content_hash FROM page_meta WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'content_hash': row[2]}
+
+    def touch(self, url):
+        """Record that url was checked (e.g. answered 304)"""
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE page_meta SET last_checked = ? WHERE url = ?', (time.time(), url))
+
+    def save(self, url, etag=None, last_modified=None, content_hash=None, changed=True):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute('''
+                INSERT INTO page_meta (url, etag, last_modified, content_hash, last_checked, last_changed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    last_checked = excluded.last_checked,
+                    last_changed = CASE WHEN ? THEN excluded.last_changed ELSE page_meta.last_changed END
+            ''', (url, etag, last_modified, content_hash, now, now, int(changed)))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
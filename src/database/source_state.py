@@ -0,0 +1,38 @@
+import threading
+from .initDB import DB_PATH, get_connection
+
+STATE_FIELDS = ('url', 'sport', 'interval', 'next_due', 'last_checked', 'last_changed',
+                'change_rate', 'llm_tokens', 'error_streak', 'checks', 'changes')
+
+
+class SourceStateStore:
+    """Per-source scheduling state for the re-scrape scheduler
+
+    One row per source URL: the current revisit interval and when it is
+    next due, how often a check found changed content (change_rate), the
+    LLM tokens a changed page costs, and the current error streak.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.conn = get_connection(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def load(self):
+        """url -> state dict for every known source"""
+        with self._lock:
+            rows = self.conn.execute(f"SELECT {', '.join(STATE_FIELDS)} FROM source_state").fetchall()
+        return {row[0]: dict(zip(STATE_FIELDS, row)) for row in rows}
+
+    def save(self, states):
+        """Upsert a batch of state dicts in one transaction"""
+        placeholders = ', '.join('?' for _ in STATE_FIELDS)
+        updates = ', '.join(f'{field} = excluded.{field}' for field in STATE_FIELDS[1:])
+        with self._lock, self.conn:
+            self.conn.executemany(f'''
+                INSERT INTO source_state ({', '.join(STATE_FIELDS)}) VALUES ({placeholders})
+                ON CONFLICT(url) DO UPDATE SET {updates}
+            ''', [tuple(state[field] for field in STATE_FIELDS) for state in states])
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
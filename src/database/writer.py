@@ -0,0 +1,96 @@
+import json
+import threading
+from .initDB import DB_PATH, DATA_FIELDS, NATURAL_KEY, get_connection, filled_fields_sql, bump_data_version
+from ..utils.tournament_utils import normalize_name
+from ..utils.metrics import metrics
+
+# Idempotent save: a tournament already stored under the same natural key
+# (sport, normalized name, start date) only takes the new record's fields
+# when it is at least as complete and actually differs. Sources are always
+# merged: the stored list, then any new URLs, in order
+MORE_COMPLETE = f"({filled_fields_sql('excluded')}) >= ({filled_fields_sql('tournaments')})"
+NEW_SOURCES = """EXISTS (
+        SELECT 1 FROM json_each(excluded.sources)
+        WHERE value NOT IN (SELECT value FROM json_each(COALESCE(tournaments.sources, '[]'))))"""
+MERGED_SOURCES = """CASE WHEN tournaments.sources IS NULL THEN excluded.sources ELSE (
+        SELECT json_group_array(value) FROM (
+            SELECT value, 0 AS part, key FROM json_each(tournaments.sources)
+            UNION ALL
+            SELECT value, 1, key FROM json_each(COALESCE(excluded.sources, '[]'))
+            WHERE value NOT IN (SELECT value FROM json_each(tournaments.sources))
+            ORDER BY part, key)) END"""
+UPSERT_SQL = f'''
+    INSERT INTO tournaments
+    (name, sport, level, start_date, end_date, official_url,
+     streaming_links, image_url, summary, location, name_key, sources, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT({NATURAL_KEY}) DO UPDATE SET
+        {', '.join(f'{field} = CASE WHEN {MORE_COMPLETE} THEN excluded.{field} ELSE tournaments.{field} END'
+                   for field in DATA_FIELDS)},
+        sources = {MERGED_SOURCES},
+        updated_at = CURRENT_TIMESTAMP
+    WHERE ({MORE_COMPLETE}
+           AND ({' OR '.join(f'excluded.{field} IS NOT tournaments.{field}' for field in DATA_FIELDS)}))
+       OR {NEW_SOURCES}
+'''
+
+
+class TournamentWriter:
+    """Batched tournament writer holding one connection for a whole scrape
+
+    Each write() call upserts its batch with executemany inside a single
+    transaction, so a source's tournaments cost one commit instead of one
+    connection + commit per row. Safe to share between threads.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.conn = get_connection(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.rows_changed = 0  # rows inserted or updated so far
+
+    @staticmethod
+    def to_row(sport, tournament):
+        return (
+            tournament.get('name'),
+            sport,
+            tournament.get('level'),
+            tournament.get('start_date'),
+            tournament.get('end_date'),
+            tournament.get('official_url'),
+            tournament.get('streaming_links'),
+            tournament.get('image_url'),
+            tournament.get('summary'),
+            tournament.get('location'),
+            # Deduplicated records carry the canonical key of the row they merged into
+            tournament.get('name_key') or normalize_name(tournament.get('name')),
+            json.dumps(tournament['sources']) if tournament.get('sources') else None,
+        )
+
+    def write(self, sport, tournaments):
+        """Upsert a batch of tournaments in one transaction, return the row count"""
+        rows = [self.to_row(sport, t) for t in tournaments]
+        if not rows:
+            return 0
+
+        with self._lock, metrics.timer('db_write_seconds'):
+            with self.conn:  # commits, or rolls back the whole batch on error
+                # rowcount, not total_changes: that also counts the search/interval index triggers
+                changed = self.conn.executemany(UPSERT_SQL, rows).rowcount
+                if changed:
+                    # Invalidates API response caches in the same commit
+                    bump_data_version(self.conn)
+            self.rows_changed += changed
+        metrics.inc('db_rows_written_total', len(rows))
+        metrics.inc('db_rows_changed_total', changed)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
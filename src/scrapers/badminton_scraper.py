@@ -0,0 +1,13 @@
+from .source_scraper import SourceScraper
+from .registry import register
+
+@register
+class BadmintonScraper(SourceScraper):
+    sport = "badminton"
+    
+    # ALL badminton sources in one list - let LLM decide the level!
+    sources = [
+        'https://bwfbadminton.com/calendar/',
+        'https://www.badmintonindia.org/tournaments/',
+        'https://bwfworldtour.bwfbadminton.com/calendar/',
+    ]
@@ -1,56 +1,255 @@
 import requests
-from bs4 import BeautifulSoup
-import sqlite3
-import json
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
 from abc import ABC, abstractmethod
+from ..utils.structured_extractor import StructuredExtractor
+from ..utils.html_cleaner import parse_html, clean_document
+from ..utils.deduplicator import TournamentDeduplicator
+from ..database.initDB import DB_PATH, get_connection
+from ..database.writer import TournamentWriter
+from ..database.page_meta import PageMetaStore
+from ..utils.metrics import metrics, SIZE_BUCKETS
+
+# Returned by get_page for a conditional fetch answered with 304
+NOT_MODIFIED = object()
 
 class BaseScraper(ABC):
     """Base class for all sport scrapers"""
     
-    def __init__(self, sport_name):
+    # Concurrent fetch settings
+    max_workers = 16          # total pages in flight
+    per_host_limit = 2        # pages in flight against a single host
+    request_timeout = (5, 20)  # (connect, read) seconds
+    max_retries = 3
+    backoff_factor = 0.5      # 0.5s, 1s, 2s between retries
+    conditional_fetch = True  # send stored ETag/Last-Modified, skip unchanged pages
+    
+    def __init__(self, sport_name, writer=None):
         self.sport_name = sport_name
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        # One pooled adapter shared by every fetch, retrying transient errors
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._host_locks = defaultdict(lambda: threading.BoundedSemaphore(self.per_host_limit))
+        self._host_locks_guard = threading.Lock()
+        
+        # Deterministic extraction for pages carrying JSON-LD / microdata / tables;
+        # subclasses set self.llm for the fallback path
+        self.structured = StructuredExtractor()
+        self.llm = None
+        self.extraction_paths = {'structured': 0, 'llm': 0}
+        
+        # One batched DB writer per scrape, opened on first save; a writer
+        # passed in is shared with other scrapers and closed by its owner
+        self._writer = writer
+        self.owns_writer = writer is None
+        self._deduplicator = None
+        
+        # Change detection: validators/hash of the current fetch, saved once processed
+        self._page_meta = None
+        self._pending_meta = {}
+        self._stats_lock = threading.Lock()
+        self.page_stats = {'not_modified': 0, 'unchanged': 0, 'changed': 0}
+    
+    def _host_slot(self, url):
+        """Semaphore limiting concurrent requests to the host of url"""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            return self._host_locks[host]
     
-    def get_page(self, url):
-        """Get webpage content"""
+    @property
+    def page_meta(self):
+        if self._page_meta is None:
+            self._page_meta = PageMetaStore()
+        return self._page_meta
+    
+    def _count(self, stat, stats=None):
+        with self._stats_lock:
+            (self.page_stats if stats is None else stats)[stat] += 1
+    
+    def get_page(self, url, conditional=False):
+        """Get webpage content as a parsed lxml document
+        
+        With conditional=True the stored ETag/Last-Modified are sent and
+        NOT_MODIFIED is returned when the server answers 304.
+        """
+        headers = {}
+        if conditional:
+            meta = self.page_meta.get(url)
+            if meta and meta['etag']:
+                headers['If-None-Match'] = meta['etag']
+            if meta and meta['last_modified']:
+                headers['If-Modified-Since'] = meta['last_modified']
+        
         try:
-            response = self.session.get(url)
+            with self._host_slot(url):
+                with metrics.timer('scraper_fetch_seconds', url=url):
+                    response = self.session.get(url, headers=headers, timeout=self.request_timeout)
+            if conditional and response.status_code == 304:
+                self.page_meta.touch(url)
+                self._count('not_modified')
+                metrics.inc('scraper_fetch_total', outcome='not_modified')
+                return NOT_MODIFIED
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            metrics.inc('scraper_fetch_total', outcome='ok')
+            metrics.observe('scraper_fetch_bytes', len(response.content), buckets=SIZE_BUCKETS, url=url)
+            self._pending_meta[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            return parse_html(response.content)
         except Exception as e:
+            metrics.inc('scraper_fetch_total', outcome='error')
             print(f"Error fetching {url}: {e}")
             return None
     
+    def clean_page(self, doc):
+        """Compact text of a parsed page - computed once, used for hashing and the LLM"""
+        with metrics.timer('scraper_clean_seconds'):
+            return clean_document(doc)
+    
+    def page_fingerprint(self, cleaned):
+        """Hash of the cleaned page content, ignoring scripts/styles/navigation/whitespace"""
+        return hashlib.sha256(cleaned.encode('utf-8')).hexdigest()
+    
+    def is_page_unchanged(self, url, cleaned):
+        """True if the page's cleaned content matches the last processed fetch"""
+        fingerprint = self.page_fingerprint(cleaned)
+        self._pending_meta.setdefault(url, {})['content_hash'] = fingerprint
+        if not self.conditional_fetch:
+            return False
+        
+        stored = self.page_meta.get(url)
+        if stored and stored['content_hash'] == fingerprint:
+            self._count('unchanged')
+            return True
+        return False
+    
+    def mark_page_processed(self, url, changed=True):
+        """Persist this fetch's validators/hash once the page went through the pipeline"""
+        pending = self._pending_meta.pop(url, {})
+        self.page_meta.save(
+            url,
+            etag=pending.get('etag'),
+            last_modified=pending.get('last_modified'),
+            content_hash=pending.get('content_hash'),
+            changed=changed,
+        )
+        if changed:
+            self._count('changed')
+    
+    def show_page_stats(self):
+        """Report how many sources were skipped by change detection"""
+        stats = self.page_stats
+        print(f"🔁 Change detection: {stats['not_modified']} not modified (304), "
+              f"{stats['unchanged']} unchanged content, {stats['changed']} processed")
+    
+    @property
+    def writer(self):
+        if self._writer is None:
+            self._writer = TournamentWriter()
+        return self._writer
+    
+    @property
+    def deduplicator(self):
+        if self._deduplicator is None:
+            conn = get_connection(DB_PATH, check_same_thread=False)
+            self._deduplicator = TournamentDeduplicator(conn)
+        return self._deduplicator
+    
+    def close_writer(self):
+        """Close the scrape's DB connections"""
+        if self._writer is not None and self.owns_writer:
+            self._writer.close()
+            self._writer = None
+        if self._deduplicator is not None:
+            self._deduplicator.conn.close()
+            self._deduplicator = None
+        if self._page_meta is not None:
+            self._page_meta.close()
+            self._page_meta = None
+    
+    def deduplicate(self, tournaments):
+        """Merge near-duplicates (across sources and with stored rows) before saving"""
+        before = self.deduplicator.merged_count
+        merged = self.deduplicator.deduplicate(self.sport_name, tournaments)
+        if self.deduplicator.merged_count > before:
+            print(f"  🔗 Merged {self.deduplicator.merged_count - before} near-duplicate tournaments")
+        return merged
+    
+    def save_tournaments(self, tournaments):
+        """Save a batch of tournaments in a single transaction"""
+        saved = self.writer.write(self.sport_name, tournaments)
+        for tournament in tournaments:
+            print(f"Saved: {tournament.get('name')}")
+        return saved
+    
     def save_tournament(self, tournament_data):
         """Save tournament to database"""
-        conn = sqlite3.connect('data/tournaments.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO tournaments 
-            (name, sport, level, start_date, end_date, official_url, 
-             streaming_links, image_url, summary, location)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            tournament_data.get('name'),
-            self.sport_name,
-            tournament_data.get('level'),
-            tournament_data.get('start_date'),
-            tournament_data.get('end_date'),
-            tournament_data.get('official_url'),
-            tournament_data.get('streaming_links'),
-            tournament_data.get('image_url'),
-            tournament_data.get('summary'),
-            tournament_data.get('location')
-        ))
-        
-        conn.commit()
-        conn.close()
-        print(f"Saved: {tournament_data.get('name')}")
+        self.save_tournaments([tournament_data])
+    
+    def extract_tournaments(self, doc, url, cleaned=None):
+        """Extract tournaments from a parsed page, trying structured data before the LLM"""
+        tournaments = self.extract_structured(doc, url)
+        if tournaments is None:
+            if self.llm is None:
+                return []
+            self._count('llm', self.extraction_paths)
+            if cleaned is None:
+                cleaned = self.clean_page(doc)
+            cleaned = self.llm.prune_page(cleaned, self.sport_name, url)
+            tournaments = self.tag_sources(
+                self.llm.extract_tournaments_from_text(cleaned, self.sport_name, url), url
+            )
+        return tournaments
+    
+    def extract_structured(self, doc, url):
+        """Tournaments from JSON-LD / microdata / tables, or None if the page needs the LLM"""
+        found = self.structured.extract(doc, self.sport_name, url)
+        if not found:
+            return None
+        tournaments = [t for t in found if self.llm is None or self.llm.validate_tournament(t)]
+        if not tournaments:
+            # Nothing usable (past events, bad dates): let the LLM read the page instead
+            print(f"🗂️ Structured data: all {len(found)} records from {url} rejected, falling back to the LLM")
+            return None
+        self._count('structured', self.extraction_paths)
+        print(f"🗂️ Structured data: {len(tournaments)} tournaments from {url} (LLM skipped)")
+        return self.tag_sources(tournaments, url)
+    
+    def tag_sources(self, tournaments, url):
+        """Provenance, kept through deduplication"""
+        for tournament in tournaments:
+            tournament['sources'] = [url]
+        return tournaments
+    
+    def show_extraction_paths(self):
+        """Report how many pages used structured data vs the LLM"""
+        structured = self.extraction_paths['structured']
+        llm = self.extraction_paths['llm']
+        print(f"🧠 Extraction paths: {structured} structured, {llm} LLM "
+              f"({structured} LLM calls avoided)")
     
     def use_llm_to_extract(self, html_content, prompt_context=""):
         """Use LLM to extract tournament data from HTML"""
@@ -0,0 +1,13 @@
+from .source_scraper import SourceScraper
+from .registry import register
+
+@register
+class BasketballScraper(SourceScraper):
+    sport = "basketball"
+    
+    # ALL basketball sources in one list - let LLM decide the level!
+    sources = [
+        'https://www.fiba.basketball/events',
+        'https://www.basketballfederationindia.org/tournaments',
+        'https://www.nba.com/schedule',
+    ]
@@ -0,0 +1,13 @@
+from .source_scraper import SourceScraper
+from .registry import register
+
+@register
+class ChessScraper(SourceScraper):
+    sport = "chess"
+    
+    # ALL chess sources in one list - let LLM decide the level!
+    sources = [
+        'https://www.fide.com/calendar',
+        'https://aicf.in/upcoming-events/',
+        'https://chess-results.com/fed.aspx?lan=1&fed=IND',
+    ]
@@ -0,0 +1,15 @@
+from .source_scraper import SourceScraper
+from .registry import register
+
+@register
+class FootballScraper(SourceScraper):
+    sport = "football"
+    
+    # ALL football sources in one list - let LLM decide the level!
+    sources = [
+        'https://www.the-aiff.com/fixtures-results',
+        'https://www.indiansuperleague.com/fixtures',
+        'https://www.fifa.com/tournaments',
+        'https://www.the-afc.com/en/more/fixtures_results.html',
+        'https://www.uefa.com/competitions/',
+    ]
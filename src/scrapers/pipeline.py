@@ -0,0 +1,242 @@
+import queue
+import threading
+import time
+from ..utils.metrics import metrics
+
+# End-of-stream marker passed from one stage to the next
+_DONE = object()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class Stage:
+    """One pipeline step run by `workers` threads reading a bounded input queue
+
+    func(item) returns the item for the next stage, or None to drop it.
+    Exceptions are counted and printed, and the item is dropped. They never
+    stop the pipeline.
+    """
+
+    def __init__(self, name, func, workers=1, queue_size=None):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        # Bounded queue = backpressure: a full queue blocks the stage feeding it
+        self.queue = queue.Queue(maxsize=queue_size or self.workers * 2)
+
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.latencies = []
+        self.max_depth = 0
+        self._lock = threading.Lock()
+        self._running = 0
+
+    def put(self, item):
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record(self, elapsed, output=None, error=False):
+        metrics.observe('pipeline_stage_seconds', elapsed, stage=self.name)
+        with self._lock:
+            self.busy += elapsed
+            self.latencies.append(elapsed)
+            if error:
+                self.errors += 1
+            elif output is None:
+                self.dropped += 1
+            else:
+                self.processed += 1
+
+    def process(self, item):
+        """Run func on one item, returning the outputs for the next stage"""
+        started = time.perf_counter()
+        try:
+            output = self.func(item)
+        except Exception as e:
+            self.record(time.perf_counter() - started, error=True)
+            print(f"  ❌ {self.name} failed: {e}")
+            return []
+        self.record(time.perf_counter() - started, output)
+        return [output]
+
+    def stats(self, wall_time):
+        handled = self.processed + self.dropped + self.errors
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'items': handled,
+            'passed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'max_queue_depth': self.max_depth,
+            'throughput_per_s': handled / wall_time if wall_time else 0.0,
+            'avg_seconds': self.busy / handled if handled else 0.0,
+            'p50_seconds': percentile(self.latencies, 50),
+            'p95_seconds': percentile(self.latencies, 95),
+            'p99_seconds': percentile(self.latencies, 99),
+            # Share of the stage's worker time spent working rather than waiting
+            'utilization': self.busy / (self.workers * wall_time) if wall_time else 0.0,
+        }
+
+
+class BatchStage(Stage):
+    """Stage that groups small items and handles them with one batch_func call
+
+    cost(item) returns the item's size (e.g. estimated tokens), or None if
+    the item must be handled on its own by func. A worker keeps taking
+    queued items into the batch while their total cost fits in `budget`,
+    waiting at most `linger` seconds for the next one. batch_func(items)
+    returns one output per item, in order.
+    """
+
+    def __init__(self, name, func, batch_func, cost, budget, workers=1, queue_size=None, linger=0.25):
+        super().__init__(name, func, workers, queue_size)
+        self.batch_func = batch_func
+        self.cost = cost
+        self.budget = budget
+        self.linger = linger
+        self.batches = 0
+
+    def process(self, item):
+        outputs = []
+        while item is not None:
+            size = self.cost(item)
+            if size is None:
+                return outputs + super().process(item)
+
+            batch, total, item = [item], size, None
+            while total < self.budget:
+                try:
+                    candidate = self.queue.get(timeout=self.linger)
+                except queue.Empty:
+                    break
+                if candidate is _DONE:
+                    # Not ours to consume: leave it for this or another worker
+                    self.queue.put(candidate)
+                    break
+                size = self.cost(candidate)
+                if size is None or total + size > self.budget:
+                    item = candidate  # handled right after this batch
+                    break
+                batch.append(candidate)
+                total += size
+            outputs += self._process_batch(batch)
+        return outputs
+
+    def _process_batch(self, batch):
+        if len(batch) == 1:
+            return super().process(batch[0])
+        started = time.perf_counter()
+        try:
+            results = self.batch_func(batch)
+        except Exception as e:
+            elapsed = (time.perf_counter() - started) / len(batch)
+            for _ in batch:
+                self.record(elapsed, error=True)
+            print(f"  ❌ {self.name} batch of {len(batch)} failed: {e}")
+            return []
+        elapsed = (time.perf_counter() - started) / len(batch)
+        for output in results:
+            self.record(elapsed, output)
+        with self._lock:
+            self.batches += 1
+        return results
+
+    def stats(self, wall_time):
+        stats = super().stats(wall_time)
+        stats['batches'] = self.batches
+        return stats
+
+
+class Pipeline:
+    """Producer/consumer pipeline: stages connected by bounded queues
+
+    Each stage runs its own worker threads, so a slow stage (the
+    rate-limited LLM) always has queued work, while faster stages block on
+    a full queue instead of piling up pages in memory. Queue depths are
+    printed every `report_interval` seconds, and stats() returns the
+    per-stage counts, throughput and utilization once run() returns.
+    """
+
+    def __init__(self, stages, report_interval=10.0):
+        self.stages = stages
+        self.report_interval = report_interval
+        self.wall_time = 0.0
+
+    def _worker(self, index):
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is _DONE:
+                break
+            for output in stage.process(item):
+                if output is not None and downstream is not None:
+                    downstream.put(output)
+
+        # The last worker of a stage to finish closes the next stage
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+        if last and downstream is not None:
+            for _ in range(downstream.workers):
+                downstream.queue.put(_DONE)
+
+    def _monitor(self, finished):
+        while not finished.wait(self.report_interval):
+            depths = ' | '.join(f"{stage.name} {stage.queue.qsize()}" for stage in self.stages)
+            print(f"📦 Queue depth: {depths}")
+
+    def run(self, items):
+        """Push items through every stage and wait until the last one is done"""
+        started = time.perf_counter()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage._running = stage.workers
+            for number in range(stage.workers):
+                thread = threading.Thread(target=self._worker, args=(index,),
+                                          name=f"{stage.name}-{number}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        finished = threading.Event()
+        monitor = None
+        if self.report_interval:
+            monitor = threading.Thread(target=self._monitor, args=(finished,), daemon=True)
+            monitor.start()
+
+        first = self.stages[0]
+        for item in items:
+            first.put(item)
+        for _ in range(first.workers):
+            first.queue.put(_DONE)
+
+        for thread in threads:
+            thread.join()
+        finished.set()
+        if monitor is not None:
+            monitor.join()
+        self.wall_time = time.perf_counter() - started
+        return self.stats()
+
+    def stats(self):
+        return [stage.stats(self.wall_time) for stage in self.stages]
+
+    def show_stats(self):
+        print(f"⚙️ Pipeline stages ({self.wall_time:.1f}s total):")
+        for s in self.stats():
+            print(f"  {s['stage']:<9} x{s['workers']:<3} {s['items']:>4} items "
+                  f"({s['passed']} passed, {s['dropped']} dropped, {s['errors']} errors) | "
+                  f"{s['throughput_per_s']:.2f}/s | p50 {s['p50_seconds']:.2f}s p95 {s['p95_seconds']:.2f}s | "
+                  f"max queue {s['max_queue_depth']} | {s['utilization']:.0%} busy")
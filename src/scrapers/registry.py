@@ -0,0 +1,37 @@
+import importlib
+
+# sport name -> scraper class, filled by @register as sport modules are imported
+SCRAPERS = {}
+
+# Built-in sport modules, imported by load_scrapers()
+SCRAPER_MODULES = [
+    'cricket_scraper',
+    'football_scraper',
+    'basketball_scraper',
+    'badminton_scraper',
+    'chess_scraper',
+]
+
+
+def register(scraper_class):
+    """Class decorator adding a scraper to the registry under its sport"""
+    SCRAPERS[scraper_class.sport] = scraper_class
+    return scraper_class
+
+
+def load_scrapers():
+    """Import the built-in sport modules so they register themselves"""
+    for module in SCRAPER_MODULES:
+        importlib.import_module(f"{__package__}.{module}")
+    return SCRAPERS
+
+
+def available_sports():
+    return sorted(load_scrapers())
+
+
+def get_scraper_class(sport):
+    scrapers = load_scrapers()
+    if sport not in scrapers:
+        raise ValueError(f"Unknown sport '{sport}' (choose from {', '.join(sorted(scrapers))})")
+    return scrapers[sport]
@@ -0,0 +1,217 @@
+import heapq
+import math
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from ..database.source_state import SourceStateStore
+from ..database.ics_feeds import refresh_feeds
+from ..utils.metrics import metrics
+
+# Outcomes that count as a successful check of a source
+CHECKED = ('changed', 'unchanged', 'not_modified')
+
+
+class SourceScheduler:
+    """Long-running re-scrape loop that revisits every source at its own pace
+
+    Every source has a revisit interval. The interval halves when a check
+    finds changed content and grows by half when it doesn't, so fixture
+    pages end up polled every 15 minutes and static pages about once a
+    week. Failing sources back off exponentially with their error streak.
+
+    Sources wait in a heap ordered by due time. Each cycle pops the due
+    ones and ranks them by expected changes per unit of budget: the chance
+    the page changed since the last check, divided by what a check costs
+    (one request plus the LLM tokens a changed page usually needs). Due
+    sources are taken in that order until the cycle's request or LLM token
+    budget is used up. The rest stay due and rank higher in the next
+    cycle, because their chance of a change keeps growing.
+    """
+
+    min_interval = 15 * 60           # most volatile pages
+    max_interval = 7 * 24 * 3600     # static pages
+    initial_interval = 6 * 3600      # sources never checked before
+    speedup = 0.5                    # interval factor after a change
+    slowdown = 1.5                   # interval factor after an unchanged check
+    error_backoff = 2.0              # per consecutive error, applied to the interval
+    smoothing = 0.3                  # weight of the latest check in the running averages
+    initial_change_rate = 0.5
+    initial_llm_tokens = 1000
+
+    def __init__(self, scrapers, writer=None, store=None, max_requests=20, max_llm_tokens=12000,
+                 cycle_seconds=60, metrics_file=None):
+        """
+        Args:
+            scrapers: SourceScraper instances (one per sport), reused every cycle
+            writer: TournamentWriter shared by the scrapers; feeds are refreshed
+                after a cycle that changed rows
+            store: SourceStateStore (default: the tournaments database)
+            max_requests: Sources fetched per cycle at most
+            max_llm_tokens: Expected LLM input tokens per cycle at most
+            cycle_seconds: Minimum time between cycles, so due sources are batched
+            metrics_file: Prometheus textfile written after every cycle
+        """
+        self.scrapers = {scraper.sport_name: scraper for scraper in scrapers}
+        self.writer = writer
+        self.store = store or SourceStateStore()
+        self.max_requests = max_requests
+        self.max_llm_tokens = max_llm_tokens
+        self.cycle_seconds = cycle_seconds
+        self.metrics_file = metrics_file
+
+        self.states = self._load_states()
+        self._queue = [(state['next_due'], url) for url, state in self.states.items()]
+        heapq.heapify(self._queue)
+
+    def _load_states(self):
+        """Stored state for every current source; new sources are due now"""
+        stored = self.store.load()
+        now = time.time()
+        states = {}
+        for sport, scraper in self.scrapers.items():
+            for url in scraper.all_sources:
+                state = stored.get(url) or {
+                    'url': url, 'interval': self.initial_interval, 'next_due': now,
+                    'last_checked': None, 'last_changed': None,
+                    'change_rate': self.initial_change_rate, 'llm_tokens': self.initial_llm_tokens,
+                    'error_streak': 0, 'checks': 0, 'changes': 0,
+                }
+                state['sport'] = sport
+                states[url] = state
+        return states
+
+    def change_probability(self, state, now):
+        """Chance the source changed since its last check"""
+        if not state['last_checked']:
+            return 1.0
+        # change_rate is per check at the current interval
+        rate = state['change_rate'] / state['interval']
+        return 1.0 - math.exp(-rate * max(0.0, now - state['last_checked']))
+
+    def priority(self, state, now):
+        """Expected changes found per share of the cycle's budget"""
+        probability = self.change_probability(state, now)
+        cost = 1.0 / self.max_requests + probability * state['llm_tokens'] / self.max_llm_tokens
+        return probability / cost
+
+    def select(self, now):
+        """Pop the due sources, return (chosen, deferred) within the cycle's budget"""
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            due.append(heapq.heappop(self._queue)[1])
+
+        ranked = [(-self.priority(self.states[url], now), url) for url in due]
+        heapq.heapify(ranked)
+
+        chosen, deferred, tokens = [], [], 0.0
+        while ranked:
+            _, url = heapq.heappop(ranked)
+            state = self.states[url]
+            expected = self.change_probability(state, now) * state['llm_tokens']
+            # The best source always runs, even if it alone exceeds the token budget
+            if len(chosen) >= self.max_requests or (chosen and tokens + expected > self.max_llm_tokens):
+                deferred.append(url)
+                continue
+            chosen.append(url)
+            tokens += expected
+
+        for url in deferred:
+            heapq.heappush(self._queue, (self.states[url]['next_due'], url))
+        return chosen, deferred
+
+    def record(self, url, result, now):
+        """Adapt a source's interval from the outcome of its check"""
+        state = self.states[url]
+        outcome = result['outcome'] if result else 'error'
+        if outcome not in CHECKED:
+            outcome = 'error'  # fetch failed, or extraction failed / never finished
+        state['last_checked'] = now
+        state['checks'] += 1
+
+        if outcome == 'error':
+            state['error_streak'] += 1
+            delay = state['interval'] * self.error_backoff ** state['error_streak']
+            state['next_due'] = now + min(self.max_interval, delay)
+            return outcome
+
+        state['error_streak'] = 0
+        changed = outcome == 'changed'
+        state['change_rate'] += self.smoothing * (changed - state['change_rate'])
+        if changed:
+            state['changes'] += 1
+            state['last_changed'] = now
+            # Structured-data pages cost no tokens, which makes them cheap to revisit
+            state['llm_tokens'] += self.smoothing * (result['llm_tokens'] - state['llm_tokens'])
+            state['interval'] = max(self.min_interval, state['interval'] * self.speedup)
+        else:
+            state['interval'] = min(self.max_interval, state['interval'] * self.slowdown)
+        state['next_due'] = now + state['interval']
+        return outcome
+
+    def run_cycle(self):
+        """Scrape the due sources that fit the budget, return the outcome counts"""
+        chosen, deferred = self.select(time.time())
+        outcomes = Counter()
+        if not chosen:
+            return outcomes
+        print(f"\n🗓️ Scheduler: {len(chosen)} sources due now, {len(deferred)} deferred to the next cycle")
+        metrics.inc('scheduler_deferred_total', len(deferred))
+
+        by_sport = defaultdict(list)
+        for url in chosen:
+            by_sport[self.states[url]['sport']].append(url)
+
+        changed_before = self.writer.rows_changed if self.writer else 0
+        with ThreadPoolExecutor(max_workers=len(by_sport)) as pool:
+            futures = {
+                sport: pool.submit(self.scrapers[sport].scrape_all_tournaments, urls)
+                for sport, urls in by_sport.items()
+            }
+        now = time.time()
+        for sport, future in futures.items():
+            if future.exception():
+                print(f"Scheduled scrape for {sport} failed: {future.exception()}")
+            results = self.scrapers[sport].source_results
+            for url in by_sport[sport]:
+                outcome = self.record(url, results.get(url), now)
+                outcomes[outcome] += 1
+                metrics.inc('scheduler_checks_total', outcome=outcome)
+                heapq.heappush(self._queue, (self.states[url]['next_due'], url))
+        self.store.save([self.states[url] for url in chosen])
+
+        if self.writer and self.writer.rows_changed > changed_before:
+            regenerated = refresh_feeds()
+            print(f"📅 Regenerated {len(regenerated)} calendar feeds")
+        if self.metrics_file and metrics.enabled:
+            metrics.write_textfile(self.metrics_file)
+
+        print("🗓️ Cycle done: " + ', '.join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())))
+        return outcomes
+
+    def seconds_until_due(self):
+        if not self._queue:
+            return self.cycle_seconds
+        return max(self.cycle_seconds, self._queue[0][0] - time.time())
+
+    def show_schedule(self, limit=20):
+        """The next sources due, with their learned interval and change rate"""
+        now = time.time()
+        print(f"🗓️ Schedule ({len(self.states)} sources):")
+        for due, url in heapq.nsmallest(limit, self._queue):
+            state = self.states[url]
+            print(f"  in {max(0.0, due - now) / 60:>7.1f} min | every {state['interval'] / 3600:>6.2f} h | "
+                  f"changes {state['change_rate']:.0%} | errors {state['error_streak']} | {url}")
+
+    def run(self, once=False):
+        """Run cycles until interrupted (or a single one with once=True)"""
+        self.show_schedule()
+        try:
+            while True:
+                self.run_cycle()
+                if once:
+                    break
+                wait = self.seconds_until_due()
+                print(f"💤 Next cycle in {wait / 60:.1f} min")
+                time.sleep(wait)
+        finally:
+            self.store.close()
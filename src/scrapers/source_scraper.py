@@ -0,0 +1,304 @@
+from .base_scraper import BaseScraper, NOT_MODIFIED
+from .pipeline import Pipeline, Stage, BatchStage
+from ..utils.llm_extractor import GroqExtractor
+from ..utils.html_chunker import estimate_tokens
+from ..database.ics_feeds import refresh_feeds
+from ..database.initDB import DB_PATH, get_connection
+import os
+
+SPORT_ICONS = {'cricket': '🏏', 'football': '⚽', 'basketball': '🏀', 'badminton': '🏸', 'chess': '♟️'}
+
+
+class SourceScraper(BaseScraper):
+    """Scraper for a sport defined by its list of source pages
+    
+    Subclasses only declare `sport` and `sources`; the LLM decides the
+    level of every tournament found. An LLM extractor and DB writer can be
+    passed in so several sports share one rate budget and one writer.
+    """
+    
+    sport = None
+    sources = []
+    
+    # Pipeline workers per stage (fetching uses max_workers)
+    clean_workers = 2         # CPU-bound lxml cleaning
+    extract_workers = 4       # LLM calls in flight; the shared rate limiter paces them
+    report_interval = 10.0    # seconds between queue depth reports
+    
+    def __init__(self, groq_api_key=None, llm=None, writer=None):
+        super().__init__(self.sport, writer=writer)
+        
+        if llm is None:
+            # Initialize Groq LLM
+            if not groq_api_key:
+                groq_api_key = os.getenv('GROQ_API_KEY')
+            
+            if not groq_api_key:
+                raise ValueError("❌ GROQ_API_KEY not found! Get one from: https://console.groq.com/")
+            
+            llm = GroqExtractor(groq_api_key, model="llama3-70b-8192")
+            
+            # Test connection once - the result is remembered for later extractions
+            if not llm.health.is_available():
+                raise ConnectionError("❌ Could not connect to Groq API")
+        
+        self.llm = llm
+        
+        # ALL sources in one list - let LLM decide the level!
+        self.all_sources = list(self.sources)
+        self.source_results = {}
+    
+    @property
+    def icon(self):
+        return SPORT_ICONS.get(self.sport_name, '🏆')
+    
+    def scrape_all_tournaments(self, urls=None):
+        """Scrape ALL tournaments of this sport from all sources - let LLM classify levels
+        
+        Sources flow through a fetch -> clean -> structured -> extract ->
+        validate -> save pipeline, so pages keep being fetched and cleaned
+        while the LLM works; small pages share batched LLM requests.
+        urls limits the run to some of the sources (the scheduler's due ones).
+        Returns a summary dict (sport, sources, tournaments, stages); what
+        happened to each URL is left in self.source_results.
+        """
+        print(f"{self.icon} Starting comprehensive {self.sport_name} tournament scraping...")
+        
+        sources = list(urls) if urls is not None else self.all_sources
+        self._totals = {'sources': 0, 'tournaments': 0}
+        self.source_results = {}
+        pipeline = Pipeline([
+            Stage('fetch', self._fetch_stage, workers=min(self.max_workers, max(1, len(sources)))),
+            Stage('clean', self._clean_stage, workers=self.clean_workers),
+            Stage('structured', self._structured_stage, workers=self.clean_workers),
+            # Small LLM-bound pages are packed into one request up to the token budget
+            BatchStage('extract', self._extract_stage, self._extract_batch, self._batch_cost,
+                       budget=self.llm.batch_tokens if self.llm else 0,
+                       workers=self.extract_workers),
+            Stage('validate', self._validate_stage, workers=1),
+            # Single writer: one batched transaction per source
+            Stage('save', self._save_stage, workers=1),
+        ], report_interval=self.report_interval)
+        
+        print(f"📡 Fetching {len(sources)} sources concurrently...")
+        stages = pipeline.run(dict.fromkeys(sources))
+        
+        # A shared writer is closed (and feeds refreshed) by whoever owns it
+        if self.owns_writer:
+            changed = self.writer.rows_changed if self._writer else 0
+            self.close_writer()
+            
+            # Re-render only the calendar feeds whose tournaments changed
+            if changed:
+                regenerated = refresh_feeds()
+                print(f"📅 Regenerated {len(regenerated)} calendar feeds")
+        else:
+            self.close_writer()
+        
+        print(f"\n🎉 {self.sport_name.upper()} SCRAPING COMPLETE!")
+        print(f"📈 Processed {self._totals['sources']} sources")
+        print(f"🏆 Found {self._totals['tournaments']} {self.sport_name} tournaments total")
+        self.show_extraction_paths()
+        self.show_page_stats()
+        pipeline.show_stats()
+        
+        # Show breakdown by level
+        self.show_tournament_breakdown()
+        
+        return {
+            'sport': self.sport_name,
+            'sources': self._totals['sources'],
+            'tournaments': self._totals['tournaments'],
+            'stages': stages,
+        }
+    
+    def _fetch_stage(self, url):
+        doc = self.get_page(url, self.conditional_fetch)
+        if doc is NOT_MODIFIED:
+            self._record_source(url, 'not_modified')
+            print(f"⏭️ Not modified (304): {url}")
+            return None
+        if doc is None:
+            self._record_source(url, 'error')
+            print(f"  ⚠️ Could not fetch {url}")
+            return None
+        print(f"📡 Fetched: {url}")
+        return url, doc
+    
+    def _clean_stage(self, item):
+        url, doc = item
+        cleaned = self.clean_page(doc)
+        
+        # Same content as the last processed fetch - nothing to extract
+        if self.is_page_unchanged(url, cleaned):
+            self.mark_page_processed(url, changed=False)
+            self._record_source(url, 'unchanged')
+            self._count('sources', self._totals)
+            print(f"  ⏭️ Content unchanged since last run, skipping {url}")
+            return None
+        return url, doc, cleaned
+    
+    def _structured_stage(self, item):
+        url, doc, cleaned = item
+        # None: no structured data, the LLM has to read the page
+        tournaments = self.extract_structured(doc, url)
+        if tournaments is None and self.llm is not None:
+            # Only the relevant blocks go to the LLM (and decide whether the page is batched)
+            cleaned = self.llm.prune_page(cleaned, self.sport_name, url)
+            if not cleaned:
+                print(f"  ⏭️ Nothing tournament-related on {url}, LLM skipped")
+                tournaments = []
+        return url, cleaned, tournaments
+    
+    def _batch_cost(self, item):
+        """Estimated tokens of a small LLM-bound page, None if it goes on its own"""
+        url, cleaned, tournaments = item
+        if tournaments is not None or self.llm is None:
+            return None
+        tokens = estimate_tokens(cleaned)
+        return tokens if tokens <= self.llm.small_page_tokens else None
+    
+    def _extract_stage(self, item):
+        url, cleaned, tournaments = item
+        if tournaments is not None or self.llm is None:
+            return url, tournaments or [], False
+        
+        self._count('llm', self.extraction_paths)
+        self._record_source(url, 'extracting', llm_tokens=estimate_tokens(cleaned))
+        llm_errors = self.llm.url_errors.get(url, 0)
+        tournaments = self.llm.extract_tournaments_from_text(cleaned, self.sport_name, url)
+        failed = self.llm.url_errors.get(url, 0) != llm_errors
+        return url, self.tag_sources(tournaments, url), failed
+    
+    def _extract_batch(self, items):
+        llm_errors = {url: self.llm.url_errors.get(url, 0) for url, _, _ in items}
+        results = self.llm.extract_batch([(url, cleaned) for url, cleaned, _ in items], self.sport_name)
+        
+        outputs = []
+        for url, cleaned, _ in items:
+            self._count('llm', self.extraction_paths)
+            self._record_source(url, 'extracting', llm_tokens=estimate_tokens(cleaned))
+            failed = self.llm.url_errors.get(url, 0) != llm_errors[url]
+            outputs.append((url, self.tag_sources(results.get(url, []), url), failed))
+        return outputs
+    
+    def _validate_stage(self, item):
+        url, tournaments, failed = item
+        # Save ALL tournaments - LLM already classified them correctly!
+        valid = [t for t in tournaments if self.validate_tournament_data(t)]
+        return url, len(tournaments), self.deduplicate(valid), failed
+    
+    def _save_stage(self, item):
+        url, found, valid, failed = item
+        saved = self.save_tournaments(valid)
+        for tournament in valid:
+            print(f"  ✅ Saved: {tournament['name']} ({tournament['level']})")
+        
+        # Only remember the page once extraction fully succeeded,
+        # otherwise it is retried on the next run
+        if not failed:
+            self.mark_page_processed(url)
+        self._record_source(url, 'error' if failed else 'changed', tournaments=saved)
+        
+        with self._stats_lock:
+            self._totals['sources'] += 1
+            self._totals['tournaments'] += saved
+        print(f"  📊 Found {found} tournaments from {url}")
+        return url
+    
+    def _record_source(self, url, outcome, **details):
+        """Outcome of one source in this run: not_modified, unchanged, changed or error"""
+        with self._stats_lock:
+            result = self.source_results.setdefault(url, {'llm_tokens': 0, 'tournaments': 0})
+            result.update(details, outcome=outcome)
+    
+    def validate_tournament_data(self, tournament):
+        """Basic validation - but trust LLM classification"""
+        
+        # Check essential fields exist
+        if not tournament.get('name') or len(tournament.get('name', '')) < 3:
+            print(f"  ⚠️ Skipping tournament with invalid name: {tournament}")
+            return False
+        
+        # Check if level is reasonable (but don't override LLM decision)
+        valid_levels = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club', 'Corporate', 'District']
+        if tournament.get('level') not in valid_levels:
+            print(f"  ⚠️ Unusual level '{tournament.get('level')}' for: {tournament.get('name')}")
+            # Don't reject - just log it
+        
+        return True
+    
+    def show_tournament_breakdown(self):
+        """Show breakdown of tournaments by level"""
+        conn = get_connection(DB_PATH)
+        cursor = conn.cursor()
+        
+        print(f"\n📊 {self.sport_name.upper()} TOURNAMENTS BY LEVEL:")
+        
+        breakdown = cursor.execute('''
+            SELECT level, COUNT(*) as count 
+            FROM tournaments 
+            WHERE sport = ? 
+            GROUP BY level 
+            ORDER BY count DESC
+        ''', (self.sport_name,)).fetchall()
+        
+        for level, count in breakdown:
+            print(f"  🎯 {level}: {count} tournaments")
+        
+        conn.close()
+    
+    # Override the old methods to use the new approach
+    def scrape_international(self):
+        """Legacy method - redirects to comprehensive scraping"""
+        print("🔄 Redirecting to comprehensive scraping...")
+        self.scrape_all_tournaments()
+    
+    def scrape_national(self):
+        """Legacy method - redirects to comprehensive scraping"""
+        print("🔄 Using comprehensive scraping (no need for separate national scraping)")
+        pass
+    
+    def scrape_local(self):
+        """Legacy method - redirects to comprehensive scraping"""  
+        print("🔄 Using comprehensive scraping (no need for separate local scraping)")
+        pass
+    
+    def scrape_all(self):
+        """Main scraping method"""
+        return self.scrape_all_tournaments()
+    
+    def quick_test(self, test_url=None):
+        """Quick test with one URL (default: the first source)"""
+        test_url = test_url or self.all_sources[0]
+        print(f"🧪 Testing {self.sport_name} scraper with: {test_url}")
+        
+        try:
+            doc = self.get_page(test_url)
+            if doc is not None:
+                tournaments = self.extract_tournaments(doc, test_url)
+                
+                print("\n📊 TEST RESULTS:")
+                print(f"🏆 Found {len(tournaments)} tournaments")
+                
+                # Show breakdown by level
+                level_counts = {}
+                for t in tournaments:
+                    level = t.get('level', 'Unknown')
+                    level_counts[level] = level_counts.get(level, 0) + 1
+                
+                for level, count in level_counts.items():
+                    print(f"  {level}: {count} tournaments")
+                
+                print("\n📝 Sample tournaments:")
+                for i, t in enumerate(tournaments[:3]):
+                    print(f"  {i+1}. {t.get('name')} ({t.get('level')}) - {t.get('start_date')}")
+                
+                return tournaments
+            else:
+                print("❌ Could not fetch test URL")
+                return []
+                
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return []
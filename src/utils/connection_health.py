@@ -0,0 +1,84 @@
+import threading
+import time
+
+
+class ConnectionHealth:
+    """Remembered connection health with a simple circuit breaker
+
+    The probe (e.g. GroqExtractor.test_connection) runs at most once per
+    `ttl` seconds, or once per `cooldown` seconds while it fails; in
+    between, real requests report their outcome through record_success() /
+    record_failure(). After `failure_threshold` consecutive failures the
+    circuit opens and is_available() returns False for `cooldown` seconds,
+    after which a single trial request is let through to test the
+    connection again (half-open); every other caller waits for its outcome.
+    """
+
+    def __init__(self, probe, ttl=600, failure_threshold=3, cooldown=60):
+        self.probe = probe
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.healthy = None
+        self.last_checked = 0
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def circuit_open(self):
+        return self.opened_at is not None
+
+    def is_available(self):
+        """Return True if requests should be attempted right now"""
+        with self._lock:
+            now = time.time()
+
+            if self.circuit_open:
+                if now - self.opened_at < self.cooldown:
+                    return False
+                # Half-open: one trial request decides (another one if it never reports back)
+                if self.trial_started is not None and now - self.trial_started < self.cooldown:
+                    return False
+                self.trial_started = now
+                return True
+
+            # A failed probe is retried sooner than a successful one expires
+            max_age = self.ttl if self.healthy else self.cooldown
+            if self.healthy is not None and now - self.last_checked < max_age:
+                return self.healthy
+
+            self.healthy = bool(self.probe())
+            self.last_checked = now
+            return self.healthy
+
+    def record_success(self):
+        """A real request succeeded - the connection is healthy"""
+        with self._lock:
+            self.healthy = True
+            self.last_checked = time.time()
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_started = None
+
+    def record_failure(self):
+        """A real request failed - open the circuit after too many in a row"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self.trial_started = None
+            if self.consecutive_failures >= self.failure_threshold or self.circuit_open:
+                self.healthy = False
+                self.opened_at = time.time()
+                print(f"🔌 Circuit open after {self.consecutive_failures} consecutive failures, "
+                      f"pausing requests for {self.cooldown}s")
+
+    def reset(self):
+        """Forget the remembered state so the next check probes again"""
+        with self._lock:
+            self.healthy = None
+            self.last_checked = 0
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_started = None
@@ -0,0 +1,150 @@
+import re
+from .html_chunker import estimate_tokens
+
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?'
+DATE = re.compile(
+    rf'\b(?:\d{{4}}-\d{{1,2}}-\d{{1,2}}|\d{{1,2}}[/.]\d{{1,2}}[/.]\d{{2,4}}'
+    rf'|\d{{1,2}}(?:st|nd|rd|th)?\s+{MONTH}|{MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?)(?!\w)',
+    re.IGNORECASE,
+)
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+EVENT_WORDS = re.compile(
+    r'\b(?:trophy|cup|championships?|league|series|tournaments?|open|games|qualifiers?|finals?'
+    r'|fixtures?|schedule|season|edition|round|group|stage|vs?)\b',
+    re.IGNORECASE,
+)
+VENUE_WORDS = re.compile(
+    r'\b(?:stadium|ground|arena|oval|park|venue|hall|centre|center|club|academy|university|college|school)\b',
+    re.IGNORECASE,
+)
+# Runs of capitalized words: team, venue, city and tournament names
+PROPER_NAME = re.compile(r"\b[A-Z][\w.'-]*(?:\s+(?:of\s+|&\s+)?[A-Z0-9][\w.'-]*)+")
+BOILERPLATE = re.compile(
+    r'\b(?:cookies?|privacy|subscribe|newsletter|sign (?:in|up)|log ?in|advertisement|sponsored'
+    r'|share (?:on|this)|follow us|all rights reserved|copyright|terms of (?:use|service)'
+    r'|download (?:the|our) app|read more|related (?:articles|stories)|trending|most read)\b',
+    re.IGNORECASE,
+)
+# Sentence boundary, but not after initials or short titles ("Col. CK Nayudu", "St. Xavier's")
+SENTENCE_END = re.compile(r'(?<!\b[A-Z]\.)(?<!\b[A-Z][a-z]\.)(?<!\b[A-Z][a-z]{2}\.)(?<=[.!?])\s+(?=[A-Z0-9])')
+
+SPORT_WORDS = {
+    'cricket': ['cricket', 't20', 'odi', 'test', 'innings', 'overs', 'wickets?', 'ipl', 'ranji', 'bcci', 'icc'],
+    'football': ['football', 'soccer', 'fifa', 'aiff', 'isl', 'i-league', 'kick-off', 'goals?'],
+    'basketball': ['basketball', 'fiba', 'nba', 'bfi', '3x3', 'hoops'],
+    'badminton': ['badminton', 'bwf', 'shuttlers?', 'singles', 'doubles'],
+    'chess': ['chess', 'fide', 'aicf', 'rapid', 'blitz', 'classical', 'grandmasters?', 'rated'],
+}
+
+# Paragraph lines longer than this are scored sentence by sentence
+SENTENCE_SPLIT_TOKENS = 40
+
+
+def sport_pattern(sport):
+    words = SPORT_WORDS.get((sport or '').lower(), []) + ([sport] if sport else [])
+    if not words:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(words) + r')\b', re.IGNORECASE)
+
+
+def score_block(text, sport_words=None):
+    """Relevance of one block of cleaned page text (<= 0: nothing worth extracting)
+
+    A block needs an anchor - a date, a year or a named competition/venue -
+    to score at all; event words, names, sport terms and table structure
+    then add to it, and boilerplate phrases subtract.
+    """
+    penalty = 5 * len(BOILERPLATE.findall(text))
+    dates = len(DATE.findall(text))
+    years = len(YEAR.findall(text))
+    names = PROPER_NAME.findall(text)
+    named_events = sum(1 for name in names if EVENT_WORDS.search(name) or VENUE_WORDS.search(name))
+    if not (dates or years or named_events):
+        return -penalty
+
+    score = 3 * min(3, dates) + min(2, years) + 2 * min(3, named_events)
+    score += min(3, len(EVENT_WORDS.findall(text)))
+    score += min(3, len(names))
+    score += min(2, len(VENUE_WORDS.findall(text)))
+    if sport_words is not None:
+        score += min(3, len(sport_words.findall(text)))
+    if ' | ' in text:
+        score += 2  # table row
+    return score - penalty
+
+
+def split_scored_blocks(text, sport=None):
+    """Blocks of cleaned page text as dicts with line, text, tokens, score, context
+
+    A block is a line, or a sentence of a long paragraph line. context is
+    the index of the block that gives it meaning: the nearest heading, or
+    the first row of the table it belongs to.
+    """
+    sport_words = sport_pattern(sport)
+    blocks = []
+    heading = None
+    table_start = None
+    for line_number, line in enumerate(text.split('\n')):
+        if line.startswith('## '):
+            heading = len(blocks)
+            table_start = None
+            context = None
+            parts = [line]
+        elif ' | ' in line:
+            if table_start is None:
+                table_start = len(blocks)
+                context = heading
+            else:
+                context = table_start
+            parts = [line]
+        else:
+            table_start = None
+            context = heading
+            parts = [line]
+            if estimate_tokens(line) > SENTENCE_SPLIT_TOKENS:
+                parts = SENTENCE_END.split(line)
+        for part in parts:
+            score = score_block(part, sport_words)
+            # A short detail line (format, broadcaster, notes) under a relevant
+            # heading describes that tournament; it goes first when over budget
+            if score == 0 and len(parts) == 1 and context is not None and blocks[context]['score'] > 0:
+                score = 1
+            blocks.append({
+                'line': line_number,
+                'text': part,
+                'tokens': estimate_tokens(part),
+                'score': score,
+                'context': context,
+            })
+    return blocks
+
+
+def prune_content(text, sport=None, max_tokens=None):
+    """Keep only the relevant blocks of cleaned page text, in page order
+
+    Blocks without any tournament signal (navigation leftovers, ads, filler
+    sentences) are dropped. If the rest is still over max_tokens, the
+    blocks with the highest score per token are kept until the budget is
+    used. A kept block brings its table header row and heading along.
+    """
+    blocks = split_scored_blocks(text, sport)
+    candidates = [index for index, block in enumerate(blocks) if block['score'] > 0]
+
+    if max_tokens is not None and sum(blocks[i]['tokens'] for i in candidates) > max_tokens:
+        candidates.sort(key=lambda i: blocks[i]['score'] / blocks[i]['tokens'], reverse=True)
+    keep, used = set(), 0
+    for index in candidates:
+        needed, context = [], index
+        while context is not None and context not in keep:
+            needed.append(context)
+            context = blocks[context]['context']
+        cost = sum(blocks[i]['tokens'] for i in needed)
+        if max_tokens is not None and used + cost > max_tokens:
+            continue
+        keep.update(needed)
+        used += cost
+
+    lines = {}
+    for index in sorted(keep):
+        lines.setdefault(blocks[index]['line'], []).append(blocks[index]['text'])
+    return '\n'.join(' '.join(parts) for _, parts in sorted(lines.items()))
@@ -0,0 +1,279 @@
+import json
+import re
+from collections import defaultdict
+from datetime import date, timedelta
+from difflib import SequenceMatcher
+from functools import lru_cache
+from .tournament_utils import normalize_name
+
+# Words that differ between sources without changing which event is meant
+STOPWORDS = {
+    'the', 'of', 'and', 'a', 'icc', 'bcci', 'acc', 'fide', 'aicf', 'fifa', 'aiff', 'fiba', 'bwf',
+    'official', 'edition', 'season', 'tournament', 'presented', 'by',
+}
+# A year or season ("2026", "2026-27" normalizes to "2026 27")
+SEASON = re.compile(r'\b(?:19|20)\d{2}\b(?: \d{2}\b)?')
+AGE_GROUP = re.compile(r'\b(?:u|under)\s?(\d{2})\b')
+
+# Words that make a different event of an otherwise identical name
+# ("Women's T20 World Cup", "Asia Cup Qualifier", "U19 Asia Cup", "Kolkata Open Rapid")
+GENDER_WORDS = {'men': 'men', 'mens': 'men', 'women': 'women', 'womens': 'women',
+                'ladies': 'women', 'boys': 'boys', 'girls': 'girls'}
+STAGE_WORDS = {
+    'qualifier': 'qualifier', 'qualifiers': 'qualifier', 'qualifying': 'qualifier',
+    'qualification': 'qualifier', 'final': 'final', 'finals': 'final', 'semi': 'semifinal',
+    'semis': 'semifinal', 'semifinal': 'semifinal', 'semifinals': 'semifinal',
+    'playoff': 'playoff', 'playoffs': 'playoff', 'junior': 'junior', 'juniors': 'junior',
+    'youth': 'junior', 'rapid': 'rapid', 'blitz': 'blitz', 'bullet': 'bullet',
+}
+AGE_TOKEN = re.compile(r'^u\d{2}$')
+
+# Words naming the kind of event rather than which one: "Ranji Trophy" and
+# "Irani Trophy" share only these, so they are never enough for a match
+GENERIC_WORDS = {
+    'trophy', 'cup', 'open', 'league', 'premier', 'championship', 'championships', 'series',
+    'games', 'world', 'international', 'national', 'state', 'district', 'zonal', 'inter',
+    'invitational', 'masters', 'classic', 'challenge', 'memorial', 'super', 'grand', 'prix',
+    't20', 't10', 'odi', 'test', 'cricket', 'chess', 'football', 'basketball', 'badminton',
+}
+
+
+def name_tokens(name):
+    """Tokens of a tournament name (no stopwords / years; age groups as u19)"""
+    text = SEASON.sub(' ', AGE_GROUP.sub(r'u\1', normalize_name(name)))
+    return frozenset(token for token in text.split() if token not in STOPWORDS)
+
+
+def _is_marker(token):
+    return token in GENDER_WORDS or token in STAGE_WORDS or AGE_TOKEN.match(token)
+
+
+def name_markers(tokens):
+    """Gender, stage and age group of a name; no gender word means the men's event"""
+    gender = {GENDER_WORDS[token] for token in tokens if token in GENDER_WORDS} or {'men'}
+    stages = {STAGE_WORDS[token] for token in tokens if token in STAGE_WORDS}
+    ages = {token for token in tokens if AGE_TOKEN.match(token)}
+    return frozenset(gender), frozenset(stages), frozenset(ages)
+
+
+def name_signature(tokens):
+    """(markers, distinctive tokens, generic tokens) of a name, computed once per record"""
+    words = [token for token in tokens if not _is_marker(token)]
+    return (
+        name_markers(tokens),
+        frozenset(token for token in words if token not in GENERIC_WORDS),
+        frozenset(token for token in words if token in GENERIC_WORDS),
+    )
+
+
+@lru_cache(maxsize=65536)
+def token_similarity(a, b):
+    """Character similarity of two words, for spelling variants ("Deodhar" / "Deodar")
+
+    Numbers and words starting with a different letter ("Ranji" / "Irani")
+    are different words, however many letters they share.
+    """
+    if a[0] != b[0] or a.isdigit() or b.isdigit():
+        return 0.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < 0.5:
+        return 0.0
+    return matcher.ratio()
+
+
+def name_similarity(signature_a, signature_b):
+    """Similarity in [0, 1] between two name signatures
+
+    Names with a different gender, stage or age group never match, and
+    neither do names where one has a distinctive word the other lacks
+    ("Premier League" vs "Indian Premier League"). Distinctive words are
+    paired up and the score is the weakest pair: 1.0 when they agree,
+    the character similarity of a misspelt pair otherwise. Generic words
+    only have to overlap when both names have some; names made only of
+    generic words must have the same ones.
+    """
+    markers_a, distinctive_a, generic_a = signature_a
+    markers_b, distinctive_b, generic_b = signature_b
+    if markers_a != markers_b or len(distinctive_a) != len(distinctive_b):
+        return 0.0
+    if not distinctive_a:
+        return 1.0 if generic_a and generic_a == generic_b else 0.0
+    if generic_a and generic_b and generic_a.isdisjoint(generic_b):
+        return 0.0
+    if distinctive_a == distinctive_b:
+        return 1.0
+
+    unmatched = sorted(distinctive_b - distinctive_a)
+    score = 1.0
+    for token in sorted(distinctive_a - distinctive_b):
+        best = max(unmatched, key=lambda other: token_similarity(token, other))
+        score = min(score, token_similarity(token, best))
+        if score == 0.0:
+            break
+        unmatched.remove(best)
+    return score
+
+
+def _shape(signature):
+    """What two names need in common to be compared at all (see name_similarity)"""
+    markers, distinctive, _ = signature
+    return markers, len(distinctive)
+
+
+def _parse(date_text):
+    try:
+        return date.fromisoformat(date_text)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Entry:
+    __slots__ = ('record', 'signature', 'start', 'end')
+
+    def __init__(self, record, signature, start, end):
+        self.record = record
+        self.signature = signature
+        self.start = start
+        self.end = end
+
+
+class TournamentDeduplicator:
+    """Merge near-duplicate tournaments reported by different sources
+
+    Candidates are blocked by (sport, month) for every month a tournament's
+    date range touches, so each new record is only compared with events of
+    the same sport running around the same time - work grows roughly
+    linearly with the catalogue instead of quadratically. Blocks are split
+    further by name shape (markers and number of distinctive words), which
+    any match must share. Within a block,
+    two records are the same tournament when their date ranges overlap
+    (within `date_tolerance` days) and their names agree (see
+    name_similarity) to at least `threshold`.
+
+    When a connection is given, existing rows for each block are loaded on
+    first use, so new records merge into what is already stored. Merged
+    records keep the canonical name_key and start_date (so the upsert hits
+    the stored row) and the union of their sources.
+    """
+
+    max_block_months = 12
+
+    def __init__(self, conn=None, threshold=0.85, date_tolerance=3):
+        self.conn = conn
+        self.threshold = threshold
+        self.date_tolerance = timedelta(days=date_tolerance)
+        self._blocks = defaultdict(list)
+        self._loaded = set()
+        self._indexed = set()
+        self.merged_count = 0
+
+    def deduplicate(self, sport, tournaments):
+        """Merge a batch into the index and return one record per tournament"""
+        results = {}
+        for tournament in tournaments:
+            record = self.add(sport, tournament)
+            results[id(record)] = record
+        return list(results.values())
+
+    def add(self, sport, tournament):
+        """Add a tournament, returning the canonical (possibly merged) record"""
+        record = dict(tournament)
+        record['sources'] = list(record.get('sources') or [])
+        record.setdefault('name_key', normalize_name(record.get('name')))
+
+        start = _parse(record.get('start_date'))
+        if start is None:
+            return record
+        end = max(_parse(record.get('end_date')) or start, start)
+        signature = name_signature(name_tokens(record.get('name')))
+
+        blocks = self._block_keys(sport, start - self.date_tolerance, end + self.date_tolerance)
+        for block in blocks:
+            self._load_block(sport, block)
+
+        match = self._find_match(blocks, signature, start, end)
+        if match is not None:
+            self._merge_into(match, record)
+            self.merged_count += 1
+            return match.record
+
+        self._index(sport, _Entry(record, signature, start, end), blocks)
+        return record
+
+    def _block_keys(self, sport, start, end):
+        keys = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month) and len(keys) < self.max_block_months:
+            keys.append((sport, year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return keys
+
+    def _find_match(self, blocks, signature, start, end):
+        # An entry listed in several of the blocks is simply scored again
+        best, best_score = None, self.threshold
+        shape = _shape(signature)
+        for block in blocks:
+            for entry in self._blocks.get((block, shape), ()):
+                if entry.start > end + self.date_tolerance or start > entry.end + self.date_tolerance:
+                    continue
+                score = name_similarity(signature, entry.signature)
+                if score >= best_score:
+                    best, best_score = entry, score
+        return best
+
+    def _merge_into(self, entry, record):
+        canonical = entry.record
+        # Keep the more specific name for display; identity stays canonical
+        if len(record.get('name') or '') > len(canonical.get('name') or ''):
+            canonical['name'] = record['name']
+            entry.signature = name_signature(name_tokens(record['name']))
+        for field, value in record.items():
+            if field in ('name', 'name_key', 'start_date', 'sources'):
+                continue
+            if value and not canonical.get(field):
+                canonical[field] = value
+        for source in record['sources']:
+            if source not in canonical['sources']:
+                canonical['sources'].append(source)
+
+    def _load_block(self, sport, block):
+        """Index stored rows of this sport running during the block's month"""
+        if self.conn is None or block in self._loaded:
+            return
+        self._loaded.add(block)
+
+        _, year, month = block
+        month_start = date(year, month, 1)
+        next_month = date(year + (month == 12), month % 12 + 1, 1)
+        # Rows starting up to two months earlier can still be running
+        rows = self.conn.execute('''
+            SELECT name, level, start_date, end_date, official_url, streaming_links,
+                   image_url, summary, location, name_key, sources
+            FROM tournaments
+            WHERE sport = ? AND start_date >= ? AND start_date < ?
+        ''', (sport, str(month_start - timedelta(days=62)), str(next_month))).fetchall()
+
+        for row in rows:
+            record = dict(zip(
+                ['name', 'level', 'start_date', 'end_date', 'official_url', 'streaming_links',
+                 'image_url', 'summary', 'location', 'name_key', 'sources'], row
+            ))
+            start = _parse(record['start_date'])
+            if start is None:
+                continue
+            end = max(_parse(record['end_date']) or start, start)
+            if end + self.date_tolerance < month_start:
+                continue
+            # A stored row may already be indexed via a neighbouring block
+            if (sport, record['name_key'], record['start_date']) in self._indexed:
+                continue
+            record['sources'] = json.loads(record['sources']) if record['sources'] else []
+            entry = _Entry(record, name_signature(name_tokens(record['name'])), start, end)
+            self._index(sport, entry, self._block_keys(sport, start - self.date_tolerance,
+                                                       end + self.date_tolerance))
+
+    def _index(self, sport, entry, blocks):
+        self._indexed.add((sport, entry.record.get('name_key'), entry.record.get('start_date')))
+        shape = _shape(entry.signature)
+        for block in blocks:
+            self._blocks[(block, shape)].append(entry)
@@ -0,0 +1,51 @@
+import re
+
+# html_cleaner output: one line per row/list item/block, '## ' before headings.
+# A page can be split before a heading or at a blank line without cutting a record in half
+SECTION_START = re.compile(r'\n\s*\n|\n(?=## )')
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Rough token count for budget decisions (~4 characters per token)"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_blocks(text):
+    """Split cleaned page content into sections (a heading and the lines under it)"""
+    return [section.strip('\n') for section in SECTION_START.split(text) if section.strip()]
+
+
+def chunk_text(text, max_tokens=1500):
+    """Pack sections of cleaned text into windows of at most max_tokens each
+
+    Sections are kept whole where possible. A section larger than the
+    budget is packed line by line, and a single line larger than the
+    budget is cut into fixed-size pieces.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_len = 0
+
+    def add(piece):
+        nonlocal current, current_len
+        if current and current_len + len(piece) + 1 > max_chars:
+            chunks.append('\n'.join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 1
+
+    for section in split_blocks(text):
+        if len(section) <= max_chars:
+            add(section)
+            continue
+        for line in section.split('\n'):
+            for i in range(0, len(line), max_chars):
+                add(line[i:i + max_chars])
+
+    if current:
+        chunks.append('\n'.join(current))
+
+    return [chunk for chunk in chunks if chunk.strip()]
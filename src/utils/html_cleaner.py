@@ -0,0 +1,81 @@
+import re
+import lxml.html
+from lxml import etree
+
+# Subtrees that never carry tournament data
+DROP_TAGS = {
+    'script', 'style', 'noscript', 'template', 'nav', 'footer', 'svg',
+    'iframe', 'form', 'button', 'select', 'canvas', 'object', 'head',
+}
+# Elements that end a line of output
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'aside', 'header', 'table',
+    'thead', 'tbody', 'tfoot', 'tr', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'br', 'caption', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+}
+CELL_TAGS = {'td', 'th'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+SPACES = re.compile(r'[ \t\r\f\v\xa0]+')
+
+
+def parse_html(content):
+    """Parse raw HTML (bytes or str) with lxml's C parser"""
+    if not content or not content.strip():
+        return lxml.html.fromstring('<html></html>')
+    try:
+        return lxml.html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        # str with an XML encoding declaration, or nothing parseable
+        if isinstance(content, str):
+            return lxml.html.fromstring(content.encode('utf-8'))
+        return lxml.html.fromstring('<html></html>')
+
+
+def clean_document(doc):
+    """Compact, structure-preserving text of a parsed page in a single pass
+
+    Walks the tree once, skipping comments and script/style/nav/footer/...
+    subtrees without mutating the document (structured-data extraction still needs
+    the scripts). Table cells are joined with ' | ', rows, list items and
+    blocks become lines, headings are marked with '##'.
+    """
+    parts = []
+    walker = etree.iterwalk(doc, events=('start', 'end', 'comment', 'pi'))
+    for event, element in walker:
+        if event in ('comment', 'pi'):
+            if element.tail:
+                parts.append(element.tail)
+            continue
+
+        tag = element.tag if isinstance(element.tag, str) else None
+        # Dropped subtrees keep only their tail
+        dropped = tag is None or tag in DROP_TAGS
+
+        if event == 'start':
+            if dropped:
+                walker.skip_subtree()
+                continue
+            if tag in HEADING_TAGS:
+                parts.append('\n## ')
+            elif tag == 'li':
+                parts.append('\n- ')
+            if element.text:
+                parts.append(element.text)
+        else:
+            if tag in CELL_TAGS:
+                parts.append(' | ')
+            elif tag in BLOCK_TAGS and not dropped:
+                parts.append('\n')
+            if element.tail:
+                parts.append(element.tail)
+
+    lines = (SPACES.sub(' ', line).strip(' |') for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line.strip('-# '))
+
+
+def clean_html_content(html_content):
+    """Clean raw HTML (bytes/str) or an already parsed lxml document"""
+    if isinstance(html_content, (str, bytes)):
+        html_content = parse_html(html_content)
+    return clean_document(html_content)
@@ -0,0 +1,96 @@
+import sqlite3
+import hashlib
+import threading
+import time
+import os
+
+
+class LLMCache:
+    """Persistent, content-addressed cache of raw LLM extraction responses
+
+    Entries are keyed on a hash of everything that determines the LLM output
+    (model, prompt template version, sport, source URL and cleaned HTML), so an
+    unchanged page never triggers a second LLM call. Entries expire after
+    `ttl` seconds and the least recently used ones are evicted once the cache
+    holds more than `max_entries` rows.
+    """
+
+    def __init__(self, db_path='data/llm_cache.db', ttl=7 * 24 * 3600, max_entries=5000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the given parts into a cache key"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self.conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute('UPDATE llm_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, response):
+        """Store a response and evict expired / least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, response, created_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+            ''', (key, response, now, now))
+            self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now):
+        self.conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl,))
+        self.conn.execute('''
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache
+                ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self.conn.execute('DELETE FROM llm_cache')
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -2,54 +2,215 @@ import requests
 import json
 import re
 from datetime import datetime
-import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from .llm_cache import LLMCache
+from .html_chunker import chunk_text, estimate_tokens
+from .html_cleaner import clean_html_content
+from .content_pruner import prune_content
+from .tournament_utils import merge_tournaments
+from .connection_health import ConnectionHealth
+from .rate_limiter import RateLimiter
+from .metrics import metrics
 
 class GroqExtractor:
-    def __init__(self, api_key, model="llama3-70b-8192"):
+    # Bump whenever create_extraction_prompt or the system prompt changes,
+    # so cached responses produced by the old prompt are no longer reused
+    PROMPT_VERSION = 2
+    
+    # Chunked extraction: long pages are split into token-budgeted windows
+    chunk_tokens = 1500          # input budget per LLM request
+    max_chunks = 8               # bounds LLM calls (and wall-clock) per page
+    max_concurrent_chunks = 3    # chunk requests in flight for one page
+    
+    # Batched extraction: small pages share one request, each tagged with its URL
+    batch_tokens = 1500          # input budget for all pages of one batch
+    small_page_tokens = 400      # pages up to this size are batched
+    
+    # Relevance pruning: only page blocks with tournament signals are sent
+    prune = True
+    prune_tokens = 6000          # input budget per page after pruning
+    
+    max_tokens = 2000            # completion budget per request
+    request_timeout = (5, 60)    # (connect, read) seconds per Groq request
+    rate_limit_retries = 3       # 429s retried (after retry-after) before giving up
+    
+    def __init__(self, api_key, model="llama3-70b-8192", cache=None, health_ttl=600, limiter=None):
         """
         Initialize Groq extractor
         
         Args:
             api_key: Your Groq API key from console.groq.com
             model: Model to use (llama3-70b-8192, llama3-8b-8192, mixtral-8x7b-32768)
+            cache: LLMCache for extraction responses (default: data/llm_cache.db, False to disable)
+            health_ttl: Seconds a successful connection check is trusted before re-probing
+            limiter: RateLimiter shared by every extractor/process using the model
+                (default: data/rate_limit.db, starting from the free tier's 30 RPM / 6000 TPM)
         """
         self.api_key = api_key
         self.model = model
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         
-        # Rate limiting (adjust based on your free tier limits)
-        self.last_request_time = 0
-        self.min_request_interval = 1  # 1 second between requests
+        if cache is None:
+            cache = LLMCache()
+        self.cache = cache or None
+        
+        # Connection checked once and remembered, not probed before every extraction
+        self.health = ConnectionHealth(self.test_connection, ttl=health_ttl)
+        
+        # Request/token buckets shared across threads and processes, kept in
+        # sync with Groq's x-ratelimit-* headers
+        self.limiter = limiter or RateLimiter(f"groq:{model}")
+        
+        # Failed LLM requests and unparseable responses, so callers can tell
+        # "no tournaments" from "extraction failed"
+        self.errors = 0
+        self.url_errors = defaultdict(int)
+        self._errors_lock = threading.Lock()
         
     def extract_tournaments_from_html(self, html_content, sport, source_url):
         """Extract tournament data from HTML using Groq API"""
         
+        # Clean HTML for better processing
+        cleaned_html = self.prune_page(self.clean_html(html_content), sport, source_url)
+        return self.extract_tournaments_from_text(cleaned_html, sport, source_url)
+    
+    def extract_tournaments_from_text(self, cleaned_html, sport, source_url):
+        """Extract tournament data from already cleaned page content
         
-        # testing connextion
-        test = self.test_connection()
-        if test is False:
-            raise ConnectionError("❌ Could not connect to Groq API")
+        The cleaned page is split into chunks on structural boundaries and the
+        chunks are extracted concurrently (still within the rate limit), then
+        merged and deduplicated. Nothing is sent for an empty page.
+        """
+        chunks = chunk_text(cleaned_html, self.chunk_tokens)
+        if not chunks:
             return []
+        if len(chunks) > self.max_chunks:
+            print(f"⚠️ {source_url} has {len(chunks)} chunks, extracting the first {self.max_chunks}")
+            chunks = chunks[:self.max_chunks]
         
-        # Clean HTML for better processing
-        cleaned_html = self.clean_html(html_content)
+        if len(chunks) <= 1:
+            return self.extract_from_chunk(chunks[0] if chunks else '', sport, source_url)
+        
+        workers = min(self.max_concurrent_chunks, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                lambda chunk: self.extract_from_chunk(chunk, sport, source_url), chunks
+            ))
+        
+        tournaments = merge_tournaments(t for chunk_tournaments in results for t in chunk_tournaments)
+        print(f"🧩 Merged {len(tournaments)} tournaments from {len(chunks)} chunks of {source_url}")
+        return tournaments
+    
+    def extract_from_chunk(self, cleaned_html, sport, source_url):
+        """Extract tournaments from one cleaned chunk of a page"""
+        
+        # Identical content was already extracted - reuse the stored response
+        cache_key = self.cache_key(cleaned_html, sport, source_url)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            metrics.inc('llm_cache_total', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                tournaments = self.parse_llm_response(cached) or []
+                print(f"💾 Cache hit: {len(tournaments)} tournaments from {source_url}")
+                return tournaments
+        
+        if not self.health.is_available():
+            raise ConnectionError("❌ Could not connect to Groq API")
         
         # Create extraction prompt
         prompt = self.create_extraction_prompt(cleaned_html, sport, source_url)
         
         try:
-            # Rate limiting
-            self.rate_limit()
-            
             response = self.query_groq(prompt)
-            tournaments = self.parse_llm_response(response)
-            
-            print(f"✅ Extracted {len(tournaments)} tournaments from {source_url}")
-            return tournaments
-            
         except Exception as e:
+            self.health.record_failure()
+            metrics.inc('llm_errors_total')
+            with self._errors_lock:
+                self.errors += 1
+                self.url_errors[source_url] += 1
             print(f"❌ Groq extraction error for {source_url}: {e}")
             return []
+        
+        self.health.record_success()
+        tournaments = self.parse_llm_response(response)
+        if tournaments is None:
+            # A failed extraction, not an empty page: the source is retried next run
+            with self._errors_lock:
+                self.errors += 1
+                self.url_errors[source_url] += 1
+            return []
+        # Only usable responses are cached: a truncated one is retried next run
+        if self.cache:
+            self.cache.set(cache_key, response)
+        
+        print(f"✅ Extracted {len(tournaments)} tournaments from {source_url}")
+        return tournaments
+    
+    def extract_batch(self, pages, sport):
+        """Extract tournaments from several small cleaned pages in one request
+        
+        pages is a list of (source_url, cleaned) pairs. Returns a dict
+        source_url -> tournaments. Cached pages are answered from the cache,
+        and the rest share one prompt in which every page is numbered. The
+        response is split back per page, and each page's part is cached under
+        the same key as a single-page extraction. If the batched response
+        can't be parsed, the pages are extracted one by one.
+        """
+        results, pending = {}, []
+        for source_url, cleaned in pages:
+            cached = self.cache.get(self.cache_key(cleaned, sport, source_url)) if self.cache else None
+            if self.cache:
+                metrics.inc('llm_cache_total', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                results[source_url] = self.parse_llm_response(cached) or []
+                print(f"💾 Cache hit: {len(results[source_url])} tournaments from {source_url}")
+            else:
+                pending.append((source_url, cleaned))
+        
+        if len(pending) <= 1:
+            for source_url, cleaned in pending:
+                results[source_url] = self.extract_from_chunk(cleaned, sport, source_url)
+            return results
+        
+        if not self.health.is_available():
+            raise ConnectionError("❌ Could not connect to Groq API")
+        
+        prompt = self.create_batch_prompt(pending, sport)
+        try:
+            response = self.query_groq(prompt)
+        except Exception as e:
+            self.health.record_failure()
+            metrics.inc('llm_errors_total')
+            with self._errors_lock:
+                self.errors += 1
+                for source_url, _ in pending:
+                    self.url_errors[source_url] += 1
+            print(f"❌ Groq batch extraction error for {len(pending)} pages: {e}")
+            return {**results, **{source_url: [] for source_url, _ in pending}}
+        
+        self.health.record_success()
+        split = self.parse_batch_response(response, [source_url for source_url, _ in pending])
+        if split is None:
+            print(f"⚠️ Unusable batch response, extracting {len(pending)} pages one by one")
+            for source_url, cleaned in pending:
+                results[source_url] = self.extract_from_chunk(cleaned, sport, source_url)
+            return results
+        
+        metrics.inc('llm_batched_pages_total', len(pending))
+        print(f"📦 Batched {len(pending)} pages into one request")
+        for source_url, cleaned in pending:
+            tournaments = split[source_url]
+            if self.cache:
+                self.cache.set(self.cache_key(cleaned, sport, source_url), json.dumps(tournaments))
+            results[source_url] = tournaments
+            print(f"✅ Extracted {len(tournaments)} tournaments from {source_url}")
+        return results
+    
+    def cache_key(self, cleaned_html, sport, source_url):
+        """Content-addressed key for an extraction request"""
+        return LLMCache.make_key(self.model, self.PROMPT_VERSION, sport, source_url, cleaned_html)
     
     def query_groq(self, prompt):
         """Send query to Groq API"""
@@ -71,12 +232,35 @@ class GroqExtractor:
             ],
             "model": self.model,
             "temperature": 0.1,
-            "max_tokens": 2000,
+            "max_tokens": self.max_tokens,
             "top_p": 1,
             "stream": False
         }
         
-        response = requests.post(self.base_url, json=payload, headers=headers)
+        # Reserve prompt + full completion budget; the unused part is given back
+        reserved = estimate_tokens(payload['messages'][0]['content'] + prompt) + self.max_tokens
+        
+        for attempt in range(self.rate_limit_retries + 1):
+            # Rate limiting
+            self.rate_limit(reserved)
+            
+            with metrics.timer('llm_request_seconds', model=self.model):
+                response = requests.post(self.base_url, json=payload, headers=headers,
+                                         timeout=self.request_timeout)
+            metrics.inc('llm_requests_total', status=response.status_code)
+            used = None
+            if response.ok:
+                usage = response.json().get('usage', {})
+                used = usage.get('total_tokens')
+                metrics.inc('llm_tokens_total', usage.get('prompt_tokens', 0), kind='prompt')
+                metrics.inc('llm_tokens_total', usage.get('completion_tokens', 0), kind='completion')
+            wait = self.limiter.update(response.headers, response.status_code, reserved, used)
+            
+            if response.status_code == 429 and attempt < self.rate_limit_retries:
+                print(f"🚦 Groq rate limit hit, retrying after {wait:.1f}s")
+                continue
+            break
+        
         response.raise_for_status()
         
         result = response.json()
@@ -84,20 +268,31 @@ class GroqExtractor:
         return content
     
     def clean_html(self, html_content):
-        """Clean HTML content for better processing"""
-        # Remove scripts, styles, comments
-        html_content = re.sub(r'<script.*?</script>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<style.*?</style>', '', html_content, flags=re.DOTALL)
-        html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
-        
-        # Remove excessive whitespace
-        html_content = re.sub(r'\s+', ' ', html_content)
+        """Clean HTML content for better processing
         
-        # Limit size for API token limits
-        if len(html_content) > 6000:
-            html_content = html_content[:6000] + "..."
+        Single lxml pass (see html_cleaner): drops scripts, styles, comments,
+        navigation and footers and keeps table/list/heading structure as
+        compact text. Accepts raw HTML or an already parsed lxml document.
+        No truncation here - extract_tournaments_from_text chunks long pages.
+        """
+        return clean_html_content(html_content)
+    
+    def prune_page(self, cleaned_html, sport, source_url):
+        """Relevant blocks of a cleaned page, within prune_tokens (see content_pruner)
         
-        return html_content.strip()
+        Navigation leftovers, ads, comments and filler sentences are dropped,
+        so the prompt holds the fixture tables and event lines. An empty
+        result means the page has nothing worth extracting.
+        """
+        if not self.prune:
+            return cleaned_html
+        pruned = prune_content(cleaned_html, sport, self.prune_tokens)
+        before, after = estimate_tokens(cleaned_html), estimate_tokens(pruned)
+        metrics.inc('llm_page_tokens_total', before, content='cleaned')
+        metrics.inc('llm_page_tokens_total', after, content='pruned')
+        if after < before:
+            print(f"✂️ Pruned {source_url}: {before} -> {after} tokens")
+        return pruned
     
     def create_extraction_prompt(self, html_content, sport, source_url):
         """Create extraction prompt for Groq"""
@@ -105,7 +300,7 @@ class GroqExtractor:
         current_date = datetime.now().strftime("%Y-%m-%d")
         
         prompt = f"""
-EXTRACT UPCOMING {sport.upper()} TOURNAMENTS from this HTML content.
+EXTRACT UPCOMING {sport.upper()} TOURNAMENTS from this web page content.
 
 STRICT RULES:
 1. Only extract tournaments starting AFTER {current_date}
@@ -113,7 +308,7 @@ STRICT RULES:
 3. Return ONLY valid JSON array
 4. If no tournaments found, return []
 
-HTML CONTENT:
+PAGE CONTENT (table cells separated by |):
 {html_content}
 
 REQUIRED JSON FORMAT:
@@ -131,12 +326,54 @@ REQUIRED JSON FORMAT:
   }}
 ]
 
+EXTRACT JSON ARRAY:"""
+        
+        return prompt
+    
+    def create_batch_prompt(self, pages, sport):
+        """Extraction prompt for several pages, each numbered and tagged with its URL"""
+        
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        sections = "\n\n".join(
+            f"=== PAGE {number}: {source_url} ===\n{cleaned}"
+            for number, (source_url, cleaned) in enumerate(pages, 1)
+        )
+        
+        prompt = f"""
+EXTRACT UPCOMING {sport.upper()} TOURNAMENTS from each of these {len(pages)} web pages.
+
+STRICT RULES:
+1. Only extract tournaments starting AFTER {current_date}
+2. Classify level precisely: International, National, State, Regional, College, School, Club, Corporate, District
+3. Set "page" to the number of the page the tournament was found on
+4. Return ONLY one valid JSON array covering all pages
+5. If no tournaments found, return []
+
+PAGES (table cells separated by |):
+{sections}
+
+REQUIRED JSON FORMAT:
+[
+  {{
+    "page": 1,
+    "name": "Tournament Name",
+    "level": "International",
+    "start_date": "YYYY-MM-DD",
+    "end_date": "YYYY-MM-DD", 
+    "official_url": "URL of its page",
+    "streaming_links": "Platform1, Platform2",
+    "image_url": "",
+    "summary": "Brief description max 50 words",
+    "location": "City, Country"
+  }}
+]
+
 EXTRACT JSON ARRAY:"""
         
         return prompt
     
     def parse_llm_response(self, response_text):
-        """Parse LLM JSON response"""
+        """Parse LLM JSON response into valid tournaments, or None if it isn't a JSON array"""
         try:
             # Clean response - remove any text before/after JSON
             response_text = response_text.strip()
@@ -155,16 +392,45 @@ EXTRACT JSON ARRAY:"""
                 
                 return valid_tournaments
             else:
+                metrics.inc('llm_parse_failures_total', reason='no_json')
                 print("⚠️ No JSON array found in response")
-                return []
+                return None
                 
         except json.JSONDecodeError as e:
+            metrics.inc('llm_parse_failures_total', reason='invalid_json')
             print(f"❌ JSON parsing error: {e}")
             print(f"Response was: {response_text[:200]}...")
-            return []
+            return None
         except Exception as e:
+            metrics.inc('llm_parse_failures_total', reason='error')
             print(f"❌ Response parsing error: {e}")
-            return []
+            return None
+    
+    def parse_batch_response(self, response_text, source_urls):
+        """Split a batched response into source_url -> tournaments, or None if unparseable"""
+        json_match = re.search(r'\[.*\]', response_text.strip(), re.DOTALL)
+        try:
+            tournaments = json.loads(json_match.group(0)) if json_match else None
+        except json.JSONDecodeError:
+            tournaments = None
+        if not isinstance(tournaments, list):
+            metrics.inc('llm_parse_failures_total', reason='batch')
+            return None
+        
+        split = {source_url: [] for source_url in source_urls}
+        for tournament in tournaments:
+            if not isinstance(tournament, dict):
+                continue
+            try:
+                source_url = source_urls[int(tournament.pop('page')) - 1]
+            except (KeyError, TypeError, ValueError, IndexError):
+                print(f"⚠️ Dropping batched tournament without a valid page: {tournament.get('name')}")
+                continue
+            if not tournament.get('official_url') or tournament['official_url'] == 'URL of its page':
+                tournament['official_url'] = source_url
+            if self.validate_tournament(tournament):
+                split[source_url].append(tournament)
+        return split
     
     def validate_tournament(self, tournament):
         """Validate tournament data"""
@@ -196,17 +462,9 @@ EXTRACT JSON ARRAY:"""
         
         return True
     
-    def rate_limit(self):
-        """Simple rate limiting to respect free tier limits"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            print(f"⏳ Rate limiting: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    def rate_limit(self, tokens=0):
+        """Wait for a request slot and `tokens` tokens in the shared budget"""
+        self.limiter.acquire(tokens)
     
     def test_connection(self):
         """Test Groq API connection"""
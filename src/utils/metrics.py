@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; covers cached API hits (ms) up to slow LLM calls (tens of seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HELP = {
+    'scraper_fetch_seconds': 'Page fetch time per source URL',
+    'scraper_fetch_bytes': 'Downloaded page size per source URL',
+    'scraper_fetch_total': 'Page fetches by outcome',
+    'scraper_clean_seconds': 'HTML cleaning time per page',
+    'pipeline_stage_seconds': 'Time spent per item in each scrape pipeline stage',
+    'llm_request_seconds': 'Groq request latency',
+    'llm_tokens_total': 'Tokens reported by Groq usage',
+    'llm_cache_total': 'LLM response cache lookups by result',
+    'llm_requests_total': 'Groq requests by HTTP status',
+    'llm_parse_failures_total': 'LLM responses without parseable JSON',
+    'llm_errors_total': 'Chunk extractions that failed after retries',
+    'llm_page_tokens_total': 'Estimated page tokens before (cleaned) and after relevance pruning (pruned)',
+    'llm_batched_pages_total': 'Pages extracted as part of a multi-page request',
+    'db_write_seconds': 'Batched tournament upsert time',
+    'db_rows_written_total': 'Tournament rows sent to the database',
+    'db_rows_changed_total': 'Tournament rows inserted or updated',
+    'scheduler_checks_total': 'Scheduled source checks by outcome',
+    'scheduler_deferred_total': 'Due sources deferred to a later cycle by the budget',
+    'api_request_seconds': 'API handler latency',
+    'api_cache_total': 'API response cache lookups by result',
+    'api_db_connections_total': 'Read-only SQLite connections opened by the API connection pool',
+}
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """In-process counters and histograms, rendered in Prometheus text format
+
+    Metrics are keyed by name plus a sorted tuple of label pairs. When the
+    registry is disabled, every call returns after a single attribute check.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the duration of the with-block (also when it raises)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def state(self):
+        """Counters and histograms as plain JSON-able data, see merge()"""
+        with self._lock:
+            return {
+                'counters': [[name, labels, value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, labels, histogram.buckets, histogram.counts, histogram.sum, histogram.count]
+                               for (name, labels), histogram in self._histograms.items()],
+            }
+
+    def merge(self, state):
+        """Add the counters and histograms of another registry's state()"""
+        with self._lock:
+            for name, labels, value in state['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, buckets, counts, total, count in state['histograms']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(tuple(buckets))
+                histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                histogram.sum += total
+                histogram.count += count
+
+    def write_state(self, directory):
+        """Write state() to directory/<pid>.json for another process to merge (see merged_registry)"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.state(), f)
+        os.replace(tmp, path)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            lines, described = [], set()
+
+            def describe(name, kind):
+                if name not in described:
+                    described.add(name)
+                    if name in HELP:
+                        lines.append(f"# HELP {name} {HELP[name]}")
+                    lines.append(f"# TYPE {name} {kind}")
+
+            for (name, labels), value in counters:
+                describe(name, 'counter')
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+            for (name, labels), histogram in histograms:
+                describe(name, 'histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Write the current metrics for the API's /metrics (or a node_exporter textfile collector)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def show_summary(self):
+        """End-of-run summary: histograms aggregated over labels, then counters"""
+        if not self.enabled:
+            return
+        with self._lock:
+            totals = {}
+            for (name, _), histogram in self._histograms.items():
+                merged = totals.setdefault(name, Histogram(histogram.buckets))
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.sum += histogram.sum
+                merged.count += histogram.count
+            counters = {}
+            for (name, labels), value in self._counters.items():
+                label = ','.join(f"{k}={v}" for k, v in labels)
+                counters[f"{name}{{{label}}}" if label else name] = value
+
+        print("\n📏 METRICS:")
+        for name, histogram in sorted(totals.items()):
+            average = histogram.sum / histogram.count if histogram.count else 0.0
+            print(f"  {name}: {histogram.count} obs, avg {average:.3f}, "
+                  f"p50 ≤ {histogram.quantile(0.5):g}, p95 ≤ {histogram.quantile(0.95):g}")
+        for name, value in sorted(counters.items()):
+            print(f"  {name}: {_number(value)}")
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def merged_registry(directory):
+    """One registry summing the state files (*.json) that processes wrote to directory
+
+    Files of processes that have exited stay, so counters never go back.
+    """
+    merged = MetricsRegistry()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                merged.merge(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return merged
+
+
+# Process-wide registry; METRICS_ENABLED=0 turns instrumentation into no-ops
+metrics = MetricsRegistry(enabled=os.getenv('METRICS_ENABLED', '1') != '0')
@@ -0,0 +1,199 @@
+import sqlite3
+import threading
+import time
+import re
+import os
+
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def parse_duration(value):
+    """Seconds from a rate-limit reset value ('7.66s', '2m59.56s', '120ms', '30')"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket on requests and LLM tokens, shared through SQLite
+
+    Both buckets live in one row of a small SQLite database, and every
+    acquire() runs in a BEGIN IMMEDIATE transaction, so all threads and all
+    processes that use the same db_path and name draw from one budget.
+    The buckets start from the configured per-minute limits. After that,
+    update() corrects them from the provider's x-ratelimit-* headers (token
+    limit, remaining and reset; remaining daily requests). A 429 empties
+    the buckets and blocks every caller until retry-after has passed.
+    """
+
+    def __init__(self, name, db_path='data/rate_limit.db', requests_per_minute=30,
+                 tokens_per_minute=6000, backoff=2.0, max_backoff=60.0, poll_interval=0.5):
+        self.name = name
+        self.poll_interval = poll_interval
+        self.db_path = db_path
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                name TEXT PRIMARY KEY,
+                request_capacity REAL NOT NULL,
+                request_rate REAL NOT NULL,
+                requests REAL NOT NULL,
+                token_capacity REAL NOT NULL,
+                token_rate REAL NOT NULL,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL DEFAULT 0,
+                consecutive_429 INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self.conn.execute('''
+            INSERT OR IGNORE INTO rate_buckets
+                (name, request_capacity, request_rate, requests, token_capacity, token_rate, tokens, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (name, requests_per_minute, requests_per_minute / 60.0, requests_per_minute,
+              tokens_per_minute, tokens_per_minute / 60.0, tokens_per_minute, time.time()))
+
+    def _transaction(self, update):
+        """Run update(state, now) on the refilled bucket row under an exclusive lock"""
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self.conn.execute('''
+                    SELECT request_capacity, request_rate, requests, token_capacity, token_rate,
+                           tokens, updated_at, blocked_until, consecutive_429
+                    FROM rate_buckets WHERE name = ?
+                ''', (self.name,)).fetchone()
+                state = dict(zip(('request_capacity', 'request_rate', 'requests', 'token_capacity',
+                                  'token_rate', 'tokens', 'updated_at', 'blocked_until',
+                                  'consecutive_429'), row))
+
+                now = time.time()
+                elapsed = max(0.0, now - state['updated_at'])
+                state['requests'] = min(state['request_capacity'],
+                                        state['requests'] + elapsed * state['request_rate'])
+                state['tokens'] = min(state['token_capacity'],
+                                      state['tokens'] + elapsed * state['token_rate'])
+                state['updated_at'] = now
+
+                result = update(state, now)
+
+                self.conn.execute('''
+                    UPDATE rate_buckets SET request_capacity = ?, request_rate = ?, requests = ?,
+                        token_capacity = ?, token_rate = ?, tokens = ?, updated_at = ?,
+                        blocked_until = ?, consecutive_429 = ?
+                    WHERE name = ?
+                ''', (state['request_capacity'], state['request_rate'], state['requests'],
+                      state['token_capacity'], state['token_rate'], state['tokens'],
+                      state['updated_at'], state['blocked_until'], state['consecutive_429'], self.name))
+                self.conn.execute('COMMIT')
+                return result
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def acquire(self, tokens=0):
+        """Block until one request and `tokens` tokens are available, then take them"""
+        def take(state, now):
+            if state['blocked_until'] > now:
+                return state['blocked_until'] - now
+            # A single request may need more than a full bucket; let it through once full
+            needed_tokens = min(tokens, state['token_capacity'])
+            waits = []
+            if state['requests'] < 1:
+                waits.append((1 - state['requests']) / state['request_rate'] if state['request_rate'] else 1.0)
+            if state['tokens'] < needed_tokens:
+                waits.append((needed_tokens - state['tokens']) / state['token_rate'] if state['token_rate'] else 1.0)
+            if waits:
+                return max(waits)
+            state['requests'] -= 1
+            state['tokens'] -= tokens
+            return 0
+
+        announced = False
+        while True:
+            wait = self._transaction(take)
+            if wait <= 0:
+                return
+            if not announced:
+                print(f"⏳ Rate limiting: waiting up to {min(wait, self.max_backoff):.1f}s")
+                announced = True
+            # Sleep in short slices so header updates from other workers take effect
+            wait = min(wait, self.poll_interval)
+            self.waited += wait
+            time.sleep(wait)
+
+    def update(self, headers, status=200, reserved_tokens=0, used_tokens=None):
+        """Correct the buckets from a response
+
+        used_tokens (from the response body's usage) gives back what was
+        reserved but not spent; a non-2xx response gives all of it back.
+        After that, the provider's remaining/limit/reset headers win. A 429
+        blocks callers for retry-after seconds, or for an exponential backoff
+        when the header is missing.
+        """
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+        # A rejected or failed request (429, 5xx) consumed nothing
+        spent = used_tokens if 200 <= status < 300 else 0
+
+        def correct(state, now):
+            if spent is not None and reserved_tokens:
+                state['tokens'] = min(state['token_capacity'], state['tokens'] + reserved_tokens - spent)
+
+            # Groq's request headers describe the daily budget (RPD): they can
+            # only lower what is left, the per-minute request bucket stays as configured
+            remaining = _number(headers.get('x-ratelimit-remaining-requests'))
+            if remaining is not None:
+                state['requests'] = min(state['requests'], remaining)
+
+            # Token headers describe the per-minute budget (TPM)
+            limit = _number(headers.get('x-ratelimit-limit-tokens'))
+            remaining = _number(headers.get('x-ratelimit-remaining-tokens'))
+            reset = parse_duration(headers.get('x-ratelimit-reset-tokens'))
+            if limit:
+                state['token_capacity'] = limit
+                state['token_rate'] = limit / 60.0
+            if remaining is not None:
+                state['tokens'] = min(state['tokens'], remaining)
+                # Refill at least fast enough to be back at the limit when it resets
+                if limit and reset and remaining < limit:
+                    state['token_rate'] = max(state['token_rate'], (limit - remaining) / reset)
+
+            if status == 429:
+                state['consecutive_429'] += 1
+                retry_after = parse_duration(headers.get('retry-after'))
+                if retry_after is None:
+                    retry_after = min(self.max_backoff, self.backoff * 2 ** (state['consecutive_429'] - 1))
+                state['blocked_until'] = max(state['blocked_until'], now + retry_after)
+                state['requests'] = 0
+                return retry_after
+            state['consecutive_429'] = 0
+            return 0
+
+        return self._transaction(correct)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,265 @@
+import json
+import re
+from datetime import datetime
+from dateutil import parser as date_parser
+
+# schema.org types we treat as tournaments
+EVENT_TYPES = ('SportsEvent', 'Event', 'EventSeries')
+
+# First matching keyword decides the level; checked in order
+LEVEL_KEYWORDS = [
+    ('International', ['world cup', 'icc', 'fifa', 'uefa', 'fide', 'bwf', 'olympic', 'commonwealth',
+                       'asia cup', 'asian games', 'champions trophy', 'international', 'world championship']),
+    ('School', ['school', 'schools', 'under-14', 'under-16', 'u14', 'u16', 'subroto']),
+    ('College', ['university', 'universities', 'college', 'colleges', 'inter-varsity', 'intervarsity']),
+    ('Corporate', ['corporate']),
+    ('District', ['district']),
+    ('Regional', ['zonal', 'zone', 'regional']),
+    ('State', ['state']),
+    ('Club', ['club', 'clubs', 'academy']),
+    ('National', ['national', 'ipl', 'premier league', 'ranji', 'trophy', 'all india', 'indian']),
+]
+# No keyword: same default as GroqExtractor.validate_tournament
+DEFAULT_LEVEL = 'Club'
+
+# Table header words used to locate columns
+NAME_HEADERS = ('tournament', 'series', 'event', 'competition', 'championship', 'name')
+START_HEADERS = ('start', 'from', 'date', 'dates', 'when')
+END_HEADERS = ('end', 'to', 'until')
+LOCATION_HEADERS = ('venue', 'location', 'city', 'host', 'place')
+DATE_RANGE_SPLIT = re.compile(r'\s+(?:-|–|—|to|until)\s+', re.IGNORECASE)
+
+
+# Whole words only: 'state' must not match "United States", 'icc' "Piccadilly"
+LEVEL_PATTERNS = [
+    (level, re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b'))
+    for level, keywords in LEVEL_KEYWORDS
+]
+
+
+def guess_level(*texts):
+    """Classify competition level from keywords in the name/description"""
+    text = ' '.join(t for t in texts if t).lower()
+    for level, pattern in LEVEL_PATTERNS:
+        if pattern.search(text):
+            return level
+    return DEFAULT_LEVEL
+
+
+def parse_date(value, default_year=None):
+    """Parse a date string into YYYY-MM-DD, or None"""
+    if not value:
+        return None
+    value = str(value).strip()
+    # ISO dates/datetimes are by far the most common in structured data
+    try:
+        return datetime.fromisoformat(value[:10]).strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    try:
+        default = datetime(default_year or datetime.now().year, 1, 1)
+        return date_parser.parse(value, default=default, fuzzy=True).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError):
+        return None
+
+
+def _element_text(element):
+    """Whitespace-normalized text content of an lxml element"""
+    return ' '.join(' '.join(element.itertext()).split())
+
+
+def summarize(text, max_words=50):
+    words = (text or '').split()
+    return ' '.join(words[:max_words])
+
+
+class StructuredExtractor:
+    """Deterministic extraction of tournaments from machine-readable markup
+
+    Looks for schema.org Event/SportsEvent JSON-LD, microdata and fixture
+    tables, producing the same tournament dicts the LLM returns. Pages
+    without any of these return [] and go to the LLM instead.
+    """
+
+    def extract(self, doc, sport, source_url):
+        """Return tournaments found in structured markup of a parsed (lxml) page, [] if none"""
+        for method in (self.from_json_ld, self.from_microdata, self.from_tables):
+            tournaments = method(doc, source_url)
+            if tournaments:
+                return tournaments
+        return []
+
+    # JSON-LD
+
+    def from_json_ld(self, doc, source_url):
+        tournaments = []
+        for script in doc.xpath('//script[@type="application/ld+json"]'):
+            try:
+                data = json.loads(script.text or '')
+            except (json.JSONDecodeError, TypeError):
+                continue
+            for item in self._walk_json_ld(data):
+                tournament = self._event_to_tournament(item, source_url)
+                if tournament:
+                    tournaments.append(tournament)
+        return tournaments
+
+    def _walk_json_ld(self, data):
+        if isinstance(data, list):
+            for item in data:
+                yield from self._walk_json_ld(item)
+        elif isinstance(data, dict):
+            if '@graph' in data:
+                yield from self._walk_json_ld(data['@graph'])
+            types = data.get('@type', [])
+            if isinstance(types, str):
+                types = [types]
+            if any(t in EVENT_TYPES for t in types):
+                yield data
+            # Events nested as sub-events of a series / organization
+            for key in ('subEvent', 'subEvents', 'event', 'events'):
+                if key in data:
+                    yield from self._walk_json_ld(data[key])
+
+    def _event_to_tournament(self, event, source_url):
+        name = self._text(event.get('name'))
+        start_date = parse_date(event.get('startDate'))
+        if not name or not start_date:
+            return None
+
+        summary = summarize(self._text(event.get('description')))
+        return {
+            'name': name,
+            'level': guess_level(name, summary),
+            'start_date': start_date,
+            'end_date': parse_date(event.get('endDate')),
+            'official_url': self._text(event.get('url')) or source_url,
+            'streaming_links': '',
+            'image_url': self._url(event.get('image')),
+            'summary': summary,
+            'location': self._location(event.get('location')),
+        }
+
+    def _text(self, value):
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('@value')
+        return str(value).strip() if value else ''
+
+    def _url(self, value):
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('url') or value.get('contentUrl')
+        return str(value) if value else ''
+
+    def _location(self, value):
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if not isinstance(value, dict):
+            return self._text(value)
+        parts = [value.get('name')]
+        address = value.get('address')
+        if isinstance(address, dict):
+            parts += [address.get('addressLocality'), self._text(address.get('addressCountry'))]
+        elif address:
+            parts.append(address)
+        return ', '.join(str(p) for p in parts if p)
+
+    # Microdata
+
+    def from_microdata(self, doc, source_url):
+        tournaments = []
+        for scope in doc.xpath('//*[@itemscope and @itemtype]'):
+            if scope.get('itemprop') is not None:
+                continue  # nested item, handled by its parent
+            if not any(scope.get('itemtype').rstrip('/').endswith('/' + t) for t in EVENT_TYPES):
+                continue
+            props = self._microdata_props(scope)
+            tournament = self._event_to_tournament(props, source_url)
+            if tournament:
+                tournaments.append(tournament)
+        return tournaments
+
+    def _microdata_props(self, scope):
+        props = {}
+        for element in scope.xpath('.//*[@itemprop]'):
+            # Skip properties belonging to a nested itemscope
+            parent_scope = next(
+                (a for a in element.iterancestors() if a.get('itemscope') is not None), None
+            )
+            if parent_scope is not scope:
+                continue
+            key = element.get('itemprop')
+            if element.get('itemscope') is not None:
+                props[key] = self._microdata_props(element)
+            else:
+                props[key] = (element.get('content') or element.get('datetime') or element.get('href')
+                              or element.get('src') or _element_text(element))
+        return props
+
+    # Tables
+
+    def from_tables(self, doc, source_url):
+        tournaments = []
+        for table in doc.iter('table'):
+            rows = table.xpath('.//tr')
+            if len(rows) < 2:
+                continue
+
+            headers = [_element_text(cell).lower() for cell in rows[0].xpath('./th|./td')]
+            name_col = self._find_column(headers, NAME_HEADERS)
+            start_col = self._find_column(headers, START_HEADERS, exclude=(name_col,))
+            if name_col is None or start_col is None:
+                continue
+            end_col = self._find_column(headers, END_HEADERS, exclude=(name_col, start_col))
+            location_col = self._find_column(headers, LOCATION_HEADERS, exclude=(name_col, start_col))
+
+            for row in rows[1:]:
+                cells = [_element_text(cell) for cell in row.xpath('./td|./th')]
+                if len(cells) <= max(name_col, start_col):
+                    continue
+                name = cells[name_col]
+                start_text = cells[start_col]
+                end_text = cells[end_col] if end_col is not None and end_col < len(cells) else ''
+
+                # "12 Jan - 3 Feb 2027" in a single dates column
+                if not end_text:
+                    parts = DATE_RANGE_SPLIT.split(start_text, maxsplit=1)
+                    if len(parts) == 2:
+                        start_text, end_text = parts
+                        start_text = self._borrow_year(start_text, end_text)
+
+                start_date = parse_date(start_text)
+                if not name or not start_date:
+                    continue
+
+                links = row.xpath('.//a[@href]')
+                href = links[0].get('href') if links else ''
+                tournaments.append({
+                    'name': name,
+                    'level': guess_level(name),
+                    'start_date': start_date,
+                    'end_date': parse_date(end_text),
+                    'official_url': href if href.startswith('http') else source_url,
+                    'streaming_links': '',
+                    'image_url': '',
+                    'summary': '',
+                    'location': cells[location_col] if location_col is not None and location_col < len(cells) else '',
+                })
+        return tournaments
+
+    def _find_column(self, headers, keywords, exclude=()):
+        for index, header in enumerate(headers):
+            words = re.findall(r'[a-z]+', header)
+            if index not in exclude and any(keyword in words for keyword in keywords):
+                return index
+        return None
+
+    def _borrow_year(self, start_text, end_text):
+        """'12 Jan' + '3 Feb 2027' -> '12 Jan 2027'"""
+        if re.search(r'\b\d{4}\b', start_text):
+            return start_text
+        year = re.search(r'\b\d{4}\b', end_text)
+        return f"{start_text} {year.group(0)}" if year else start_text
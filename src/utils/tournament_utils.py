@@ -0,0 +1,58 @@
+import re
+import unicodedata
+
+TOURNAMENT_FIELDS = [
+    'name', 'level', 'start_date', 'end_date', 'official_url',
+    'streaming_links', 'image_url', 'summary', 'location',
+]
+
+
+# Bump whenever normalize_name changes: stored name_keys are then recomputed
+NAME_KEY_VERSION = 2
+
+
+def normalize_name(name):
+    """Casefold, strip accents and punctuation and collapse whitespace in a tournament name
+
+    Letters of every script are kept ('Кубок' stays 'кубок'); Latin
+    accents are dropped, so 'América' and 'America' share a key.
+    """
+    name = unicodedata.normalize('NFKD', name or '').casefold()
+    name = re.sub(r"['’`]|[\u0300-\u036f]", '', name)
+    # Letters, marks (non-Latin vowel signs) and digits form words; anything else separates them
+    name = ''.join(char if unicodedata.category(char)[0] in 'LMN' else ' ' for char in name)
+    return ' '.join(name.split())
+
+
+def tournament_key(tournament):
+    """Identity of a tournament within one sport: normalized name + start date"""
+    return (normalize_name(tournament.get('name')), tournament.get('start_date') or '')
+
+
+def filled_fields(tournament):
+    """Number of tournament fields that carry a value"""
+    return sum(1 for field in TOURNAMENT_FIELDS if tournament.get(field))
+
+
+def merge_tournaments(tournaments):
+    """Deduplicate tournaments by tournament_key
+
+    The record with the most fields filled in wins and any gaps in it are
+    filled from the duplicates. Order of first appearance is preserved.
+    """
+    merged = {}
+    for tournament in tournaments:
+        key = tournament_key(tournament)
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = dict(tournament)
+            continue
+
+        best, other = (tournament, existing) if filled_fields(tournament) > filled_fields(existing) else (existing, tournament)
+        combined = dict(best)
+        for field, value in other.items():
+            if value and not combined.get(field):
+                combined[field] = value
+        merged[key] = combined
+
+    return list(merged.values())
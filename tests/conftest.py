@@ -0,0 +1,22 @@
+import contextlib
+import io
+
+import pytest
+
+from src.database.initDB import create_database, get_connection
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh tournaments database"""
+    path = str(tmp_path / 'tournaments.db')
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_database(path)
+    return path
+
+
+@pytest.fixture
+def conn(db_path):
+    connection = get_connection(db_path)
+    yield connection
+    connection.close()
@@ -0,0 +1,98 @@
+import contextlib
+import io
+
+import pytest
+
+from src.utils import connection_health
+from src.utils.connection_health import ConnectionHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(connection_health, 'time', clock)
+    return clock
+
+
+class Probe:
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+def open_circuit(health):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(health.failure_threshold):
+            health.record_failure()
+
+
+def test_probe_result_is_remembered(clock):
+    probe = Probe()
+    health = ConnectionHealth(probe, ttl=600, cooldown=60)
+    assert health.is_available() and health.is_available()
+    assert probe.calls == 1
+    clock.now += 601
+    assert health.is_available()
+    assert probe.calls == 2
+
+
+def test_failed_probe_is_retried_after_cooldown(clock):
+    probe = Probe(result=False)
+    health = ConnectionHealth(probe, ttl=600, cooldown=60)
+    assert not health.is_available()
+    clock.now += 30
+    assert not health.is_available()
+    assert probe.calls == 1
+    probe.result = True
+    clock.now += 31
+    assert health.is_available()
+    assert probe.calls == 2
+
+
+def test_open_circuit_lets_a_single_trial_through(clock):
+    health = ConnectionHealth(Probe(), failure_threshold=3, cooldown=60)
+    open_circuit(health)
+    assert health.circuit_open
+    assert not health.is_available()
+
+    clock.now += 61
+    assert health.is_available()            # the trial
+    assert not health.is_available()        # everyone else waits for its outcome
+    health.record_success()
+    assert not health.circuit_open
+    assert health.is_available()
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    health = ConnectionHealth(Probe(), failure_threshold=3, cooldown=60)
+    open_circuit(health)
+    clock.now += 61
+    assert health.is_available()
+    with contextlib.redirect_stdout(io.StringIO()):
+        health.record_failure()
+    assert not health.is_available()
+    clock.now += 61
+    assert health.is_available()
+
+
+def test_trial_that_never_reports_back_is_replaced(clock):
+    health = ConnectionHealth(Probe(), failure_threshold=3, cooldown=60)
+    open_circuit(health)
+    clock.now += 61
+    assert health.is_available()
+    clock.now += 30
+    assert not health.is_available()
+    clock.now += 31
+    assert health.is_available()
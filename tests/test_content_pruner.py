@@ -0,0 +1,60 @@
+from src.utils.content_pruner import prune_content, score_block, split_scored_blocks
+
+PAGE = '\n'.join([
+    'Home | News | Fixtures | Login',
+    '## Domestic season 2026-27',
+    'Team | Tournament | Dates | Venue',
+    'Mumbai | Ranji Trophy | 12 Oct - 20 Oct 2026 | Wankhede Stadium',
+    'Delhi | Vijay Hazare Trophy | 2026-12-01 | Arun Jaitley Stadium',
+    'Format: 50 overs',
+    'Subscribe to our newsletter and accept cookies',
+    '## Latest videos',
+    'Watch the best catches of the week',
+])
+
+
+def test_blocks_without_a_date_or_named_event_do_not_score():
+    assert score_block('Watch the best catches of the week') <= 0
+    assert score_block('Subscribe to our newsletter and accept cookies') < 0
+    assert score_block('Ranji Trophy final on 12 Oct 2026 at Wankhede Stadium') > 0
+
+
+def test_table_rows_point_at_their_header_row_and_heading():
+    blocks = split_scored_blocks(PAGE, 'cricket')
+    by_text = {block['text']: index for index, block in enumerate(blocks)}
+    header = by_text['Team | Tournament | Dates | Venue']
+    assert blocks[header]['context'] == by_text['## Domestic season 2026-27']
+    assert blocks[by_text['Delhi | Vijay Hazare Trophy | 2026-12-01 | Arun Jaitley Stadium']]['context'] == header
+    # A detail line under a relevant heading is kept as the lowest priority
+    assert blocks[by_text['Format: 50 overs']]['score'] == 1
+
+
+def test_prune_keeps_relevant_blocks_in_page_order():
+    pruned = prune_content(PAGE, 'cricket')
+    assert pruned.split('\n') == [
+        '## Domestic season 2026-27',
+        'Team | Tournament | Dates | Venue',
+        'Mumbai | Ranji Trophy | 12 Oct - 20 Oct 2026 | Wankhede Stadium',
+        'Delhi | Vijay Hazare Trophy | 2026-12-01 | Arun Jaitley Stadium',
+        'Format: 50 overs',
+    ]
+
+
+def test_budget_keeps_the_densest_blocks_with_their_context():
+    full = prune_content(PAGE, 'cricket').split('\n')
+    budget = sum(len(line) // 4 + 1 for line in full) * 3 // 4
+    lines = prune_content(PAGE, 'cricket', max_tokens=budget).split('\n')
+
+    assert sum(len(line) // 4 + 1 for line in lines) <= budget
+    assert len(lines) < len(full)
+    assert lines == [line for line in full if line in lines]
+    assert lines[0] == '## Domestic season 2026-27'
+    assert 'Team | Tournament | Dates | Venue' in lines
+
+
+def test_long_paragraphs_are_pruned_sentence_by_sentence():
+    paragraph = ('The weather was pleasant all week and fans enjoyed the food stalls near the gates. '
+                 'Col. CK Nayudu Trophy matches start on 5 Nov 2026 at Eden Gardens Stadium. '
+                 'Many people also visited the museum and the shopping district afterwards.')
+    assert prune_content(paragraph, 'cricket') == \
+        'Col. CK Nayudu Trophy matches start on 5 Nov 2026 at Eden Gardens Stadium.'
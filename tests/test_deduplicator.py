@@ -0,0 +1,69 @@
+import pytest
+
+from src.database.writer import TournamentWriter
+from src.utils.deduplicator import TournamentDeduplicator
+
+
+def tournament(name, start_date='2027-03-01', end_date=None, source='https://a.example/'):
+    return {'name': name, 'level': 'National', 'start_date': start_date,
+            'end_date': end_date or start_date, 'sources': [source]}
+
+
+def merged(name_a, name_b):
+    deduplicator = TournamentDeduplicator()
+    records = deduplicator.deduplicate('cricket', [
+        tournament(name_a), tournament(name_b, source='https://b.example/'),
+    ])
+    return len(records) == 1
+
+
+@pytest.mark.parametrize('name_a, name_b', [
+    ('Ranji Trophy', 'Irani Trophy'),
+    ('India Open', 'Indonesia Open'),
+    ('Kolkata Open', 'Kolkata Open Rapid'),
+    ('Premier League', 'Indian Premier League'),
+    ("Women's T20 World Cup", 'T20 World Cup'),
+    ('Asia Cup', 'Asia Cup Qualifier'),
+    ('U19 Asia Cup', 'Asia Cup'),
+    ('World Cup', 'T20 World Cup'),
+    ('Ranji Trophy', 'Ranji League'),
+])
+def test_different_events_are_kept_apart(name_a, name_b):
+    assert not merged(name_a, name_b)
+
+
+@pytest.mark.parametrize('name_a, name_b', [
+    ('T20 World Cup', "ICC Men's T20 World Cup 2026"),
+    ('Syed Mushtaq Ali Trophy', 'Syed Mushtaq Ali T20 Trophy'),
+    ('Duleep Trophy', 'Duleep Trophy 2026-27'),
+    ('Vijay Hazare Trophy', 'Vijay Hazare'),
+    ('Deodhar Trophy', 'Deodar Trophy'),
+    ('World Chess Championship', 'FIDE World Chess Championship'),
+])
+def test_same_event_from_two_sources_is_merged(name_a, name_b):
+    assert merged(name_a, name_b)
+
+
+def test_dates_must_overlap():
+    deduplicator = TournamentDeduplicator()
+    records = deduplicator.deduplicate('cricket', [
+        tournament('Ranji Trophy', '2027-01-05', '2027-01-20'),
+        tournament('Ranji Trophy', '2027-01-22'),
+        tournament('Ranji Trophy', '2027-03-01'),
+    ])
+    assert len(records) == 2
+    assert deduplicator.merged_count == 1
+
+
+def test_merges_into_stored_row_and_keeps_its_identity(db_path, conn):
+    with TournamentWriter(db_path) as writer:
+        writer.write('cricket', [tournament('Duleep Trophy', '2027-08-28', '2027-09-15')])
+
+    deduplicator = TournamentDeduplicator(conn)
+    [record] = deduplicator.deduplicate('cricket', [
+        tournament('Duleep Trophy 2027-28', '2027-08-29', '2027-09-15', source='https://b.example/'),
+    ])
+    assert record['name_key'] == 'duleep trophy'
+    assert record['start_date'] == '2027-08-28'
+    assert record['name'] == 'Duleep Trophy 2027-28'
+    assert record['sources'] == ['https://a.example/', 'https://b.example/']
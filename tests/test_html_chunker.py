@@ -0,0 +1,41 @@
+from src.utils.html_chunker import chunk_text, split_blocks, estimate_tokens
+
+
+def fixture_page(sections, rows):
+    lines = []
+    for s in range(sections):
+        lines.append(f"## Series {s}")
+        lines.extend(f"Match {s}.{r} | 1{r % 9} Jan 2027 | Stadium {r}" for r in range(rows))
+    return '\n'.join(lines)
+
+
+def test_sections_start_at_headings_and_blank_lines():
+    text = "Intro line\n## Ranji Trophy\nRow 1 | 2027-01-01\n\nNotes\n## Duleep Trophy\nRow 2"
+    assert split_blocks(text) == [
+        "Intro line", "## Ranji Trophy\nRow 1 | 2027-01-01", "Notes", "## Duleep Trophy\nRow 2",
+    ]
+
+
+def test_chunks_stay_within_budget_and_keep_every_line():
+    text = fixture_page(sections=12, rows=30)
+    chunks = chunk_text(text, max_tokens=300)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 300 * 4 for chunk in chunks)
+    assert '\n'.join(chunks).split('\n') == text.split('\n')
+
+
+def test_small_sections_are_not_split():
+    text = fixture_page(sections=6, rows=3)
+    for chunk in chunk_text(text, max_tokens=100):
+        # every chunk starts with a heading: sections were packed whole
+        assert chunk.startswith('## Series')
+
+
+def test_oversized_line_is_cut():
+    chunks = chunk_text('x' * 1000, max_tokens=50)
+    assert [len(chunk) for chunk in chunks] == [200] * 5
+
+
+def test_empty_text_has_no_chunks():
+    assert chunk_text('') == []
+    assert estimate_tokens('abcd' * 10) == 11
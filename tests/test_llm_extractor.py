@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from src.utils.connection_health import ConnectionHealth
+from src.utils.llm_cache import LLMCache
+from src.utils.llm_extractor import GroqExtractor
+from src.utils.rate_limiter import RateLimiter
+
+URL = 'https://example.com/fixtures'
+TOURNAMENT = {'name': 'Ranji Trophy', 'level': 'National', 'start_date': '2099-01-10'}
+
+
+class FakeGroq:
+    """Stands in for query_groq: returns the queued responses in order"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = GroqExtractor('test-key', cache=LLMCache(str(tmp_path / 'llm_cache.db')),
+                              limiter=RateLimiter('groq:test', db_path=str(tmp_path / 'rate_limit.db')))
+    extractor.health = ConnectionHealth(lambda: True)
+    yield extractor
+    extractor.cache.close()
+    extractor.limiter.close()
+
+
+def extract(extractor, text='Ranji Trophy starts 10 Jan 2099'):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extractor.extract_from_chunk(text, 'cricket', URL)
+
+
+def test_parse_failure_is_an_error_not_an_empty_page(extractor):
+    assert extractor.parse_llm_response('[]') == []
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert extractor.parse_llm_response('Sorry, I cannot help with that') is None
+        assert extractor.parse_llm_response('[{"name": "Ranji') is None
+
+
+def test_unparseable_response_is_counted_and_not_cached(extractor):
+    extractor.query_groq = FakeGroq('[{"name": "Ranji Trophy", "lev', json.dumps([TOURNAMENT]))
+
+    assert extract(extractor) == []
+    assert extractor.errors == 1
+    assert extractor.url_errors[URL] == 1
+
+    # Retried on the next run instead of answered from the cache
+    assert [t['name'] for t in extract(extractor)] == ['Ranji Trophy']
+    assert len(extractor.query_groq.prompts) == 2
+
+
+def test_parsed_response_is_cached(extractor):
+    extractor.query_groq = FakeGroq(json.dumps([TOURNAMENT]))
+    assert len(extract(extractor)) == 1
+    assert len(extract(extractor)) == 1
+    assert len(extractor.query_groq.prompts) == 1
+    assert extractor.errors == 0
+
+
+def test_batch_response_is_split_and_cached_per_page(extractor):
+    other = 'https://example.com/results'
+    extractor.query_groq = FakeGroq(json.dumps([
+        dict(TOURNAMENT, page=1),
+        dict(TOURNAMENT, name='Irani Cup 2099', page=2),
+        dict(TOURNAMENT, name='No page for this one'),
+    ]))
+    pages = [(URL, 'Ranji Trophy page'), (other, 'Irani Cup page')]
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = extractor.extract_batch(pages, 'cricket')
+        again = extractor.extract_batch(pages, 'cricket')
+
+    assert [t['name'] for t in results[URL]] == ['Ranji Trophy']
+    assert [t['name'] for t in results[other]] == ['Irani Cup 2099']
+    assert results[URL][0]['official_url'] == URL
+    assert again == results
+    assert len(extractor.query_groq.prompts) == 1
@@ -0,0 +1,29 @@
+import json
+
+from src.utils.metrics import MetricsRegistry, merged_registry
+
+
+def worker_registry(requests, cache_hits):
+    registry = MetricsRegistry()
+    for _ in range(requests):
+        registry.observe('api_request_seconds', 0.002, endpoint='/sports', status=200)
+    registry.inc('api_cache_total', cache_hits, result='hit')
+    return registry
+
+
+def test_merged_registry_sums_every_worker(tmp_path):
+    for pid, (requests, hits) in {101: (3, 2), 102: (5, 4)}.items():
+        state = worker_registry(requests, hits).state()
+        (tmp_path / f'{pid}.json').write_text(json.dumps(state))
+    (tmp_path / '103.json.tmp').write_text('half written')
+
+    text = merged_registry(str(tmp_path)).render()
+    assert 'api_cache_total{result="hit"} 6' in text
+    assert 'api_request_seconds_count{endpoint="/sports",status="200"} 8' in text
+    assert 'api_request_seconds_bucket{endpoint="/sports",status="200",le="0.0025"} 8' in text
+
+
+def test_write_state_round_trips(tmp_path):
+    registry = worker_registry(2, 1)
+    registry.write_state(str(tmp_path))
+    assert merged_registry(str(tmp_path)).render() == registry.render()
@@ -0,0 +1,86 @@
+import pytest
+
+from src.api import queries
+from src.api.queries import InvalidCursor, fetch_tournament_page
+from src.database.initDB import SEARCH_PREFIXES, create_search_index
+
+
+def populate(conn, rows):
+    with conn:
+        for i in range(rows):
+            sport = 'cricket' if i % 3 else 'chess'
+            name = f"Ranji Trophy {i}" if i % 2 else f"Deodhar Cup {i}"
+            conn.execute('''
+                INSERT INTO tournaments (name, sport, level, start_date, end_date, summary, name_key)
+                VALUES (?, ?, 'National', ?, ?, ?, ?)
+            ''', (name, sport, f"2027-01-{i % 28 + 1:02d}", f"2027-02-{i % 28 + 1:02d}",
+                  'Played in Mumbai' if i % 5 == 0 else None, name.lower()))
+
+
+def all_pages(conn, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch_tournament_page(conn, limit=limit, cursor=cursor, **filters)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_the_listing_once_in_order(conn):
+    populate(conn, 95)
+    pages = all_pages(conn, 10, sport='cricket')
+    ids = [row['id'] for page in pages for row in page]
+    keys = [(row['start_date'], row['id']) for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [10] * 6 + [3]
+    assert len(ids) == len(set(ids)) == 63
+    assert keys == sorted(keys)
+    assert all(row['sport'] == 'cricket' for page in pages for row in page)
+
+
+def test_search_pages_are_ranked_and_complete(conn):
+    populate(conn, 95)
+    pages = all_pages(conn, 7, q='ranji')
+    rows = [row for page in pages for row in page]
+
+    assert len(rows) == len({row['id'] for row in rows}) == 47
+    assert all(row['name'].startswith('Ranji Trophy') for row in rows)
+    # A "Mumbai" summary makes the document longer, so it ranks below the others
+    with_summary = [row for row in rows if row['summary']]
+    assert rows[-len(with_summary):] == with_summary
+
+
+def test_search_applies_filters_before_capping_candidates(conn, monkeypatch):
+    populate(conn, 95)
+    monkeypatch.setattr(queries, 'SEARCH_CANDIDATES', 5)
+    rows = [row for page in all_pages(conn, 3, q='deodhar', sport='chess') for row in page]
+
+    # The 5 newest chess matches, not the chess ones among the 5 newest matches
+    assert len(rows) == 5
+    assert all(row['sport'] == 'chess' and row['name'].startswith('Deodhar') for row in rows)
+    assert {row['id'] for row in rows} == {91 - 6 * k for k in range(5)}
+
+
+def test_invalid_cursor_is_rejected(conn):
+    with pytest.raises(InvalidCursor):
+        fetch_tournament_page(conn, q='ranji', cursor='not-a-cursor')
+
+
+def test_search_index_rebuilt_with_new_prefixes(conn):
+    populate(conn, 10)
+    conn.executescript('''
+        DROP TABLE tournaments_fts;
+        CREATE VIRTUAL TABLE tournaments_fts USING fts5(
+            name, summary, location, content='tournaments', content_rowid='id', prefix='2 3 4'
+        );
+    ''')
+    create_search_index(conn)
+
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'tournaments_fts'").fetchone()[0]
+    assert f"prefix='{SEARCH_PREFIXES}'" in sql
+    assert len(fetch_tournament_page(conn, q='Deodh')[0]) == 5
+    ranks = conn.execute('''
+        SELECT rank = bm25(tournaments_fts, 10.0, 1.0, 5.0)
+        FROM tournaments_fts WHERE tournaments_fts MATCH 'ranji'
+    ''').fetchall()
+    assert ranks == [(1,)] * 5
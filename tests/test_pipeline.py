@@ -0,0 +1,76 @@
+import contextlib
+import io
+import threading
+
+from src.scrapers.pipeline import BatchStage, Pipeline, Stage, percentile
+
+
+def collector():
+    seen, lock = [], threading.Lock()
+
+    def collect(item):
+        with lock:
+            seen.append(item)
+        return item
+    return seen, collect
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile([3, 1, 2, 4], 95) == 4
+
+
+def test_items_flow_through_every_stage():
+    seen, collect = collector()
+
+    def double(item):
+        if item == 3:
+            raise ValueError('bad item')
+        return None if item % 5 == 0 else item * 2
+
+    stages = [Stage('double', double, workers=3), Stage('collect', collect, workers=2)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = Pipeline(stages, report_interval=0).run(range(1, 21))
+
+    assert sorted(seen) == [item * 2 for item in range(1, 21) if item != 3 and item % 5]
+    assert (stats[0]['passed'], stats[0]['dropped'], stats[0]['errors']) == (15, 4, 1)
+    assert stats[1]['items'] == 15
+
+
+def test_batch_stage_groups_items_within_budget():
+    batches = []
+    seen, collect = collector()
+
+    def extract_batch(items):
+        batches.append(list(items))
+        return [f"batch:{item}" for item in items]
+
+    def cost(item):
+        return None if item >= 100 else 3
+
+    stage = BatchStage('extract', lambda item: f"alone:{item}", extract_batch, cost,
+                       budget=10, workers=2, queue_size=50, linger=0.05)
+    items = list(range(12)) + [100, 101]
+    Pipeline([stage, Stage('collect', collect)], report_interval=0).run(items)
+
+    assert sorted(int(output.split(':')[1]) for output in seen) == items
+    assert {'alone:100', 'alone:101'} <= set(seen)
+    assert batches and all(2 <= len(batch) <= 3 for batch in batches)
+    assert stage.stats(1.0)['batches'] == len(batches)
+    assert stage.processed == len(items)
+
+
+def test_failed_batch_drops_its_items_only():
+    seen, collect = collector()
+
+    def extract_batch(items):
+        raise RuntimeError('provider down')
+
+    stage = BatchStage('extract', lambda item: item, extract_batch, lambda item: 1,
+                       budget=100, queue_size=50, linger=0.05)
+    with contextlib.redirect_stdout(io.StringIO()):
+        Pipeline([stage, Stage('collect', collect)], report_interval=0).run(range(10))
+
+    assert stage.errors + stage.processed == 10
+    assert len(seen) == stage.processed
@@ -0,0 +1,39 @@
+"""Every API query must be served from an index, never a table scan"""
+
+import contextlib
+import io
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.database.initDB import create_database, get_connection
+from src.api.queries import check_query_plans
+
+SPORTS = ['cricket', 'football', 'basketball', 'badminton', 'chess']
+LEVELS = ['International', 'National', 'State', 'Regional', 'College', 'School', 'Club']
+
+
+def populate(conn, rows):
+    rng = random.Random(3)
+    with conn:
+        for i in range(rows):
+            start = date(2026, 1, 1) + timedelta(days=rng.randrange(720))
+            conn.execute('''
+                INSERT INTO tournaments (name, sport, level, start_date, end_date, name_key)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (f"Plan Cup {i}", rng.choice(SPORTS), rng.choice(LEVELS), start.isoformat(),
+                  (start + timedelta(days=rng.randrange(10))).isoformat(), f"plan cup {i}"))
+
+
+@pytest.mark.parametrize('rows', [0, 2000])
+def test_api_queries_use_indexes(tmp_path, rows):
+    db_path = str(tmp_path / 'tournaments.db')
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_database(db_path)
+    conn = get_connection(db_path)
+    populate(conn, rows)
+    try:
+        assert check_query_plans(conn)
+    finally:
+        conn.close()
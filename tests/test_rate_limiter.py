@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from src.utils.rate_limiter import RateLimiter, parse_duration
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    limiter = RateLimiter('groq:test', db_path=str(tmp_path / 'rate_limit.db'),
+                          requests_per_minute=60, tokens_per_minute=600)
+    yield limiter
+    limiter.close()
+
+
+def bucket(limiter):
+    requests, tokens, blocked_until = limiter.conn.execute(
+        'SELECT requests, tokens, blocked_until FROM rate_buckets WHERE name = ?', (limiter.name,)
+    ).fetchone()
+    return requests, tokens, blocked_until
+
+
+def test_parse_duration():
+    assert parse_duration('7.66s') == pytest.approx(7.66)
+    assert parse_duration('2m59.56s') == pytest.approx(179.56)
+    assert parse_duration('120ms') == pytest.approx(0.12)
+    assert parse_duration('30') == 30
+    assert parse_duration('soon') is None
+    assert parse_duration(None) is None
+
+
+def test_acquire_takes_from_both_buckets(limiter):
+    limiter.acquire(tokens=200)
+    requests, tokens, _ = bucket(limiter)
+    assert requests == pytest.approx(59, abs=0.1)
+    assert tokens == pytest.approx(400, abs=1)
+
+
+def test_unused_reservation_is_given_back(limiter):
+    limiter.acquire(tokens=300)
+    limiter.update({}, status=200, reserved_tokens=300, used_tokens=100)
+    assert bucket(limiter)[1] == pytest.approx(500, abs=1)
+
+
+def test_rate_limited_request_refunds_everything_and_blocks(limiter):
+    limiter.acquire(tokens=300)
+    retry_after = limiter.update({'retry-after': '5'}, status=429, reserved_tokens=300, used_tokens=300)
+
+    requests, tokens, blocked_until = bucket(limiter)
+    assert retry_after == 5
+    assert tokens == pytest.approx(600, abs=1)
+    assert requests == 0
+    assert blocked_until == pytest.approx(time.time() + 5, abs=1)
+
+
+def test_missing_retry_after_backs_off_exponentially(limiter):
+    assert limiter.update({}, status=429) == 2.0
+    assert limiter.update({}, status=429) == 4.0
+    limiter.update({}, status=200)
+    assert limiter.update({}, status=429) == 2.0
+
+
+def test_headers_lower_the_budget(limiter):
+    limiter.update({
+        'x-ratelimit-limit-tokens': '1200',
+        'x-ratelimit-remaining-tokens': '100',
+        'x-ratelimit-reset-tokens': '10s',
+        'x-ratelimit-remaining-requests': '3',
+    })
+    requests, tokens, _ = bucket(limiter)
+    capacity, rate = limiter.conn.execute(
+        'SELECT token_capacity, token_rate FROM rate_buckets WHERE name = ?', (limiter.name,)
+    ).fetchone()
+    assert requests == 3
+    assert tokens == pytest.approx(100, abs=1)
+    assert capacity == 1200
+    assert rate == pytest.approx(110)  # back at the limit when it resets
+
+
+def test_budget_is_shared_through_the_database(limiter):
+    other = RateLimiter('groq:test', db_path=limiter.db_path)
+    try:
+        other.acquire(tokens=500)
+        assert bucket(limiter)[1] == pytest.approx(100, abs=1)
+    finally:
+        other.close()
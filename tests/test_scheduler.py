@@ -0,0 +1,99 @@
+import contextlib
+import io
+import time
+
+import pytest
+
+from src.database.source_state import SourceStateStore
+from src.scrapers.scheduler import SourceScheduler
+
+
+class FakeScraper:
+    """Reports a fixed outcome per URL instead of fetching anything"""
+
+    def __init__(self, sport_name, outcomes):
+        self.sport_name = sport_name
+        self.all_sources = list(outcomes)
+        self.outcomes = outcomes
+        self.source_results = {}
+        self.scraped = []
+
+    def scrape_all_tournaments(self, urls):
+        self.scraped.append(list(urls))
+        for url in urls:
+            if self.outcomes[url] is not None:
+                self.source_results[url] = {'outcome': self.outcomes[url], 'llm_tokens': 800, 'tournaments': 0}
+
+
+@pytest.fixture
+def store(db_path):
+    store = SourceStateStore(db_path)
+    yield store
+    store.close()
+
+
+def scheduler(store, outcomes, **options):
+    return SourceScheduler([FakeScraper('cricket', outcomes)], store=store, **options)
+
+
+def test_new_sources_are_due_and_limited_per_cycle(store):
+    schedule = scheduler(store, {f'https://s{i}.example/': 'changed' for i in range(5)}, max_requests=3)
+    chosen, deferred = schedule.select(time.time() + 1)
+    assert len(chosen) == 3 and len(deferred) == 2
+    # Deferred sources stay due for the next cycle
+    assert sorted(schedule.select(time.time() + 1)[0]) == sorted(deferred)
+
+
+def test_best_source_runs_even_over_the_token_budget(store):
+    schedule = scheduler(store, {'https://a.example/': 'changed', 'https://b.example/': 'changed'},
+                         max_llm_tokens=500)
+    chosen, deferred = schedule.select(time.time() + 1)
+    assert len(chosen) == 1 and len(deferred) == 1
+
+
+def test_interval_adapts_to_changes_and_errors(store):
+    schedule = scheduler(store, {'https://a.example/': 'changed'})
+    state = schedule.states['https://a.example/']
+    now = time.time()
+
+    schedule.record('https://a.example/', {'outcome': 'changed', 'llm_tokens': 2000}, now)
+    assert state['interval'] == schedule.initial_interval * schedule.speedup
+    assert state['llm_tokens'] == pytest.approx(1000 + 0.3 * 1000)
+
+    schedule.record('https://a.example/', {'outcome': 'unchanged', 'llm_tokens': 0}, now)
+    assert state['interval'] == schedule.initial_interval * schedule.speedup * schedule.slowdown
+
+    interval = state['interval']
+    schedule.record('https://a.example/', None, now)
+    schedule.record('https://a.example/', {'outcome': 'error'}, now)
+    assert state['error_streak'] == 2
+    assert state['next_due'] == pytest.approx(now + interval * schedule.error_backoff ** 2)
+    assert state['interval'] == interval
+
+
+def test_intervals_stay_within_bounds(store):
+    schedule = scheduler(store, {'https://a.example/': 'changed'})
+    state = schedule.states['https://a.example/']
+    for _ in range(20):
+        schedule.record('https://a.example/', {'outcome': 'changed', 'llm_tokens': 0}, time.time())
+    assert state['interval'] == schedule.min_interval
+    for _ in range(40):
+        schedule.record('https://a.example/', {'outcome': 'unchanged', 'llm_tokens': 0}, time.time())
+    assert state['interval'] == schedule.max_interval
+
+
+def test_cycle_scrapes_due_sources_and_persists_their_state(store):
+    outcomes = {'https://a.example/': 'changed', 'https://b.example/': 'not_modified', 'https://c.example/': None}
+    schedule = scheduler(store, outcomes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = schedule.run_cycle()
+
+    assert counts == {'changed': 1, 'not_modified': 1, 'error': 1}
+    assert [sorted(urls) for urls in schedule.scrapers['cricket'].scraped] == [sorted(outcomes)]
+
+    reloaded = scheduler(store, outcomes).states
+    assert reloaded['https://a.example/']['interval'] == schedule.initial_interval * schedule.speedup
+    assert reloaded['https://b.example/']['interval'] == schedule.initial_interval * schedule.slowdown
+    assert reloaded['https://c.example/']['error_streak'] == 1
+    # Nothing is due again right away
+    assert schedule.select(time.time())[0] == []
@@ -0,0 +1,25 @@
+import pytest
+
+from src.utils.structured_extractor import guess_level
+
+
+@pytest.mark.parametrize('name, level', [
+    ("ICC Men's T20 World Cup 2027", 'International'),
+    ("Ranji Trophy 2027", 'National'),
+    ("Kerala State Chess Championship", 'State'),
+    ("Inter-Varsity Basketball Cup", 'College'),
+    ("South Zone Football League", 'Regional'),
+    ("Inter Schools Football Cup", 'School'),
+])
+def test_keywords_pick_the_level(name, level):
+    assert guess_level(name) == level
+
+
+@pytest.mark.parametrize('name', [
+    "United States Cricket Bash 2027",  # not 'state'
+    "Piccadilly Chess Weekender",       # not 'icc'
+    "Ozone Badminton Smash",            # not 'zone'
+    "Summer Cricket Bash 2027",         # no keyword at all
+])
+def test_keywords_match_whole_words_only(name):
+    assert guess_level(name) == 'Club'
@@ -0,0 +1,76 @@
+import contextlib
+import io
+
+from src.database.initDB import create_database
+from src.database.writer import TournamentWriter
+from src.utils.tournament_utils import normalize_name
+
+
+def tournament(name, start_date='2027-03-01', **fields):
+    return {'name': name, 'level': 'Club', 'start_date': start_date, **fields}
+
+
+def stored(conn, sport='cricket'):
+    return conn.execute(
+        'SELECT name, name_key, start_date FROM tournaments WHERE sport = ? ORDER BY id', (sport,)
+    ).fetchall()
+
+
+def test_normalize_name_keeps_every_script():
+    assert normalize_name('Кубок') == 'кубок'
+    assert normalize_name('Кубок') != normalize_name('Турнир')
+    assert normalize_name('Copa América') == normalize_name('Copa America') == 'copa america'
+    assert normalize_name("ICC Men's T20 World-Cup") == 'icc mens t20 world cup'
+
+
+def test_non_latin_names_on_the_same_date_stay_separate(db_path, conn):
+    with TournamentWriter(db_path) as writer:
+        writer.write('chess', [tournament('Кубок'), tournament('Турнир')])
+    assert [row[0] for row in stored(conn, 'chess')] == ['Кубок', 'Турнир']
+
+
+def test_upsert_is_idempotent_and_counts_only_real_changes(db_path, conn):
+    rows = [tournament(f'Cup number {i}', f'2027-01-0{i + 1}') for i in range(3)]
+    with TournamentWriter(db_path) as writer:
+        writer.write('cricket', rows)
+        assert writer.rows_changed == 3
+        writer.write('cricket', rows)
+        assert writer.rows_changed == 3
+        writer.write('cricket', [dict(rows[0], summary='Now with a summary')])
+        assert writer.rows_changed == 4
+    assert len(stored(conn)) == 3
+
+
+def test_tournament_without_start_date_is_stored_once(db_path, conn):
+    with TournamentWriter(db_path) as writer:
+        writer.write('cricket', [tournament('No date cup', None)])
+        writer.write('cricket', [tournament('No date cup', None, summary='More detail')])
+    assert stored(conn) == [('No date cup', 'no date cup', None)]
+
+
+def test_migration_recomputes_outdated_name_keys(db_path, conn):
+    # Keys as the old ASCII-only normalize_name made them: both Cyrillic names were ''
+    conn.execute('DROP INDEX idx_natural_key')
+    conn.executemany(
+        "INSERT INTO tournaments (name, sport, level, start_date, name_key) VALUES (?, 'chess', 'Club', ?, ?)",
+        [('Кубок', '2027-03-01', ''), ('Турнир', '2027-03-01', ''), ('Copa América', '2027-06-01', 'copa am rica')],
+    )
+    conn.execute("UPDATE meta SET value = 1 WHERE key = 'name_key_version'")
+    conn.commit()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_database(db_path)
+    assert [row[1] for row in stored(conn, 'chess')] == ['кубок', 'турнир', 'copa america']
+
+
+def test_sources_are_merged_not_replaced(db_path, conn):
+    with TournamentWriter(db_path) as writer:
+        writer.write('cricket', [tournament('Ranji Trophy', summary='Full', location='Mumbai',
+                                            sources=['https://a.example'])])
+        # Less complete record from another source: fields stay, its source is added
+        writer.write('cricket', [tournament('Ranji Trophy', sources=['https://b.example'])])
+        writer.write('cricket', [tournament('Ranji Trophy', sources=['https://a.example'])])
+        changed = writer.rows_changed
+    row = conn.execute("SELECT summary, location, sources FROM tournaments").fetchone()
+    assert row == ('Full', 'Mumbai', '["https://a.example","https://b.example"]')
+    assert changed == 2